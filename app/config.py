@@ -1,5 +1,5 @@
 """Application configuration."""
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +11,94 @@ class Settings(BaseSettings):
     app_mailto: str
     crossref_timeout: int = 30
     max_retries: int = 3
+    crossref_max_connections: int = 50
+    crossref_max_connections_per_host: int = 10
+    crossref_prefetch_pages: int = 1
+    crossref_http2: bool = True  # needs the optional h2 package
+    crossref_keepalive_expiry: float = 30.0
+    crossref_host_limits: str = "api.crossref.org=10,doi.org=20"  # host=limit,...
+    crossref_redirect_cache_size: int = 256
+    crossref_warm_up: bool = True
+    crossref_warm_up_timeout: float = 5.0
+    
+    # Upstream rate governor (rate is replaced by X-Rate-Limit-* headers)
+    crossref_rate_governor_enabled: bool = True
+    crossref_rate_limit: float = 10.0  # requests per second before headers are seen
+    crossref_rate_headroom: float = 0.9
+    crossref_rate_limited_hosts: str = "api.crossref.org,doi.org"
+    
+    # Upstream payloads: request only normalized fields, pick JSON decoder
+    crossref_select_fields: bool = True
+    crossref_json_decoder: str = "auto"  # auto, orjson or stdlib
+    
+    # Bulk DOI metadata lookups (filter=doi:...)
+    crossref_doi_batch_size: int = 50
+    crossref_doi_batch_concurrency: int = 4
+    
+    # Upstream page size chosen from max_results, payload size and latency
+    # (rows then only sets the size of streamed pages)
+    crossref_adaptive_page_size: bool = True
+    crossref_max_page_rows: int = 1000
+    crossref_page_target_seconds: float = 2.0
+    crossref_max_page_bytes: int = 4194304
+    
+    # Date-sharded parallel fetching (1 disables; sharded results get no next_token)
+    crossref_date_shards: int = 1
+    crossref_shard_concurrency: int = 4
+    
+    # Hedged page requests (opt-in; budget is extra requests per page fetch)
+    crossref_hedging_enabled: bool = False
+    crossref_hedge_percentile: float = 0.95
+    crossref_hedge_budget: float = 0.05
+    crossref_hedge_initial_delay: float = 1.0
+    
+    # Circuit breaker around Crossref API calls
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_recovery_timeout: float = 30.0
+    circuit_breaker_half_open_max_calls: int = 1
+    
+    # Normalization offload (none or process)
+    normalization_pool: str = "none"
+    normalization_workers: int = 2
+    normalization_inline_threshold: int = 100
+    normalization_batch_size: int = 100
+    
+    # Overall time budget of a /search request in seconds (0 disables);
+    # when it runs out the results fetched so far are returned as partial
+    search_deadline: float = 20.0
+    
+    # Admission control for /search, /export/* and /export-jobs (shared by
+    # all clients and export job workers; excess requests wait briefly,
+    # then get 503 with Retry-After)
+    admission_enabled: bool = True
+    admission_max_concurrent: int = 32
+    admission_max_queue: int = 64
+    admission_max_wait: float = 2.0
+    # Weighted fair queuing by subscription plan: while several plans wait,
+    # each gets slots in proportion to its weight; free-plan exports and
+    # export job segments cost admission_free_export_cost slots' worth of
+    # the free share
+    admission_plan_weights: str = "free=1,academic=2,pro=4,team=4,institutional=8"
+    admission_free_export_cost: float = 4.0
+    admission_plan_cache_ttl: float = 60.0
+    
+    # Export configuration
+    bibtex_concurrency: int = 10
+    bibtex_mode: str = "remote"  # "remote" asks doi.org, "local" renders from metadata
+    
+    # Persistent BibTeX store (PostgreSQL when connected, SQLite otherwise)
+    bibtex_cache_enabled: bool = True
+    bibtex_cache_path: str = "data/bibtex_cache.sqlite3"
+    bibtex_negative_ttl: int = 86400  # 0 disables negative caching
+    
+    # Background export jobs (files kept on local disk)
+    export_jobs_enabled: bool = True
+    export_job_dir: str = "data/export_jobs"
+    export_job_max_results: int = 10000
+    export_job_workers: int = 2
+    export_job_checkpoint_rows: int = 1000
+    export_job_retention: int = 86400
     
     # Server configuration
     port: int = 8000
@@ -23,6 +111,20 @@ class Settings(BaseSettings):
     rate_limit_searches: str = "10/minute"
     rate_limit_exports: str = "5/minute"
     
+    # Search result cache
+    result_cache_enabled: bool = True
+    result_cache_ttl: int = 300
+    result_cache_stale_ttl: int = 900
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    result_cache_max_entries: int = 1024
+    result_cache_backend: str = "memory"  # memory, local or redis
+    result_cache_redis_url: str = "redis://localhost:6379/0"
+    
+    # Continuation tokens for /search (stored with the result cache's Redis
+    # when configured; set a shared secret when running several workers)
+    continuation_ttl: int = 900
+    continuation_secret: str = ""
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=False,
@@ -33,6 +135,31 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
+    
+    @property
+    def crossref_rate_limited_hosts_list(self) -> List[str]:
+        """Parse rate-limited hosts from comma-separated string."""
+        return [host.strip() for host in self.crossref_rate_limited_hosts.split(",") if host.strip()]
+    
+    @property
+    def crossref_host_limits_map(self) -> Dict[str, int]:
+        """Parse per-host concurrency limits from "host=limit" pairs."""
+        limits = {}
+        for pair in self.crossref_host_limits.split(","):
+            if "=" in pair:
+                host, limit = pair.split("=", 1)
+                limits[host.strip()] = int(limit)
+        return limits
+
+    @property
+    def admission_plan_weights_map(self) -> Dict[str, float]:
+        """Parse per-plan scheduling weights from "plan=weight" pairs."""
+        weights = {}
+        for pair in self.admission_plan_weights.split(","):
+            if "=" in pair:
+                plan, weight = pair.split("=", 1)
+                weights[plan.strip()] = float(weight)
+        return weights
 
 
 # Global settings instance
@@ -1,21 +1,40 @@
 """FastAPI application for Crossref academic search."""
+import math
 import time
 from contextlib import asynccontextmanager
-from typing import Dict
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import quote
 
+import httpx
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.config import settings
+from app.services.admission import DEFAULT_PLAN, AdmissionController, AdmissionMiddleware
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.continuation import ContinuationStore, create_continuation_store
 from app.services.crossref_client import CrossrefClient
+from app.services.deadline import Deadline, DeadlineExceeded
+from app.services.hedging import HedgingPolicy
+from app.services.http_transport import HTTP2_AVAILABLE
+from app.services.page_sizing import PageSizer
+from app.services.plan_resolver import PlanResolver
 from app.services.search_service import SearchService
 from app.services.export_service import ExportService
+from app.services.export_jobs import ExportJobManager, ExportJobNotFoundError, JOB_FORMATS
+from app.services.bibtex_store import BibtexStore, create_bibtex_store
+from app.services.normalization_pool import NormalizationPool
+from app.services.rate_governor import RateGovernor
+from app.services.result_cache import ResultCache, create_result_cache
+from app.utils.exporters import EXPORTERS, ExporterUnavailableError
+from app.utils.fast_json import FastJSONResponse, dumps as json_dumps
 from app.utils.logger import configure_logging, get_logger
+from app.utils.normalizer import DataNormalizer
 
 # Prometheus metrics
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
@@ -28,6 +47,10 @@ logger = get_logger("app")
 # Initialize rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+# Paths whose work lands on the shared Crossref client
+ADMITTED_PATHS = ("/search", "/export/", "/export-jobs")
+BULK_PATHS = ("/export/", "/export-jobs")
+
 # Define metrics
 searches_total = Counter('searches_total', 'Total number of searches')
 searches_errors_total = Counter(
@@ -37,6 +60,11 @@ searches_errors_total = Counter(
 )
 exports_csv_total = Counter('exports_csv_total', 'Total CSV exports')
 exports_bibtex_total = Counter('exports_bibtex_total', 'Total BibTeX exports')
+exports_streamed_total = Counter(
+    'exports_streamed_total',
+    'Total streamed exports by format',
+    ['format']
+)
 search_duration_seconds = Histogram(
     'search_duration_seconds',
     'Search duration in seconds'
@@ -51,6 +79,11 @@ results_count = Histogram(
 crossref_client: CrossrefClient = None
 search_service: SearchService = None
 export_service: ExportService = None
+result_cache: ResultCache = None
+bibtex_store: BibtexStore = None
+normalization_pool: NormalizationPool = None
+continuation_store: ContinuationStore = None
+export_jobs: ExportJobManager = None
 
 
 @asynccontextmanager
@@ -59,7 +92,8 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for startup and shutdown.
     """
     # Startup
-    global crossref_client, search_service, export_service
+    global crossref_client, search_service, export_service, result_cache, bibtex_store
+    global normalization_pool, continuation_store, export_jobs
     
     logger.info(
         "Starting application",
@@ -68,23 +102,128 @@ async def lifespan(app: FastAPI):
     )
     
     # Connect to database
+    connected_database = None
     try:
-        from app.database import connect_db
+        from app.database import connect_db, database
         await connect_db()
+        connected_database = database
         logger.info("Database connected successfully")
     except Exception as e:
         logger.warning(f"Database connection failed: {e}. Auth features will be disabled.")
     
     # Initialize Crossref client
+    rate_governor = None
+    if settings.crossref_rate_governor_enabled:
+        rate_governor = RateGovernor(
+            rate=settings.crossref_rate_limit,
+            headroom=settings.crossref_rate_headroom,
+        )
+    circuit_breaker = None
+    if settings.circuit_breaker_enabled:
+        circuit_breaker = CircuitBreaker(
+            "crossref",
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            recovery_timeout=settings.circuit_breaker_recovery_timeout,
+            half_open_max_calls=settings.circuit_breaker_half_open_max_calls,
+            failure_exceptions=(httpx.TransportError,),
+            logger=logger,
+        )
+    hedging = None
+    if settings.crossref_hedging_enabled:
+        hedging = HedgingPolicy(
+            "crossref",
+            percentile=settings.crossref_hedge_percentile,
+            budget=settings.crossref_hedge_budget,
+            initial_delay=settings.crossref_hedge_initial_delay,
+        )
+    page_sizer = None
+    if settings.crossref_adaptive_page_size:
+        page_sizer = PageSizer(
+            max_rows=settings.crossref_max_page_rows,
+            target_page_seconds=settings.crossref_page_target_seconds,
+            max_page_bytes=settings.crossref_max_page_bytes,
+        )
     crossref_client = CrossrefClient(
         user_agent=settings.app_user_agent,
         mailto=settings.app_mailto,
-        timeout=settings.crossref_timeout
+        timeout=settings.crossref_timeout,
+        max_connections=settings.crossref_max_connections,
+        max_connections_per_host=settings.crossref_max_connections_per_host,
+        prefetch_pages=settings.crossref_prefetch_pages,
+        host_limits=settings.crossref_host_limits_map,
+        keepalive_expiry=settings.crossref_keepalive_expiry,
+        http2=settings.crossref_http2,
+        redirect_cache_size=settings.crossref_redirect_cache_size,
+        rate_governor=rate_governor,
+        rate_limited_hosts=settings.crossref_rate_limited_hosts_list,
+        circuit_breaker=circuit_breaker,
+        hedging=hedging,
+        date_shards=settings.crossref_date_shards,
+        shard_concurrency=settings.crossref_shard_concurrency,
+        select_fields=DataNormalizer.CROSSREF_FIELDS if settings.crossref_select_fields else None,
+        json_decoder=settings.crossref_json_decoder,
+        doi_batch_size=settings.crossref_doi_batch_size,
+        doi_batch_concurrency=settings.crossref_doi_batch_concurrency,
+        page_sizer=page_sizer,
     )
+    if settings.crossref_http2 and not HTTP2_AVAILABLE:
+        logger.warning("h2 package not installed, upstream connections use HTTP/1.1")
+    
+    # Open upstream connections before the first request
+    if settings.crossref_warm_up:
+        warmed = await crossref_client.warm_up(timeout=settings.crossref_warm_up_timeout)
+        logger.info("Upstream connections warmed", results=warmed)
+    
+    # Initialize result cache
+    result_cache = create_result_cache(settings, logger)
+    continuation_store = create_continuation_store(settings, logger)
+    
+    # Initialize BibTeX store
+    try:
+        bibtex_store = await create_bibtex_store(settings, connected_database, logger)
+    except Exception as e:
+        logger.warning(f"BibTeX store unavailable: {e}. Exports will always hit doi.org.")
+    
+    # Initialize normalization offload
+    if settings.normalization_pool != "none":
+        normalization_pool = NormalizationPool(
+            mode=settings.normalization_pool,
+            workers=settings.normalization_workers,
+            inline_threshold=settings.normalization_inline_threshold,
+            batch_size=settings.normalization_batch_size,
+        )
     
     # Initialize services
-    search_service = SearchService(crossref_client, logger)
-    export_service = ExportService(crossref_client, logger)
+    search_service = SearchService(
+        crossref_client,
+        logger,
+        result_cache=result_cache,
+        normalization_pool=normalization_pool,
+        continuations=continuation_store,
+    )
+    export_service = ExportService(
+        crossref_client,
+        logger,
+        bibtex_concurrency=settings.bibtex_concurrency,
+        bibtex_store=bibtex_store,
+        bibtex_mode=settings.bibtex_mode,
+    )
+    
+    # Start background export jobs, resuming interrupted ones
+    if settings.export_jobs_enabled:
+        export_jobs = ExportJobManager(
+            search_service,
+            export_service,
+            directory=settings.export_job_dir,
+            max_results=settings.export_job_max_results,
+            workers=settings.export_job_workers,
+            checkpoint_rows=settings.export_job_checkpoint_rows,
+            retention=settings.export_job_retention,
+            admission=admission_controller,
+            free_bulk_cost=settings.admission_free_export_cost,
+            logger=logger,
+        )
+        await export_jobs.start()
     
     logger.info("Application started successfully")
     
@@ -93,6 +232,9 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down application")
     
+    if export_jobs is not None:
+        await export_jobs.close()
+    
     # Disconnect from database
     try:
         from app.database import disconnect_db
@@ -101,6 +243,18 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Database disconnection failed: {e}")
     
+    if result_cache is not None:
+        await result_cache.close()
+    
+    if bibtex_store is not None:
+        await bibtex_store.close()
+    
+    if continuation_store is not None:
+        await continuation_store.close()
+    
+    if normalization_pool is not None:
+        normalization_pool.close()
+    
     await crossref_client.close()
     logger.info("Application shutdown complete")
 
@@ -128,13 +282,35 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
+# Bound concurrent upstream-bound requests across all clients; export job
+# workers are admitted through the same controller
+admission_controller: Optional[AdmissionController] = None
+if settings.admission_enabled:
+    admission_controller = AdmissionController(
+        name="upstream",
+        max_concurrent=settings.admission_max_concurrent,
+        max_queue=settings.admission_max_queue,
+        max_wait=settings.admission_max_wait,
+        weights=settings.admission_plan_weights_map,
+        logger=logger,
+    )
+    app.add_middleware(
+        AdmissionMiddleware,
+        controller=admission_controller,
+        path_prefixes=ADMITTED_PATHS,
+        plan_resolver=PlanResolver(ttl=settings.admission_plan_cache_ttl, logger=logger),
+        bulk_prefixes=BULK_PATHS,
+        free_bulk_cost=settings.admission_free_export_cost,
+    )
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins_list,
     allow_credentials=False,
-    allow_methods=["GET"],
-    allow_headers=["Content-Type"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-BibTeX-Failed-Count", "X-BibTeX-Failed-DOIs", "Retry-After"],
 )
 
 
@@ -163,6 +339,120 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+async def start_stream(chunks: AsyncIterator[Any]) -> AsyncIterator[Any]:
+    """
+    Pull the first chunk of a stream before the response starts.
+    
+    Errors raised while producing the first chunk propagate to the
+    endpoint, which can still answer with a proper status code.
+    
+    Args:
+        chunks: Async iterator producing the response body
+        
+    Returns:
+        Async iterator replaying the first chunk followed by the rest
+    """
+    try:
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except Exception:
+        await chunks.aclose()
+        raise
+    
+    async def body():
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+    
+    return body()
+
+
+async def ndjson_search_frames(filters, continuation=None, deadline=None) -> AsyncIterator[bytes]:
+    """
+    Encode a streaming search as NDJSON frames.
+    
+    Emits one ``items`` frame per upstream page, then a ``summary`` frame
+    with the count, ``next_token``, ``stale`` and ``partial`` flags.
+    Errors after the first frame become an ``error`` frame. While Crossref
+    is unavailable a new search falls back to cached results, but a
+    continuation gets an ``error`` frame with ``retry_after``: the cache
+    only holds first slices.
+    
+    Args:
+        filters: Validated search filters
+        continuation: Continuation being resumed (optional)
+        deadline: Request deadline (optional)
+        
+    Yields:
+        Newline-terminated JSON frames
+    """
+    from app.models import ErrorResponse
+    
+    count = 0
+    first = True
+    start_time = time.time()
+    position: Dict[str, Any] = {}
+    partial = False
+    
+    try:
+        async for items in search_service.iter_pages(filters, continuation, position, deadline):
+            count += len(items)
+            first = False
+            yield json_dumps(
+                {'type': 'items', 'items': [item.to_dict() for item in items]}
+            ) + b"\n"
+    except CircuitOpenError as e:
+        if first and continuation is None:
+            # Fall back to a cached result while Crossref is unavailable
+            stale = await search_service.stale_result(filters)
+            if stale is None:
+                raise
+            yield json_dumps(
+                {'type': 'items', 'items': [item.to_dict() for item in stale.items]}
+            ) + b"\n"
+            yield json_dumps(
+                {'type': 'summary', 'count': stale.count, 'stale': True, 'partial': False, 'next_token': None}
+            ) + b"\n"
+            return
+        searches_errors_total.labels(error_type='circuit_open').inc()
+        error_response = ErrorResponse(code=503, message="Crossref API temporarily unavailable")
+        yield json_dumps(
+            {'type': 'error', **error_response.to_dict(), 'retry_after': math.ceil(e.retry_after)}
+        ) + b"\n"
+        return
+    except DeadlineExceeded:
+        if first:
+            raise
+        partial = True
+    except Exception as e:
+        if first:
+            raise
+        searches_errors_total.labels(error_type='stream').inc()
+        logger.error(
+            "Error while streaming search results",
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        error_response = ErrorResponse(code=502, message="Search interrupted")
+        yield json_dumps({'type': 'error', **error_response.to_dict()}) + b"\n"
+        return
+    
+    search_duration_seconds.observe(time.time() - start_time)
+    results_count.observe(count)
+    next_token = await search_service.issue_token(
+        filters,
+        continuation.offset if continuation else 0,
+        position['consumed'],
+        position.get('cursor'),
+        partial=partial,
+        sharded=position.get('sharded', False)
+    )
+    yield json_dumps(
+        {'type': 'summary', 'count': count, 'stale': False, 'partial': partial, 'next_token': next_token}
+    ) + b"\n"
+
+
 @app.get("/healthz")
 async def healthcheck() -> Dict[str, str]:
     """
@@ -253,7 +543,7 @@ async def signup():
 @limiter.limit(settings.rate_limit_searches)
 async def search_endpoint(
     request: Request,
-    q: str,
+    q: Optional[str] = None,
     from_date: str = "2023-01-01",
     until_date: str = "2025-12-31",
     content_type: str = "journal-article",
@@ -261,13 +551,20 @@ async def search_endpoint(
     rows: int = 30,
     max_results: int = 120,
     sort: str = "relevance",
-) -> JSONResponse:
+    stream: bool = False,
+    continuation: Optional[str] = None,
+):
     """
     Search Crossref for academic references.
     
+    Results carry a ``next_token`` when more may follow; passing it back
+    as ``continuation`` fetches only the next slice, with the filters of
+    the original search (``max_results`` may be given to change the
+    slice size).
+    
     Args:
         request: FastAPI request object (for rate limiting)
-        q: Search query keywords (required)
+        q: Search query keywords (required unless continuing)
         from_date: Start date filter (YYYY-MM-DD)
         until_date: End date filter (YYYY-MM-DD)
         content_type: Type of content (journal-article, proceedings-article, book-chapter)
@@ -275,9 +572,11 @@ async def search_endpoint(
         rows: Results per page (1-100)
         max_results: Maximum total results (1-500)
         sort: Sort order (relevance or published)
+        stream: Emit results as NDJSON frames while pages arrive
+        continuation: Token from a previous result's next_token
         
     Returns:
-        JSON response with search results
+        JSON response with search results, or an NDJSON stream
     """
     from app.models import SearchFilters, ErrorResponse
     from app.utils.validators import ValidationError
@@ -285,10 +584,26 @@ async def search_endpoint(
     # Increment search counter
     searches_total.inc()
     
+    # One time budget for the whole request, upstream retries included
+    deadline = Deadline(settings.search_deadline) if settings.search_deadline > 0 else None
+    
     try:
+        if continuation:
+            slice_size = max_results if 'max_results' in request.query_params else None
+            
+            if stream:
+                filters, resumed = await search_service.open_continuation(continuation, slice_size)
+                body = await start_stream(ndjson_search_frames(filters, resumed, deadline))
+                return StreamingResponse(body, media_type="application/x-ndjson")
+            
+            with search_duration_seconds.time():
+                result = await search_service.continue_search(continuation, slice_size, deadline)
+            results_count.observe(result.count)
+            return FastJSONResponse(status_code=200, content=result.to_dict())
+        
         # Create filters
         filters = SearchFilters(
-            query=q,
+            query=q or "",
             from_date=from_date,
             until_date=until_date,
             content_type=content_type,
@@ -298,15 +613,21 @@ async def search_endpoint(
             sort=sort
         )
         
+        if stream:
+            # Validate before streaming so errors still get a status code
+            search_service.validate_filters(filters)
+            body = await start_stream(ndjson_search_frames(filters, deadline=deadline))
+            return StreamingResponse(body, media_type="application/x-ndjson")
+        
         # Execute search with timing
         with search_duration_seconds.time():
-            result = await search_service.search(q, filters)
+            result = await search_service.search(q, filters, deadline)
         
         # Record results count
         results_count.observe(result.count)
         
         # Return results
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content=result.to_dict()
         )
@@ -320,6 +641,31 @@ async def search_endpoint(
             content=error_response.to_dict()
         )
         
+    except DeadlineExceeded:
+        # Time budget spent before any result arrived (504)
+        searches_errors_total.labels(error_type='deadline').inc()
+        error_response = ErrorResponse(
+            code=504,
+            message="Search timed out before Crossref returned any results"
+        )
+        return JSONResponse(
+            status_code=504,
+            content=error_response.to_dict()
+        )
+        
+    except CircuitOpenError as e:
+        # Crossref unavailable and nothing cached (503)
+        searches_errors_total.labels(error_type='circuit_open').inc()
+        error_response = ErrorResponse(
+            code=503,
+            message="Crossref API temporarily unavailable"
+        )
+        return JSONResponse(
+            status_code=503,
+            content=error_response.to_dict(),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+        
     except Exception as e:
         # Check if it's a Crossref API error
         import httpx
@@ -381,12 +727,12 @@ async def export_csv_endpoint(
     """
     Export search results to CSV.
     
-    Uses same parameters as /search endpoint.
+    Uses same parameters as /search endpoint. Rows are streamed as
+    Crossref pages arrive instead of being buffered.
     
     Returns:
         CSV file download
     """
-    from fastapi.responses import Response
     from app.models import SearchFilters, ErrorResponse
     from app.utils.validators import ValidationError
     
@@ -403,18 +749,21 @@ async def export_csv_endpoint(
             sort=sort
         )
         
-        # Execute search
-        result = await search_service.search(q, filters)
+        # Validate before streaming so errors still get a status code
+        search_service.validate_filters(filters)
         
-        # Generate CSV
-        csv_content = export_service.export_csv(result.items)
+        # Stream CSV rows as Crossref pages arrive; wait for the first
+        # page so upstream failures return an error response
+        body = await start_stream(
+            export_service.stream_csv(search_service.iter_pages(filters))
+        )
         
         # Increment CSV export counter
         exports_csv_total.inc()
         
         # Return CSV file
-        return Response(
-            content=csv_content,
+        return StreamingResponse(
+            body,
             media_type="text/csv",
             headers={
                 "Content-Disposition": f'attachment; filename="crossref_results.csv"'
@@ -429,6 +778,18 @@ async def export_csv_endpoint(
             content=error_response.to_dict()
         )
         
+    except CircuitOpenError as e:
+        # Crossref unavailable (503)
+        error_response = ErrorResponse(
+            code=503,
+            message="Crossref API temporarily unavailable"
+        )
+        return JSONResponse(
+            status_code=503,
+            content=error_response.to_dict(),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+        
     except Exception as e:
         # Internal server error (500)
         logger.error(
@@ -492,24 +853,147 @@ async def export_bibtex_endpoint(
             )
         
         # Generate BibTeX
-        bibtex_content = await export_service.export_bibtex(doi_list)
+        export = await export_service.export_bibtex_report(doi_list)
         
         # Increment BibTeX export counter
         exports_bibtex_total.inc()
         
+        headers = {
+            "Content-Disposition": f'attachment; filename="crossref_references.bib"',
+            "X-BibTeX-Failed-Count": str(len(export.failed)),
+        }
+        if export.failed:
+            # Report failed DOIs without breaking header encoding
+            headers["X-BibTeX-Failed-DOIs"] = quote(",".join(export.failed), safe="/,.:;()-_")
+        
         # Return BibTeX file
         return Response(
-            content=bibtex_content,
+            content=export.content,
             media_type="text/plain",
+            headers=headers
+        )
+        
+    except Exception as e:
+        # Internal server error (500)
+        logger.error(
+            "Internal error in BibTeX export endpoint",
+            error=str(e),
+            error_type=type(e).__name__
+        )
+        error_response = ErrorResponse(
+            code=500,
+            message="Internal server error"
+        )
+        return JSONResponse(
+            status_code=500,
+            content=error_response.to_dict()
+        )
+
+
+@app.get("/export/{format}")
+@limiter.limit(settings.rate_limit_exports)
+async def export_stream_endpoint(
+    request: Request,
+    format: str,
+    q: str,
+    from_date: str = "2023-01-01",
+    until_date: str = "2025-12-31",
+    content_type: str = "journal-article",
+    has_abstract: bool = True,
+    rows: int = 30,
+    max_results: int = 120,
+    sort: str = "relevance",
+):
+    """
+    Export search results as JSONL, RIS, Arrow or Parquet.
+    
+    Uses same parameters as /search endpoint. Items are encoded as
+    Crossref pages arrive instead of being buffered.
+    
+    Returns:
+        File download in the requested format
+    """
+    from app.models import SearchFilters, ErrorResponse
+    from app.utils.validators import ValidationError
+    
+    exporter = EXPORTERS.get(format)
+    if exporter is None:
+        error_response = ErrorResponse(
+            code=404,
+            message=f"Unknown export format: {format}"
+        )
+        return JSONResponse(
+            status_code=404,
+            content=error_response.to_dict()
+        )
+    
+    try:
+        # Create filters
+        filters = SearchFilters(
+            query=q,
+            from_date=from_date,
+            until_date=until_date,
+            content_type=content_type,
+            has_abstract=has_abstract,
+            rows=rows,
+            max_results=max_results,
+            sort=sort
+        )
+        
+        # Validate before streaming so errors still get a status code
+        search_service.validate_filters(filters)
+        
+        body = await start_stream(
+            export_service.stream_export(
+                format,
+                search_service.iter_pages(filters),
+                content_type=content_type
+            )
+        )
+        
+        exports_streamed_total.labels(format=format).inc()
+        
+        return StreamingResponse(
+            body,
+            media_type=exporter.media_type,
             headers={
-                "Content-Disposition": f'attachment; filename="crossref_references.bib"'
+                "Content-Disposition": f'attachment; filename="crossref_results.{exporter.extension}"'
             }
         )
         
+    except ValidationError as e:
+        # Validation error (400)
+        error_response = ErrorResponse(code=400, message=str(e))
+        return JSONResponse(
+            status_code=400,
+            content=error_response.to_dict()
+        )
+        
+    except ExporterUnavailableError as e:
+        # Optional package missing (501)
+        error_response = ErrorResponse(code=501, message=str(e))
+        return JSONResponse(
+            status_code=501,
+            content=error_response.to_dict()
+        )
+        
+    except CircuitOpenError as e:
+        # Crossref unavailable (503)
+        error_response = ErrorResponse(
+            code=503,
+            message="Crossref API temporarily unavailable"
+        )
+        return JSONResponse(
+            status_code=503,
+            content=error_response.to_dict(),
+            headers={"Retry-After": str(math.ceil(e.retry_after))}
+        )
+        
     except Exception as e:
         # Internal server error (500)
         logger.error(
-            "Internal error in BibTeX export endpoint",
+            "Internal error in export endpoint",
+            format=format,
             error=str(e),
             error_type=type(e).__name__
         )
@@ -523,6 +1007,146 @@ async def export_bibtex_endpoint(
         )
 
 
+def export_job_response(job, status_code: int = 200) -> JSONResponse:
+    """
+    Render an export job with its status and download URLs.
+    
+    Args:
+        job: Export job
+        status_code: HTTP status code
+        
+    Returns:
+        JSON response
+    """
+    content = job.to_dict()
+    content['status_url'] = f"/export-jobs/{job.id}"
+    content['download_url'] = f"/export-jobs/{job.id}/download" if job.status == 'completed' else None
+    return JSONResponse(
+        status_code=status_code,
+        content=content,
+        headers={"Location": content['status_url']} if status_code == 202 else None
+    )
+
+
+def export_job_not_found() -> JSONResponse:
+    """Response for unknown or expired export jobs."""
+    from app.models import ErrorResponse
+    
+    error_response = ErrorResponse(code=404, message="Export job not found or expired")
+    return JSONResponse(
+        status_code=404,
+        content=error_response.to_dict()
+    )
+
+
+@app.post("/export-jobs")
+@limiter.limit(settings.rate_limit_exports)
+async def submit_export_job_endpoint(
+    request: Request,
+    q: str,
+    format: str = "csv",
+    from_date: str = "2023-01-01",
+    until_date: str = "2025-12-31",
+    content_type: str = "journal-article",
+    has_abstract: bool = True,
+    max_results: int = 1000,
+    sort: str = "relevance",
+):
+    """
+    Submit a background export.
+    
+    Takes the same filters as /export/csv, with max_results allowed up to
+    EXPORT_JOB_MAX_RESULTS. Poll the returned status URL and download the
+    file once the job has completed.
+    
+    Returns:
+        The queued job (202)
+    """
+    from app.models import SearchFilters, ErrorResponse
+    from app.utils.validators import ValidationError
+    
+    if export_jobs is None:
+        error_response = ErrorResponse(code=503, message="Export jobs are disabled")
+        return JSONResponse(
+            status_code=503,
+            content=error_response.to_dict()
+        )
+    
+    try:
+        filters = SearchFilters(
+            query=q,
+            from_date=from_date,
+            until_date=until_date,
+            content_type=content_type,
+            has_abstract=has_abstract,
+            max_results=max_results,
+            sort=sort
+        )
+        # Scheduled under the plan AdmissionMiddleware resolved, if enabled
+        plan = getattr(request.state, 'plan', DEFAULT_PLAN)
+        job = await export_jobs.submit(filters, format, plan)
+        return export_job_response(job, status_code=202)
+        
+    except ValidationError as e:
+        # Validation error (400)
+        error_response = ErrorResponse(code=400, message=str(e))
+        return JSONResponse(
+            status_code=400,
+            content=error_response.to_dict()
+        )
+
+
+@app.get("/export-jobs/{job_id}")
+async def export_job_status_endpoint(job_id: str):
+    """
+    Get the status of a background export.
+    
+    Returns:
+        Job status, progress and, once completed, its download URL
+    """
+    if export_jobs is None:
+        return export_job_not_found()
+    try:
+        job = export_jobs.get(job_id)
+    except ExportJobNotFoundError:
+        return export_job_not_found()
+    return export_job_response(job)
+
+
+@app.get("/export-jobs/{job_id}/download")
+async def export_job_download_endpoint(job_id: str):
+    """
+    Download the file of a completed background export.
+    
+    Returns:
+        The file, or 409 while the job has not completed
+    """
+    from app.models import ErrorResponse
+    
+    if export_jobs is None:
+        return export_job_not_found()
+    try:
+        job = export_jobs.get(job_id)
+    except ExportJobNotFoundError:
+        return export_job_not_found()
+    
+    if job.status != 'completed':
+        error_response = ErrorResponse(
+            code=409,
+            message=f"Export job is {job.status}"
+        )
+        return JSONResponse(
+            status_code=409,
+            content=error_response.to_dict()
+        )
+    
+    extension, media_type = JOB_FORMATS[job.format]
+    return FileResponse(
+        export_jobs.file_path(job),
+        media_type=media_type,
+        filename=f"crossref_results.{extension}"
+    )
+
 
 @app.get("/metrics")
 async def metrics():
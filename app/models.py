@@ -1,9 +1,9 @@
 """Data models for the application."""
-from dataclasses import dataclass, asdict
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, asdict, field
+from typing import Optional, List, Dict, Any, Tuple
 
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedItem:
     """Represents a normalized academic reference."""
     
@@ -17,7 +17,28 @@ class NormalizedItem:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        # Built by hand: asdict() deep-copies and is called once per item
+        return {
+            'doi': self.doi,
+            'title': self.title,
+            'authors': self.authors,
+            'year': self.year,
+            'journal': self.journal,
+            'abstract': self.abstract,
+            'url': self.url,
+        }
+    
+    def to_row(self) -> Tuple[Any, ...]:
+        """Convert to a tuple in field order for tabular exports."""
+        return (
+            self.doi,
+            self.title,
+            self.authors,
+            self.year,
+            self.journal,
+            self.abstract,
+            self.url,
+        )
 
 
 @dataclass
@@ -44,13 +65,72 @@ class SearchResult:
     
     count: int
     items: List[NormalizedItem]
+    stale: bool = False  # served from cache while Crossref is unavailable
+    partial: bool = False  # cut short by the request deadline
+    next_token: Optional[str] = None  # continues after the last item
+    cursor: Optional[str] = None  # Crossref cursor after the last item (internal)
+    cursor_at: Optional[float] = None  # when the cursor was obtained (internal)
+    upstream_count: Optional[int] = None  # Crossref results the items came from (internal)
+    sharded: bool = False  # merged from date shards, so not resumable (internal)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API response."""
-        return {
+    def to_dict(self, internal: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary for API response.
+        
+        Args:
+            internal: Include the Crossref cursor and position (for
+                caching, never sent to clients)
+        """
+        data = {
             'count': self.count,
             'items': [item.to_dict() for item in self.items],
+            'stale': self.stale,
+            'partial': self.partial,
+            'next_token': self.next_token,
         }
+        if internal:
+            data['cursor'] = self.cursor
+            data['cursor_at'] = self.cursor_at
+            data['upstream_count'] = self.upstream_count
+            data['sharded'] = self.sharded
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SearchResult":
+        """Rebuild a result from its dictionary form."""
+        return cls(
+            count=data['count'],
+            items=[NormalizedItem(**item) for item in data['items']],
+            stale=data.get('stale', False),
+            partial=data.get('partial', False),
+            next_token=data.get('next_token'),
+            cursor=data.get('cursor'),
+            cursor_at=data.get('cursor_at'),
+            upstream_count=data.get('upstream_count'),
+            sharded=data.get('sharded', False),
+        )
+
+
+@dataclass
+class BibtexExport:
+    """Result of a multi-DOI BibTeX export."""
+    
+    entries: List[str]
+    failed: Dict[str, str]  # DOI -> error description
+    
+    @property
+    def content(self) -> str:
+        """Concatenated BibTeX entries."""
+        return '\n\n'.join(self.entries)
+
+
+@dataclass
+class DOILookup:
+    """Result of a bulk DOI metadata lookup."""
+    
+    records: Dict[str, Dict[str, Any]]  # normalized DOI -> Crossref work record
+    missing: List[str]  # requested DOIs unknown to Crossref
+    failed: Dict[str, str] = field(default_factory=dict)  # DOI -> error description
 
 
 @dataclass
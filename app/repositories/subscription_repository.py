@@ -0,0 +1,42 @@
+"""Subscription repository for database operations."""
+from typing import Optional
+from app.database import database
+from app.auth_models.subscription import SubscriptionPlan, SubscriptionStatus
+
+
+async def get_active_plan(user_id: int) -> Optional[SubscriptionPlan]:
+    """
+    Get the plan of a user's active subscription.
+
+    Args:
+        user_id: User ID
+
+    Returns:
+        Plan of the most recent active or trialing subscription, or None
+    """
+    if database is None:
+        return None
+
+    query = """
+        SELECT plan
+        FROM subscriptions
+        WHERE user_id = :user_id AND status IN (:active, :trialing)
+        ORDER BY updated_at DESC
+        LIMIT 1
+    """
+
+    result = await database.fetch_one(
+        query=query,
+        values={
+            "user_id": user_id,
+            "active": SubscriptionStatus.ACTIVE.value,
+            "trialing": SubscriptionStatus.TRIALING.value,
+        }
+    )
+    if result is None:
+        return None
+
+    try:
+        return SubscriptionPlan(result["plan"])
+    except ValueError:
+        return None
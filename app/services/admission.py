@@ -0,0 +1,315 @@
+"""Admission control and load shedding for upstream-bound endpoints."""
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.responses import JSONResponse
+
+from app.models import ErrorResponse
+
+
+admission_in_flight = Gauge(
+    'admission_in_flight',
+    'Requests currently admitted',
+    ['name']
+)
+admission_queue_depth = Gauge(
+    'admission_queue_depth',
+    'Requests waiting for admission',
+    ['name']
+)
+admission_shed_total = Counter(
+    'admission_shed_total',
+    'Requests rejected with 503 instead of being admitted',
+    ['name', 'plan', 'reason']
+)
+admission_wait_seconds = Histogram(
+    'admission_wait_seconds',
+    'Time admitted requests waited in the queue',
+    ['name', 'plan'],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5]
+)
+
+# Plan for anonymous requests and users without an active subscription
+DEFAULT_PLAN = "free"
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, name: str, reason: str, retry_after: float):
+        super().__init__(f"{name} admission rejected ({reason})")
+        self.name = name
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded concurrency pool with a short, weighted fair wait queue.
+
+    Up to ``max_concurrent`` requests run at once. Further requests wait,
+    at most ``max_queue`` of them and for at most ``max_wait`` seconds;
+    beyond that they are rejected immediately, so latency stays bounded
+    under overload instead of growing with the backlog.
+
+    Waiting requests are ordered by self-clocked fair queuing over plans.
+    Each request gets a finish tag of ``cost / weight`` past its plan's
+    previous tag, and a released slot goes to the smallest tag. While
+    several plans are waiting, each receives slots in proportion to its
+    weight, so paid plans are served first without starving free ones.
+    When the queue is full, a newcomer displaces the waiter that would
+    be served last if the newcomer would be served before it.
+    """
+
+    def __init__(
+        self,
+        name: str = "upstream",
+        max_concurrent: int = 32,
+        max_queue: int = 64,
+        max_wait: float = 2.0,
+        weights: Optional[Dict[str, float]] = None,
+        logger: Any = None,
+    ):
+        """
+        Initialize admission controller.
+
+        Args:
+            name: Name used in metrics
+            max_concurrent: Requests admitted at once
+            max_queue: Requests allowed to wait for a slot
+            max_wait: Seconds a request may wait before being shed
+            weights: Share of slots per plan; unknown plans get the
+                default plan's weight
+            logger: Structured logger (optional)
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.weights = weights or {DEFAULT_PLAN: 1.0}
+        self.logger = logger or structlog.get_logger()
+        self.active = 0
+        # Smoothed time a request holds its slot, for Retry-After hints
+        self.service_time = 1.0
+        # Heap of (finish tag, arrival, plan, waiter)
+        self._queue: List[Tuple[float, int, str, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._virtual_time = 0.0
+        # Finish tag of each plan's latest admitted or waiting request
+        self._last_finish: Dict[str, float] = {}
+        # Finish tag of each plan's latest admitted request
+        self._admitted_finish: Dict[str, float] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Requests currently waiting."""
+        return len(self._queue)
+
+    @property
+    def retry_after(self) -> float:
+        """Estimated seconds until a new request would be admitted."""
+        backlog = self.queue_depth + 1
+        return max(1.0, self.service_time * backlog / self.max_concurrent)
+
+    def weight(self, plan: str) -> float:
+        """Scheduling weight of a plan."""
+        return self.weights.get(plan) or self.weights.get(DEFAULT_PLAN, 1.0)
+
+    async def acquire(self, plan: str = DEFAULT_PLAN, cost: float = 1.0) -> None:
+        """
+        Wait for a slot.
+
+        Args:
+            plan: Subscription plan the request is scheduled under
+            cost: Relative cost of the request (1 for a regular request)
+
+        Raises:
+            AdmissionRejected: If the queue is full, the wait times out or
+                the request is displaced by a higher-priority one
+        """
+        started = time.monotonic()
+        tag = self._finish_tag(plan, cost)
+        if self.active < self.max_concurrent and not self._queue:
+            self.active += 1
+            self._admit(plan, tag)
+            self._last_finish[plan] = tag
+            self._update_gauges()
+            admission_wait_seconds.labels(name=self.name, plan=plan).observe(0)
+            return
+
+        if self.queue_depth >= self.max_queue:
+            last = max(self._queue)
+            if last[0] <= tag:
+                raise self._rejection(plan, 'queue_full')
+            self._remove(last[3])
+            last[3].set_exception(self._rejection(last[2], 'preempted'))
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (tag, next(self._arrivals), plan, waiter))
+        self._last_finish[plan] = tag
+        self._update_gauges()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._remove(waiter)
+                raise self._rejection(plan, 'timeout')
+            # Settled just as the wait expired: admitted, or displaced
+            waiter.result()
+        except asyncio.CancelledError:
+            if not waiter.done():
+                self._remove(waiter)
+            elif waiter.exception() is None:
+                self._hand_over()
+            raise
+        finally:
+            self._update_gauges()
+
+        admission_wait_seconds.labels(name=self.name, plan=plan).observe(time.monotonic() - started)
+
+    def release(self, held_seconds: float = 0.0) -> None:
+        """
+        Give a slot back.
+
+        Args:
+            held_seconds: How long the slot was held
+        """
+        self.service_time += 0.2 * (held_seconds - self.service_time)
+        self._hand_over()
+        self._update_gauges()
+
+    def _finish_tag(self, plan: str, cost: float) -> float:
+        # Only committed to the plan once the request is admitted or queued,
+        # so shed requests do not push back the plan's later requests
+        start = max(self._virtual_time, self._last_finish.get(plan, 0.0))
+        return start + cost / self.weight(plan)
+
+    def _admit(self, plan: str, tag: float) -> None:
+        self._virtual_time = tag
+        self._admitted_finish[plan] = tag
+
+    def _hand_over(self) -> None:
+        while self._queue:
+            tag, _, plan, waiter = heapq.heappop(self._queue)
+            if not waiter.done():
+                self._admit(plan, tag)
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _remove(self, waiter: asyncio.Future) -> None:
+        removed = [entry for entry in self._queue if entry[3] is waiter]
+        self._queue = [entry for entry in self._queue if entry[3] is not waiter]
+        heapq.heapify(self._queue)
+        # A request that timed out or was displaced never ran: its plan's
+        # clock goes back to the latest request that did or still may
+        for _, _, plan, _ in removed:
+            self._last_finish[plan] = max(
+                [tag for tag, _, queued, _ in self._queue if queued == plan],
+                default=self._admitted_finish.get(plan, 0.0)
+            )
+
+    def _rejection(self, plan: str, reason: str) -> AdmissionRejected:
+        admission_shed_total.labels(name=self.name, plan=plan, reason=reason).inc()
+        self.logger.warning(
+            "Request shed by admission control",
+            controller=self.name,
+            plan=plan,
+            reason=reason,
+            active=self.active,
+            queue_depth=self.queue_depth
+        )
+        return AdmissionRejected(self.name, reason, self.retry_after)
+
+    def _update_gauges(self) -> None:
+        admission_in_flight.labels(name=self.name).set(self.active)
+        admission_queue_depth.labels(name=self.name).set(self.queue_depth)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting requests to selected paths through a controller.
+
+    The slot is held until the response has been sent completely, so
+    streamed responses count for as long as they keep the upstream busy.
+    Requests are scheduled under the plan of their bearer token, and
+    free-plan requests to bulk paths cost ``free_bulk_cost`` slots' worth
+    of their plan's share.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        controller: AdmissionController,
+        path_prefixes: Sequence[str],
+        plan_resolver: Any = None,
+        bulk_prefixes: Sequence[str] = (),
+        free_bulk_cost: float = 1.0,
+    ):
+        """
+        Initialize admission middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            controller: Shared admission controller
+            path_prefixes: Request paths subject to admission
+            plan_resolver: Resolves an Authorization header to a plan
+                (optional; every request is scheduled as free without it)
+            bulk_prefixes: Request paths considered bulk work
+            free_bulk_cost: Cost of a free-plan bulk request
+        """
+        self.app = app
+        self.controller = controller
+        self.path_prefixes = tuple(path_prefixes)
+        self.plan_resolver = plan_resolver
+        self.bulk_prefixes = tuple(bulk_prefixes)
+        self.free_bulk_cost = free_bulk_cost
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope['type'] != 'http' or not scope['path'].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        plan = await self._plan(scope)
+        # Let endpoints see the plan the request was scheduled under
+        scope.setdefault('state', {})['plan'] = plan
+        cost = 1.0
+        if plan == DEFAULT_PLAN and self.bulk_prefixes and scope['path'].startswith(self.bulk_prefixes):
+            cost = self.free_bulk_cost
+
+        try:
+            await self.controller.acquire(plan, cost)
+        except AdmissionRejected as e:
+            error_response = ErrorResponse(
+                code=503,
+                message="Server busy, please retry shortly"
+            )
+            response = JSONResponse(
+                status_code=503,
+                content=error_response.to_dict(),
+                headers={"Retry-After": str(math.ceil(e.retry_after))}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(time.monotonic() - started)
+
+    async def _plan(self, scope: dict) -> str:
+        if self.plan_resolver is None:
+            return DEFAULT_PLAN
+        authorization = None
+        for key, value in scope.get('headers', []):
+            if key == b'authorization':
+                authorization = value.decode('latin-1')
+                break
+        return await self.plan_resolver.resolve(authorization)
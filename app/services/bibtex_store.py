@@ -0,0 +1,307 @@
+"""Persistent DOI-to-BibTeX store."""
+import asyncio
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+
+import structlog
+from prometheus_client import Counter
+
+
+bibtex_store_lookups_total = Counter(
+    'bibtex_store_lookups_total',
+    'BibTeX store lookups by outcome',
+    ['result']
+)
+
+# Sentinel stored for DOIs known not to resolve
+NOT_FOUND = None
+
+
+def normalize_doi(doi: str) -> str:
+    """
+    Normalize a DOI for use as a store key.
+
+    DOIs are case-insensitive, so keys are case-folded.
+
+    Args:
+        doi: DOI as provided by the user
+
+    Returns:
+        Normalized DOI
+    """
+    return doi.strip().lower()
+
+
+class BibtexStore(ABC):
+    """
+    Base class for BibTeX stores.
+
+    ``get_many`` returns a mapping that only contains known DOIs. A value
+    of ``NOT_FOUND`` marks a DOI that recently failed to resolve.
+    """
+
+    # Keys per IN list; databases limit the parameters of one statement
+    CHUNK_SIZE = 500
+
+    def __init__(self, negative_ttl: int = 86400):
+        """
+        Initialize store.
+
+        Args:
+            negative_ttl: Seconds a not-found DOI is remembered (0 disables)
+        """
+        self.negative_ttl = negative_ttl
+
+    async def initialize(self) -> None:
+        """Create the storage if needed."""
+
+    async def close(self) -> None:
+        """Release store resources."""
+
+    async def get_many(self, dois: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Look up many DOIs at once.
+
+        Args:
+            dois: DOIs to look up
+
+        Returns:
+            Mapping of normalized DOI to BibTeX (or NOT_FOUND)
+        """
+        keys = list({normalize_doi(doi) for doi in dois})
+        if not keys:
+            return {}
+
+        rows = await self._fetch_rows(keys)
+        now = time.time()
+        found: Dict[str, Optional[str]] = {}
+
+        for doi, bibtex, not_found, fetched_at in rows:
+            if not_found:
+                if self.negative_ttl and now - fetched_at < self.negative_ttl:
+                    found[doi] = NOT_FOUND
+                continue
+            found[doi] = bibtex
+
+        for doi in keys:
+            if doi not in found:
+                result = 'miss'
+            elif found[doi] is NOT_FOUND:
+                result = 'negative'
+            else:
+                result = 'hit'
+            bibtex_store_lookups_total.labels(result=result).inc()
+
+        return found
+
+    async def put_many(self, entries: Dict[str, str]) -> None:
+        """
+        Store BibTeX for several DOIs.
+
+        Args:
+            entries: Mapping of DOI to BibTeX
+        """
+        if entries:
+            now = time.time()
+            await self._upsert_rows([
+                (normalize_doi(doi), bibtex, False, now)
+                for doi, bibtex in entries.items()
+            ])
+
+    async def put_not_found(self, dois: Iterable[str]) -> None:
+        """
+        Remember DOIs that failed to resolve.
+
+        Args:
+            dois: DOIs that returned 404
+        """
+        if not self.negative_ttl:
+            return
+        now = time.time()
+        rows = [(normalize_doi(doi), None, True, now) for doi in dois]
+        if rows:
+            await self._upsert_rows(rows)
+
+    @abstractmethod
+    async def _fetch_rows(self, keys: List[str]) -> List[tuple]:
+        """Return (doi, bibtex, not_found, fetched_at) rows for keys."""
+
+    @abstractmethod
+    async def _upsert_rows(self, rows: List[tuple]) -> None:
+        """Insert or replace (doi, bibtex, not_found, fetched_at) rows."""
+
+
+class SQLiteBibtexStore(BibtexStore):
+    """BibTeX store in a local SQLite file."""
+
+    def __init__(self, path: str, negative_ttl: int = 86400):
+        """
+        Initialize SQLite store.
+
+        Args:
+            path: Database file path
+            negative_ttl: Seconds a not-found DOI is remembered (0 disables)
+        """
+        super().__init__(negative_ttl)
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+
+    async def initialize(self) -> None:
+        await asyncio.to_thread(self._connect)
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connect(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bibtex_cache (
+                doi TEXT PRIMARY KEY,
+                bibtex TEXT,
+                not_found INTEGER NOT NULL DEFAULT 0,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        self._conn = conn
+
+    async def _fetch_rows(self, keys: List[str]) -> List[tuple]:
+        async with self._lock:
+            return await asyncio.to_thread(self._select, keys)
+
+    async def _upsert_rows(self, rows: List[tuple]) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._upsert, rows)
+
+    def _select(self, keys: List[str]) -> List[tuple]:
+        rows: List[tuple] = []
+        for start in range(0, len(keys), self.CHUNK_SIZE):
+            chunk = keys[start:start + self.CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            rows.extend(self._conn.execute(
+                f"SELECT doi, bibtex, not_found, fetched_at FROM bibtex_cache "
+                f"WHERE doi IN ({placeholders})",
+                chunk
+            ).fetchall())
+        return rows
+
+    def _upsert(self, rows: List[tuple]) -> None:
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO bibtex_cache (doi, bibtex, not_found, fetched_at) "
+            "VALUES (?, ?, ?, ?)",
+            rows
+        )
+        self._conn.commit()
+
+
+class PostgresBibtexStore(BibtexStore):
+    """BibTeX store in the application's PostgreSQL database."""
+
+    def __init__(self, database: Any, negative_ttl: int = 86400):
+        """
+        Initialize PostgreSQL store.
+
+        Args:
+            database: Connected ``databases.Database`` instance
+            negative_ttl: Seconds a not-found DOI is remembered (0 disables)
+        """
+        super().__init__(negative_ttl)
+        self.database = database
+
+    async def initialize(self) -> None:
+        await self.database.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bibtex_cache (
+                doi VARCHAR(255) PRIMARY KEY,
+                bibtex TEXT,
+                not_found BOOLEAN NOT NULL DEFAULT FALSE,
+                fetched_at DOUBLE PRECISION NOT NULL
+            )
+            """
+        )
+
+    async def _fetch_rows(self, keys: List[str]) -> List[tuple]:
+        rows: List[tuple] = []
+        for start in range(0, len(keys), self.CHUNK_SIZE):
+            chunk = keys[start:start + self.CHUNK_SIZE]
+            values = {f"doi_{i}": doi for i, doi in enumerate(chunk)}
+            placeholders = ', '.join(f":{name}" for name in values)
+            query = f"""
+                SELECT doi, bibtex, not_found, fetched_at
+                FROM bibtex_cache
+                WHERE doi IN ({placeholders})
+            """
+            results = await self.database.fetch_all(query=query, values=values)
+            rows.extend(
+                (row["doi"], row["bibtex"], row["not_found"], row["fetched_at"])
+                for row in results
+            )
+        return rows
+
+    async def _upsert_rows(self, rows: List[tuple]) -> None:
+        query = """
+            INSERT INTO bibtex_cache (doi, bibtex, not_found, fetched_at)
+            VALUES (:doi, :bibtex, :not_found, :fetched_at)
+            ON CONFLICT (doi) DO UPDATE
+            SET bibtex = EXCLUDED.bibtex,
+                not_found = EXCLUDED.not_found,
+                fetched_at = EXCLUDED.fetched_at
+        """
+        await self.database.execute_many(
+            query=query,
+            values=[
+                {"doi": doi, "bibtex": bibtex, "not_found": not_found, "fetched_at": fetched_at}
+                for doi, bibtex, not_found, fetched_at in rows
+            ]
+        )
+
+
+async def create_bibtex_store(
+    settings: Any,
+    database: Any = None,
+    logger: Any = None,
+) -> Optional[BibtexStore]:
+    """
+    Build and initialize the BibTeX store described by settings.
+
+    PostgreSQL is used when a connected database is given, otherwise
+    the store falls back to a local SQLite file.
+
+    Args:
+        settings: Application settings
+        database: Connected database, if any
+        logger: Structured logger (optional)
+
+    Returns:
+        Initialized store, or None if the store is disabled
+    """
+    if not settings.bibtex_cache_enabled:
+        return None
+
+    logger = logger or structlog.get_logger()
+
+    if database is not None:
+        store: BibtexStore = PostgresBibtexStore(database, settings.bibtex_negative_ttl)
+        try:
+            await store.initialize()
+            logger.info("BibTeX store using PostgreSQL")
+            return store
+        except Exception as e:
+            logger.warning(f"PostgreSQL BibTeX store unavailable: {e}. Falling back to SQLite.")
+
+    store = SQLiteBibtexStore(settings.bibtex_cache_path, settings.bibtex_negative_ttl)
+    await store.initialize()
+    logger.info("BibTeX store using SQLite", path=settings.bibtex_cache_path)
+    return store
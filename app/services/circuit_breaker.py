@@ -0,0 +1,176 @@
+"""Circuit breaker for upstream calls."""
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple, Type
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+
+circuit_breaker_state = Gauge(
+    'circuit_breaker_state',
+    'Circuit breaker state (0 closed, 1 half-open, 2 open)',
+    ['name']
+)
+circuit_breaker_transitions_total = Counter(
+    'circuit_breaker_transitions_total',
+    'Circuit breaker state transitions',
+    ['name', 'from_state', 'to_state']
+)
+circuit_breaker_rejections_total = Counter(
+    'circuit_breaker_rejections_total',
+    'Calls rejected without reaching the upstream',
+    ['name']
+)
+
+CLOSED = 'closed'
+HALF_OPEN = 'half_open'
+OPEN = 'open'
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} circuit is open, retry in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker with half-open probing.
+
+    After ``failure_threshold`` consecutive failures the circuit opens
+    and calls fail immediately with CircuitOpenError. Once
+    ``recovery_timeout`` has passed, up to ``half_open_max_calls`` probe
+    calls are let through: a successful probe closes the circuit, a
+    failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+        logger: Any = None,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name used in metrics and logs
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probe calls while half-open
+            failure_exceptions: Exceptions counted as upstream failures
+            logger: Structured logger (optional)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_exceptions = failure_exceptions
+        self.logger = logger or structlog.get_logger()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probes = 0
+        circuit_breaker_state.labels(name=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until the open circuit starts probing again."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        is_failure: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Run an upstream call through the breaker.
+
+        Args:
+            fn: Coroutine factory performing the call
+            is_failure: Predicate marking a returned value as a failure
+                (e.g. a 5xx response)
+
+        Returns:
+            The call's result
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        probe = self._before_call()
+        try:
+            result = await fn()
+        except self.failure_exceptions:
+            self._on_failure(probe)
+            raise
+        except BaseException:
+            # Neither success nor failure (e.g. cancellation)
+            self._release(probe)
+            raise
+
+        if is_failure is not None and is_failure(result):
+            self._on_failure(probe)
+        else:
+            self._on_success(probe)
+        return result
+
+    def _before_call(self) -> bool:
+        if self.state == OPEN:
+            if self.retry_after > 0:
+                circuit_breaker_rejections_total.labels(name=self.name).inc()
+                raise CircuitOpenError(self.name, self.retry_after)
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                circuit_breaker_rejections_total.labels(name=self.name).inc()
+                raise CircuitOpenError(self.name, self.recovery_timeout)
+            self._probes += 1
+            return True
+
+        return False
+
+    def _on_success(self, probe: bool) -> None:
+        self._release(probe)
+        self.failures = 0
+        if self.state == HALF_OPEN:
+            self._transition(CLOSED)
+
+    def _on_failure(self, probe: bool) -> None:
+        self._release(probe)
+        self.failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self._transition(OPEN)
+
+    def _release(self, probe: bool) -> None:
+        if probe:
+            self._probes -= 1
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        circuit_breaker_transitions_total.labels(
+            name=self.name, from_state=self.state, to_state=state
+        ).inc()
+        circuit_breaker_state.labels(name=self.name).set(_STATE_VALUES[state])
+        self.logger.warning(
+            "Circuit breaker state changed",
+            breaker=self.name,
+            from_state=self.state,
+            to_state=state,
+            failures=self.failures
+        )
+        self.state = state
@@ -0,0 +1,199 @@
+"""Signed continuation tokens for incremental search results."""
+import base64
+import hashlib
+import hmac
+import secrets
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import structlog
+from prometheus_client import Counter
+
+from app.models import SearchFilters
+from app.services.result_cache import LocalSharedCache, RedisSharedCache, SharedCacheBackend
+from app.utils import fast_json
+from app.utils.validators import ValidationError
+
+
+continuation_tokens_total = Counter(
+    'continuation_tokens_total',
+    'Continuation tokens issued and redeemed',
+    ['outcome']
+)
+
+# Crossref drops cursors after five minutes without use
+CURSOR_MAX_AGE = 240
+
+
+class InvalidContinuationError(ValidationError):
+    """Raised for forged, malformed or expired continuation tokens."""
+
+
+@dataclass
+class Continuation:
+    """Server-side state behind a continuation token."""
+
+    filters: SearchFilters
+    offset: int  # Crossref results consumed before this continuation
+    cursor: Optional[str]  # Crossref cursor positioned at offset, if known
+    cursor_at: float  # wall-clock time the cursor was obtained
+
+    @property
+    def live_cursor(self) -> Optional[str]:
+        """The Crossref cursor, or None if it has likely expired upstream."""
+        if self.cursor and time.time() - self.cursor_at < CURSOR_MAX_AGE:
+            return self.cursor
+        return None
+
+
+class ContinuationStore:
+    """
+    Issues and resolves opaque continuation tokens.
+
+    A token is a random id plus an HMAC of it, so forged tokens are
+    rejected without a lookup. The filters, offset and Crossref cursor
+    live server-side for ``ttl`` seconds. Crossref expires idle cursors
+    sooner than that; callers resuming an old continuation re-walk to
+    ``offset`` instead (see Continuation.live_cursor).
+
+    A Crossref cursor is a server-side scroll that moves on with every
+    page requested through it, so it is only valid for a token's first
+    redemption. Redeeming the same token again (a client retry, a
+    reload, a shared link) re-walks to ``offset`` as well.
+    """
+
+    def __init__(
+        self,
+        secret: str = "",
+        ttl: int = 900,
+        backend: Optional[SharedCacheBackend] = None,
+        logger: Any = None,
+    ):
+        """
+        Initialize continuation store.
+
+        Args:
+            secret: HMAC key; a random per-process key is used when empty,
+                which only works for single-worker deployments
+            ttl: Seconds a token stays valid
+            backend: Storage for continuation state (process-local by default)
+            logger: Structured logger (optional)
+        """
+        self.secret = secret.encode('utf-8') if secret else secrets.token_bytes(32)
+        self.ttl = ttl
+        self.backend = backend or LocalSharedCache()
+        self.logger = logger or structlog.get_logger()
+
+    async def issue(
+        self,
+        filters: SearchFilters,
+        offset: int,
+        cursor: Optional[str],
+        cursor_at: Optional[float] = None,
+    ) -> str:
+        """
+        Store a continuation and return its token.
+
+        Args:
+            filters: Filters of the search being continued
+            offset: Crossref results consumed so far
+            cursor: Crossref cursor positioned at offset, if known
+            cursor_at: Time the cursor was obtained (defaults to now)
+
+        Returns:
+            Opaque token
+        """
+        token_id = secrets.token_urlsafe(16)
+        state = {
+            'filters': filters.to_dict(),
+            'offset': offset,
+            'cursor': cursor,
+            'cursor_at': time.time() if cursor_at is None else cursor_at,
+        }
+        await self.backend.set(token_id, fast_json.dumps(state), self.ttl)
+        continuation_tokens_total.labels(outcome='issued').inc()
+        return f"{token_id}.{self._sign(token_id)}"
+
+    async def resolve(self, token: str) -> Continuation:
+        """
+        Look up the continuation behind a token.
+
+        Args:
+            token: Token returned by issue()
+
+        Returns:
+            Stored continuation, without its cursor if the token was
+            redeemed before
+
+        Raises:
+            InvalidContinuationError: If the token is forged, malformed or expired
+        """
+        token_id, _, signature = token.partition('.')
+        if not token_id or not hmac.compare_digest(signature, self._sign(token_id)):
+            continuation_tokens_total.labels(outcome='invalid').inc()
+            raise InvalidContinuationError("invalid continuation token")
+
+        encoded = await self.backend.get(token_id)
+        if encoded is None:
+            continuation_tokens_total.labels(outcome='expired').inc()
+            raise InvalidContinuationError("continuation token expired, repeat the search")
+
+        state = fast_json.loads(encoded)
+        cursor = state['cursor']
+        if cursor is not None:
+            # Kept until Crossref would have dropped the cursor anyway
+            used_key = f"{token_id}:cursor-used"
+            if await self.backend.get(used_key) is not None:
+                cursor = None
+            else:
+                await self.backend.set(used_key, b'1', CURSOR_MAX_AGE)
+        continuation_tokens_total.labels(outcome='resolved').inc()
+        return Continuation(
+            filters=SearchFilters(**state['filters']),
+            offset=state['offset'],
+            cursor=cursor,
+            cursor_at=state['cursor_at'],
+        )
+
+    async def close(self) -> None:
+        """Close the storage backend."""
+        await self.backend.close()
+
+    def _sign(self, token_id: str) -> str:
+        digest = hmac.new(self.secret, token_id.encode('utf-8'), hashlib.sha256).digest()
+        return base64.urlsafe_b64encode(digest[:16]).rstrip(b'=').decode('ascii')
+
+
+def create_continuation_store(settings: Any, logger: Any = None) -> ContinuationStore:
+    """
+    Build the continuation store described by application settings.
+
+    State is kept in Redis when the result cache uses it, so tokens work
+    across workers; otherwise it stays in process.
+
+    Args:
+        settings: Application settings
+        logger: Structured logger (optional)
+
+    Returns:
+        Configured ContinuationStore
+    """
+    logger = logger or structlog.get_logger()
+    backend: SharedCacheBackend = LocalSharedCache()
+
+    if settings.result_cache_backend == "redis":
+        try:
+            backend = RedisSharedCache(
+                settings.result_cache_redis_url,
+                prefix="uiresearch:continuation:"
+            )
+        except ImportError:
+            logger.warning("redis package not installed, keeping continuations in process")
+
+    return ContinuationStore(
+        secret=settings.continuation_secret,
+        ttl=settings.continuation_ttl,
+        backend=backend,
+        logger=logger,
+    )
@@ -1,20 +1,206 @@
 """Crossref API client with pagination and retry logic."""
+import asyncio
+import heapq
+import time
 import httpx
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from datetime import date, timedelta
+from itertools import islice, takewhile
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple
+from urllib.parse import quote
+from prometheus_client import Counter, Histogram
 from tenacity import (
     retry,
     stop_after_attempt,
     wait_exponential,
-    retry_if_exception_type,
+    retry_if_exception,
 )
 
+from app.models import DOILookup
+from app.services.bibtex_store import normalize_doi
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.deadline import Deadline, DeadlineExceeded, deadline_exceeded_total
+from app.services.hedging import HedgingPolicy
+from app.services.http_transport import ACCEPT_ENCODING, build_transport
+from app.services.page_sizing import PageSizer
+from app.services.rate_governor import RateGovernor, parse_retry_after
+from app.utils import fast_json
+from app.utils.async_iter import prefetch
+
+
+page_wire_bytes = Histogram(
+    'crossref_page_wire_bytes',
+    'Bytes received per Crossref page, before decompression',
+    buckets=[4096, 16384, 65536, 131072, 262144, 524288, 1048576, 2097152, 4194304]
+)
+page_decode_seconds = Histogram(
+    'crossref_page_decode_seconds',
+    'Time spent decoding a Crossref page',
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1]
+)
+
+doi_lookups_total = Counter(
+    'crossref_doi_lookups_total',
+    'DOIs resolved through bulk metadata lookups',
+    ['result']
+)
+
+redirect_cache_total = Counter(
+    'crossref_redirect_cache_total',
+    'doi.org redirect-target cache lookups',
+    ['result']
+)
+
+
+_wait_backoff = wait_exponential(multiplier=1, min=1, max=10)
+
+
+def _wait_retry_after(retry_state: Any) -> float:
+    """Wait as long as a throttling response asked, else back off exponentially."""
+    error = retry_state.outcome.exception()
+    if isinstance(error, httpx.HTTPStatusError):
+        delay = parse_retry_after(error.response.headers.get('Retry-After'))
+        if delay is not None:
+            return min(delay, 60.0)
+    return _wait_backoff(retry_state)
+
+
+def _date_shards(
+    from_date: Optional[str],
+    until_date: Optional[str],
+    shards: int,
+) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive date range into contiguous sub-ranges, newest first.
+    
+    Args:
+        from_date: Start date (YYYY-MM-DD)
+        until_date: End date (YYYY-MM-DD)
+        shards: Desired number of sub-ranges
+        
+    Returns:
+        (from, until) pairs, or an empty list if the range cannot be split
+    """
+    try:
+        start = date.fromisoformat(from_date)
+        end = date.fromisoformat(until_date)
+    except (TypeError, ValueError):
+        return []
+    
+    days = (end - start).days + 1
+    count = min(shards, days)
+    if count < 2:
+        return []
+    
+    bounds = [start + timedelta(days=days * i // count) for i in range(count + 1)]
+    return [
+        (bounds[i].isoformat(), (bounds[i + 1] - timedelta(days=1)).isoformat())
+        for i in reversed(range(count))
+    ]
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Timeouts, 5xx and 429 are retried; other 4xx responses are final."""
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code >= 500 or status_code == 429
+    return False
+
+
+def _out_of_time(retry_state: Any) -> bool:
+    """Whether the call's deadline leaves no room for another attempt."""
+    deadline = retry_state.kwargs.get('deadline')
+    return deadline is not None and deadline.remaining() <= _wait_retry_after(retry_state)
+
+
+def _give_up(retry_state: Any) -> Any:
+    """Re-raise the last error, as DeadlineExceeded if time ran out."""
+    error = retry_state.outcome.exception()
+    if _out_of_time(retry_state):
+        deadline_exceeded_total.labels(stage='retry').inc()
+        raise DeadlineExceeded("no time left to retry") from error
+    raise error
+
+
+# Retry policy for Crossref API requests; a ``deadline`` keyword argument
+# stops retrying once the next wait would outlast it
+_retry_upstream = retry(
+    stop=stop_after_attempt(3) | _out_of_time,
+    wait=_wait_retry_after,
+    retry=retry_if_exception(_is_retryable),
+    retry_error_callback=_give_up,
+)
+
+
+def _doi_prefix(doi: str) -> str:
+    """Registrant prefix of a DOI (e.g. ``10.1038``)."""
+    return doi.split('/', 1)[0].lower()
+
+
+def _redirect_template(doi: str, url: str) -> Optional[Tuple[str, str]]:
+    """
+    Turn a resolved URL into a template for other DOIs of the same prefix.
+
+    Args:
+        doi: DOI that was resolved
+        url: Final URL after following doi.org redirects
+
+    Returns:
+        (template with a ``{doi}`` placeholder, quote-safe characters),
+        or None if the DOI does not appear in the URL
+    """
+    lowered = url.lower()
+    for safe in ('/', ''):
+        encoded = quote(doi, safe=safe)
+        index = lowered.find(encoded.lower())
+        if index != -1:
+            return url[:index] + '{doi}' + url[index + len(encoded):], safe
+    return None
+
 
 class CrossrefClient:
     """Client for interacting with Crossref API."""
     
     BASE_URL = "https://api.crossref.org/works"
     
-    def __init__(self, user_agent: str, mailto: str, timeout: int = 30):
+    # Fields added to the search projection for bulk metadata lookups
+    METADATA_FIELDS = (
+        'type', 'volume', 'issue', 'page', 'issued', 'editor',
+        'publisher-location', 'ISSN', 'ISBN', 'URL',
+    )
+    
+    # Times a date shard needing many pages may be split again
+    SHARD_REFINE_ROUNDS = 3
+    
+    # Hosts used for searches and BibTeX content negotiation
+    WARM_UP_URLS = ("https://api.crossref.org/", "https://doi.org/")
+    
+    def __init__(
+        self,
+        user_agent: str,
+        mailto: str,
+        timeout: int = 30,
+        max_connections: int = 50,
+        max_connections_per_host: int = 10,
+        prefetch_pages: int = 1,
+        host_limits: Optional[Dict[str, int]] = None,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        redirect_cache_size: int = 256,
+        rate_governor: Optional[RateGovernor] = None,
+        rate_limited_hosts: Sequence[str] = ("api.crossref.org", "doi.org"),
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedging: Optional[HedgingPolicy] = None,
+        date_shards: int = 1,
+        shard_concurrency: int = 4,
+        select_fields: Optional[Sequence[str]] = None,
+        json_decoder: str = "auto",
+        doi_batch_size: int = 50,
+        doi_batch_concurrency: int = 4,
+        page_sizer: Optional[PageSizer] = None,
+    ):
         """
         Initialize Crossref client.
         
@@ -22,21 +208,102 @@ class CrossrefClient:
             user_agent: Application identifier
             mailto: Contact email for polite pool
             timeout: Request timeout in seconds
+            max_connections: Maximum connections in the shared pool
+            max_connections_per_host: Maximum concurrent requests per host
+            prefetch_pages: Pages fetched ahead of the consumer (0 disables)
+            host_limits: Per-host overrides of max_connections_per_host
+            keepalive_expiry: Seconds an idle connection is kept open
+            http2: Use HTTP/2 when the ``h2`` package is installed
+            redirect_cache_size: DOI prefixes whose redirect target is remembered
+                (0 disables)
+            rate_governor: Shared governor pacing requests (None disables pacing)
+            rate_limited_hosts: Hosts whose requests count against the governor
+            circuit_breaker: Breaker guarding Crossref API calls (optional)
+            hedging: Policy duplicating slow first-page and DOI lookup
+                requests (optional; cursor continuations are never hedged)
+            date_shards: Date sub-ranges fetched in parallel for multi-page
+                searches (1 disables sharding)
+            shard_concurrency: Maximum concurrent page requests across shards
+            select_fields: Work fields requested from Crossref (None returns
+                full records)
+            json_decoder: Decoder for page bodies (see fast_json.get_decoder)
+            doi_batch_size: DOIs resolved per bulk metadata request
+            doi_batch_concurrency: Concurrent bulk metadata requests
+            page_sizer: Chooses upstream page sizes independently of the
+                caller's ``rows`` (None requests ``rows`` per page)
         """
         self.user_agent = user_agent
         self.mailto = mailto
         self.timeout = timeout
+        self.prefetch_pages = prefetch_pages
+        self.rate_governor = rate_governor
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.date_shards = date_shards
+        self.shard_concurrency = shard_concurrency
+        self.json_loads = fast_json.get_decoder(json_decoder)
+        self.doi_batch_size = doi_batch_size
+        self.doi_batch_concurrency = doi_batch_concurrency
+        self.page_sizer = page_sizer
+        
+        # Relevance merging of date shards needs each item's score
+        self.select = (
+            ','.join(dict.fromkeys([*select_fields, 'score']))
+            if select_fields else None
+        )
         
         # Configure headers for polite pool
         self.headers = {
-            'User-Agent': f'{user_agent} (mailto:{mailto})'
+            'User-Agent': f'{user_agent} (mailto:{mailto})',
+            'Accept-Encoding': ACCEPT_ENCODING,
         }
         
-        # Create async HTTP client
+        # Create async HTTP client with pool and per-host limits
+        transport = build_transport(
+            max_connections=max_connections,
+            max_connections_per_host=max_connections_per_host,
+            host_limits=host_limits,
+            keepalive_expiry=keepalive_expiry,
+            http2=http2,
+            rate_governor=rate_governor,
+            rate_limited_hosts=rate_limited_hosts,
+        )
         self.client = httpx.AsyncClient(
             headers=self.headers,
-            timeout=timeout
+            timeout=timeout,
+            transport=transport,
+        )
+        
+        # DOI prefix -> BibTeX URL template learned from doi.org redirects
+        self.redirect_cache_size = redirect_cache_size
+        self._redirect_targets: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+    
+    async def warm_up(
+        self,
+        urls: Sequence[str] = WARM_UP_URLS,
+        timeout: float = 5.0,
+    ) -> Dict[str, bool]:
+        """
+        Open pooled connections before the first user request.
+        
+        Any response counts as success: the point is to pay for DNS,
+        TCP and TLS (and HTTP/2 setup) ahead of time.
+        
+        Args:
+            urls: URLs to request with HEAD
+            timeout: Per-request timeout in seconds
+            
+        Returns:
+            Mapping of URL to whether a connection was established
+        """
+        results = await asyncio.gather(
+            *(self.client.head(url, timeout=timeout) for url in urls),
+            return_exceptions=True
         )
+        return {
+            url: not isinstance(result, BaseException)
+            for url, result in zip(urls, results)
+        }
     
     async def close(self) -> None:
         """Close the HTTP client."""
@@ -85,22 +352,15 @@ class CrossrefClient:
         
         return ','.join(filters)
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((
-            httpx.TimeoutException,
-            httpx.HTTPStatusError,
-        )),
-        reraise=True,
-    )
+    @_retry_upstream
     async def _fetch_page(
         self,
         query: str,
         filter_str: str,
         rows: int,
         sort: str,
-        cursor: str
+        cursor: str,
+        deadline: Optional[Deadline] = None,
     ) -> Dict[str, Any]:
         """
         Fetch a single page from Crossref API with retry logic.
@@ -111,6 +371,7 @@ class CrossrefClient:
             rows: Number of results per page
             sort: Sort order
             cursor: Pagination cursor
+            deadline: Request deadline bounding the call and its retries
             
         Returns:
             API response as dictionary
@@ -118,6 +379,8 @@ class CrossrefClient:
         Raises:
             httpx.HTTPStatusError: For HTTP errors
             httpx.TimeoutException: For timeouts
+            CircuitOpenError: If the circuit breaker rejects the call (not retried)
+            DeadlineExceeded: If the deadline passes (not retried)
         """
         params = {
             'query': query,
@@ -129,19 +392,90 @@ class CrossrefClient:
         if filter_str:
             params['filter'] = filter_str
         
-        response = await self.client.get(self.BASE_URL, params=params)
+        if self.select:
+            params['select'] = self.select
+        
+        started = time.monotonic()
+        if deadline is None:
+            response = await self._get_works(params)
+        else:
+            response = await deadline.run(self._get_works(params))
+        data = self._decode(response)
+        
+        if self.page_sizer is not None:
+            self.page_sizer.observe(
+                items=len(data.get('message', {}).get('items', [])),
+                seconds=time.monotonic() - started,
+                body_bytes=len(response.content)
+            )
+        
+        return data
+    
+    def _page_rows(self, rows: int, remaining: int) -> int:
+        """Upstream page size for ``remaining`` wanted results."""
+        if self.page_sizer is None:
+            return rows
+        return self.page_sizer.size(remaining)
+    
+    async def _request_works(
+        self,
+        params: Dict[str, Any],
+        url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send one /works request through the breaker and hedging policy.
+        
+        Args:
+            params: Query parameters
+            url: Request URL (defaults to BASE_URL)
+            
+        Returns:
+            Decoded response body
+            
+        Raises:
+            httpx.HTTPStatusError: For HTTP errors
+            CircuitOpenError: If the circuit breaker rejects the call
+        """
+        return self._decode(await self._get_works(params, url))
+    
+    async def _get_works(
+        self,
+        params: Dict[str, Any],
+        url: Optional[str] = None,
+    ) -> httpx.Response:
+        """Send one /works request and check its status (see _request_works)."""
+        url = url or self.BASE_URL
         
-        # Raise for 4xx/5xx errors (will trigger retry for 5xx and 429)
-        if response.status_code >= 400:
-            # Don't retry on 4xx errors (except 429)
-            if 400 <= response.status_code < 500 and response.status_code != 429:
-                response.raise_for_status()
-            # Retry on 5xx and 429
+        async def send() -> httpx.Response:
+            if self.circuit_breaker is None:
+                response = await self.client.get(url, params=params)
+            else:
+                # Timeouts, connection errors and 5xx count against the breaker
+                response = await self.circuit_breaker.call(
+                    lambda: self.client.get(url, params=params),
+                    is_failure=lambda r: r.status_code >= 500
+                )
+            # Raise for 4xx/5xx errors (the retry policy only retries 5xx
+            # and 429); raising here also keeps an error from winning a hedge
             response.raise_for_status()
+            return response
         
-        return response.json()
+        # Only idempotent requests are hedged: a continuation cursor is a
+        # server-side scroll that every request moves on, so a duplicate
+        # would skip a page
+        if self.hedging is None or params.get('cursor', '*') != '*':
+            return await send()
+        # A slow first page or lookup gets a duplicate request; the first
+        # success wins
+        return await self.hedging.run(send)
     
-    async def search(
+    def _decode(self, response: httpx.Response) -> Dict[str, Any]:
+        """Decode a /works response body, recording its size and decode time."""
+        page_wire_bytes.observe(response.num_bytes_downloaded)
+        with page_decode_seconds.time():
+            return self.json_loads(response.content)
+    
+    async def iter_pages(
         self,
         query: str,
         from_date: Optional[str] = None,
@@ -151,9 +485,24 @@ class CrossrefClient:
         rows: int = 30,
         max_results: int = 120,
         sort: str = "relevance",
-    ) -> List[Dict[str, Any]]:
+        cursor: str = "*",
+        skip: int = 0,
+        position: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        shard: bool = True,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
         """
-        Search Crossref with automatic pagination.
+        Iterate over Crossref result pages, prefetching ahead of the consumer.
+        
+        Up to ``prefetch_pages`` pages are fetched while the caller is still
+        processing the current one. The buffer is bounded, so a slow
+        consumer pauses pagination instead of accumulating pages.
+        
+        With ``date_shards`` above 1, searches needing more than one page
+        are split by date and the shards are fetched concurrently instead.
+        
+        With a page sizer, ``rows`` only sets the size of the yielded
+        pages; upstream pages are sized by the sizer and split to match.
         
         Args:
             query: Search keywords
@@ -162,11 +511,119 @@ class CrossrefClient:
             content_type: Type of content to search
             has_abstract: Whether to require abstract
             rows: Results per page (1-100)
-            max_results: Maximum total results (1-500)
+            max_results: Maximum total results
             sort: Sort order (relevance or published)
+            cursor: Crossref cursor to resume from
+            skip: Leading results to drop (resuming without a cursor)
+            position: Updated with ``cursor``, the Crossref cursor positioned
+                after the last yielded result, or None when unknown or
+                the results are exhausted, and ``sharded``, whether the
+                results were merged from date shards
+            deadline: Request deadline; when it passes, the pages fetched
+                so far have been yielded and DeadlineExceeded is raised
+            shard: Allow date sharding (sharded walks leave ``position``
+                without a cursor, and their order is not that of the
+                single cursor chain an offset resume re-walks)
             
-        Returns:
-            List of raw items from Crossref
+        Yields:
+            Lists of raw items, one per page, never exceeding max_results in total
+        """
+        if position is None:
+            position = {}
+        position['cursor'] = None
+        position['sharded'] = False
+        
+        shards = []
+        resuming = cursor != "*" or skip > 0
+        if shard and self.date_shards > 1 and not resuming and max_results > self._page_rows(rows, max_results):
+            shards = _date_shards(from_date, until_date, self.date_shards)
+        if shards:
+            position['sharded'] = True
+            async for page in self._iter_sharded(
+                query=query,
+                shards=shards,
+                content_type=content_type,
+                has_abstract=has_abstract,
+                rows=rows,
+                max_results=max_results,
+                sort=sort,
+                deadline=deadline
+            ):
+                yield page
+            return
+        
+        chain = self._iter_cursor_chain(
+            query=query,
+            from_date=from_date,
+            until_date=until_date,
+            content_type=content_type,
+            has_abstract=has_abstract,
+            rows=rows,
+            max_results=max_results,
+            sort=sort,
+            cursor=cursor,
+            skip=skip,
+            position=position,
+            deadline=deadline
+        )
+        
+        if self.prefetch_pages < 1:
+            async for page in chain:
+                yield page
+            return
+        
+        async for page in prefetch(chain, self.prefetch_pages):
+            yield page
+    
+    async def iter_items(self, query: str, **kwargs: Any) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over individual raw items across pages.
+        
+        Args:
+            query: Search keywords
+            **kwargs: Same filters as iter_pages
+            
+        Yields:
+            Raw Crossref items
+        """
+        async for page in self.iter_pages(query, **kwargs):
+            for item in page:
+                yield item
+    
+    async def _iter_cursor_chain(
+        self,
+        query: str,
+        from_date: Optional[str] = None,
+        until_date: Optional[str] = None,
+        content_type: str = "journal-article",
+        has_abstract: bool = True,
+        rows: int = 30,
+        max_results: int = 120,
+        sort: str = "relevance",
+        cursor: str = "*",
+        skip: int = 0,
+        position: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Walk the cursor chain, requesting each page only when asked for it.
+        
+        Args:
+            query: Search keywords
+            from_date: Start date filter (YYYY-MM-DD)
+            until_date: End date filter (YYYY-MM-DD)
+            content_type: Type of content to search
+            has_abstract: Whether to require abstract
+            rows: Results per page (1-100)
+            max_results: Maximum total results
+            sort: Sort order (relevance or published)
+            cursor: Crossref cursor to start from
+            skip: Leading results to drop
+            position: Updated with the cursor following the last result
+            deadline: Request deadline for every page fetch
+            
+        Yields:
+            Lists of raw items, one per page, never exceeding max_results in total
         """
         # Build filter string
         filter_str = self._build_filter_string(
@@ -176,18 +633,29 @@ class CrossrefClient:
             has_abstract=has_abstract
         )
         
-        all_items: List[Dict[str, Any]] = []
-        cursor = "*"  # Initial cursor
+        wanted = skip + max_results
+        fetched = 0
+        buffered: List[Dict[str, Any]] = []
         
-        while len(all_items) < max_results:
-            # Fetch page
-            response_data = await self._fetch_page(
-                query=query,
-                filter_str=filter_str,
-                rows=rows,
-                sort=sort,
-                cursor=cursor
-            )
+        while fetched < wanted:
+            # Fetch page; never past wanted, so the next cursor stays exact
+            remaining = wanted - fetched
+            try:
+                response_data = await self._fetch_page(
+                    query=query,
+                    filter_str=filter_str,
+                    rows=min(self._page_rows(rows, remaining), remaining),
+                    sort=sort,
+                    cursor=cursor,
+                    deadline=deadline
+                )
+            except DeadlineExceeded:
+                # Hand over what was fetched; the cursor resumes right after it
+                if position is not None and fetched >= skip:
+                    position['cursor'] = cursor
+                if buffered:
+                    yield buffered
+                raise
             
             # Extract items
             message = response_data.get('message', {})
@@ -197,23 +665,433 @@ class CrossrefClient:
                 # No more results
                 break
             
-            # Add items up to max_results
-            remaining = max_results - len(all_items)
-            all_items.extend(items[:remaining])
+            # Yield items up to max_results, in pages of the caller's size
+            page = items[:wanted - fetched]
+            fetched += len(page)
+            if fetched > skip:
+                buffered.extend(page[max(0, len(page) - (fetched - skip)):])
+            while len(buffered) >= rows:
+                yield buffered[:rows]
+                buffered = buffered[rows:]
             
             # Check if we have more pages
             next_cursor = message.get('next-cursor')
-            if not next_cursor or len(all_items) >= max_results:
+            if not next_cursor:
                 break
             
             cursor = next_cursor
+            if fetched >= wanted:
+                if position is not None:
+                    position['cursor'] = cursor
+                break
+        
+        if buffered:
+            yield buffered
+    
+    async def _iter_sharded(
+        self,
+        query: str,
+        shards: List[Tuple[str, str]],
+        content_type: str,
+        has_abstract: bool,
+        rows: int,
+        max_results: int,
+        sort: str,
+        deadline: Optional[Deadline] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Fetch date shards concurrently and merge them into one result list.
+        
+        The first page of every shard is fetched up front and its
+        ``total-results`` tells how much each shard can contribute.
+        
+        Shards are disjoint and ordered newest first, matching Crossref's
+        descending ``sort=published`` order, so that merge is a plain
+        concatenation: older shards only fill what newer ones leave of
+        ``max_results``. A shard that must deliver more than two pages is
+        split again, so no single cursor chain dominates.
+        
+        For ``sort=relevance`` any shard may hold the best matches. Shards
+        are read in concurrent waves; a shard stops once its lowest score
+        cannot reach the current ``max_results``-th best, and the results
+        are merged by score.
+        
+        When the deadline passes, what arrived in time is yielded before
+        DeadlineExceeded is raised: for ``sort=published`` the completed
+        newest shards (plus the part of the next one that arrived), for
+        relevance the merge of the pages fetched so far.
+        
+        Args:
+            query: Search keywords
+            shards: (from, until) date ranges, newest first
+            content_type: Type of content to search
+            has_abstract: Whether to require abstract
+            rows: Results per page (1-100)
+            max_results: Maximum total results
+            sort: Sort order (relevance or published)
+            deadline: Request deadline for every page fetch
+            
+        Yields:
+            Lists of raw items of at most ``rows`` items each
+        """
+        semaphore = asyncio.Semaphore(self.shard_concurrency)
+        tasks: List[asyncio.Task] = []
+        page_rows = self._page_rows(rows, -(-max_results // len(shards)))
+        
+        async def fetch(shard: Tuple[str, str], cursor: str) -> Dict[str, Any]:
+            filter_str = self._build_filter_string(
+                from_date=shard[0],
+                until_date=shard[1],
+                content_type=content_type,
+                has_abstract=has_abstract
+            )
+            async with semaphore:
+                response_data = await self._fetch_page(
+                    query=query,
+                    filter_str=filter_str,
+                    rows=page_rows,
+                    sort=sort,
+                    cursor=cursor,
+                    deadline=deadline
+                )
+            return response_data.get('message', {})
+        
+        def spawn(coros: Any) -> List[asyncio.Task]:
+            # Tracked so an abandoned search cancels its requests
+            batch = [asyncio.create_task(coro) for coro in coros]
+            tasks.extend(batch)
+            return batch
+        
+        try:
+            batch = spawn(fetch(shard, "*") for shard in shards)
+            expired: Optional[DeadlineExceeded] = None
+            try:
+                heads = list(zip(shards, await asyncio.gather(*batch)))
+            except DeadlineExceeded as e:
+                # Keep the shards whose first page arrived in time
+                expired = e
+                arrived = [
+                    task.done() and not task.cancelled() and task.exception() is None
+                    for task in batch
+                ]
+                if sort == 'published':
+                    # Older shards only count while every newer one arrived
+                    arrived = list(takewhile(bool, arrived))
+                heads = [
+                    (shard, task.result())
+                    for shard, task, ok in zip(shards, batch, arrived) if ok
+                ]
+            
+            if sort == 'published':
+                async for page in self._merge_published(
+                    heads, fetch, spawn, rows, page_rows, max_results, expired
+                ):
+                    yield page
+                return
+            
+            merged, expired = await self._merge_relevance(heads, fetch, spawn, max_results, expired)
+            for start in range(0, len(merged), rows):
+                yield merged[start:start + rows]
+            if expired is not None:
+                raise expired
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _merge_published(
+        self,
+        heads: List[Tuple[Tuple[str, str], Dict[str, Any]]],
+        fetch: Any,
+        spawn: Any,
+        rows: int,
+        page_rows: int,
+        max_results: int,
+        expired: Optional[DeadlineExceeded] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        def quotas() -> List[int]:
+            remaining = max_results
+            result = []
+            for _, first in heads:
+                quota = min(first.get('total-results') or 0, remaining)
+                remaining -= quota
+                result.append(quota)
+            return result
+        
+        # Re-split shards that would still need a long cursor chain
+        for _ in range(self.SHARD_REFINE_ROUNDS if expired is None else 0):
+            splits = {}
+            for index, ((shard, _), quota) in enumerate(zip(heads, quotas())):
+                if quota > 2 * page_rows:
+                    pages = -(-quota // page_rows)
+                    sub_shards = _date_shards(shard[0], shard[1], min(pages, self.date_shards))
+                    if sub_shards:
+                        splits[index] = sub_shards
+            if not splits:
+                break
+            
+            try:
+                sub_firsts = iter(await asyncio.gather(*spawn(
+                    fetch(sub_shard, "*")
+                    for sub_shards in splits.values()
+                    for sub_shard in sub_shards
+                )))
+            except DeadlineExceeded:
+                # Walk the unsplit shards; their chains stop at the deadline
+                break
+            refined = []
+            for index, head in enumerate(heads):
+                if index in splits:
+                    refined.extend((sub_shard, next(sub_firsts)) for sub_shard in splits[index])
+                else:
+                    refined.append(head)
+            heads = refined
+        
+        async def collect(
+            shard: Tuple[str, str],
+            first: Dict[str, Any],
+            quota: int,
+        ) -> Tuple[List[Dict[str, Any]], Optional[DeadlineExceeded]]:
+            items = first.get('items', [])[:quota]
+            message = first
+            try:
+                while len(items) < quota and message.get('items') and message.get('next-cursor'):
+                    message = await fetch(shard, message['next-cursor'])
+                    items.extend(message.get('items', [])[:quota - len(items)])
+            except DeadlineExceeded as e:
+                return items, e
+            return items, None
+        
+        chains = spawn(
+            collect(shard, first, quota)
+            for (shard, first), quota in zip(heads, quotas())
+            if quota > 0
+        )
+        
+        # Newest shard first: pages go out as soon as each chain completes
+        buffered: List[Dict[str, Any]] = []
+        for chain in chains:
+            items, error = await chain
+            buffered.extend(items)
+            while len(buffered) >= rows:
+                yield buffered[:rows]
+                buffered = buffered[rows:]
+            if error is not None:
+                # Older shards would leave a gap after the truncated one
+                expired = error
+                break
+        if buffered:
+            yield buffered
+        if expired is not None:
+            raise expired
+    
+    async def _merge_relevance(
+        self,
+        heads: List[Tuple[Tuple[str, str], Dict[str, Any]]],
+        fetch: Any,
+        spawn: Any,
+        max_results: int,
+        expired: Optional[DeadlineExceeded] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[DeadlineExceeded]]:
+        def score(item: Dict[str, Any]) -> float:
+            return item.get('score') or 0
+        
+        states = [
+            {'shard': shard, 'message': first, 'items': list(first.get('items', []))}
+            for shard, first in heads
+        ]
+        
+        while expired is None:
+            best = heapq.nlargest(
+                max_results, (score(item) for state in states for item in state['items'])
+            )
+            threshold = best[-1] if len(best) >= max_results else None
+            
+            active = [
+                state for state in states
+                if state['message'].get('items')
+                and state['message'].get('next-cursor')
+                and len(state['items']) < min(
+                    max_results, state['message'].get('total-results') or max_results
+                )
+                and (threshold is None or score(state['items'][-1]) > threshold)
+            ]
+            if not active:
+                break
+            
+            try:
+                messages = await asyncio.gather(*spawn(
+                    fetch(state['shard'], state['message']['next-cursor'])
+                    for state in active
+                ))
+            except DeadlineExceeded as e:
+                # Merge the pages fetched so far
+                expired = e
+                break
+            for state, message in zip(active, messages):
+                state['message'] = message
+                state['items'].extend(message.get('items', []))
+        
+        merged = list(islice(
+            heapq.merge(*(state['items'] for state in states), key=lambda item: -score(item)),
+            max_results
+        ))
+        return merged, expired
+    
+    async def search(
+        self,
+        query: str,
+        from_date: Optional[str] = None,
+        until_date: Optional[str] = None,
+        content_type: str = "journal-article",
+        has_abstract: bool = True,
+        rows: int = 30,
+        max_results: int = 120,
+        sort: str = "relevance",
+        position: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search Crossref with automatic pagination.
+        
+        Args:
+            query: Search keywords
+            from_date: Start date filter (YYYY-MM-DD)
+            until_date: End date filter (YYYY-MM-DD)
+            content_type: Type of content to search
+            has_abstract: Whether to require abstract
+            rows: Results per page (1-100)
+            max_results: Maximum total results (1-500)
+            sort: Sort order (relevance or published)
+            position: Updated with the cursor following the last result
+                (see iter_pages)
+            deadline: Request deadline for every page fetch
+            
+        Returns:
+            List of raw items from Crossref
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes before all pages arrive
+        """
+        all_items: List[Dict[str, Any]] = []
+        
+        async for page in self.iter_pages(
+            query=query,
+            from_date=from_date,
+            until_date=until_date,
+            content_type=content_type,
+            has_abstract=has_abstract,
+            rows=rows,
+            max_results=max_results,
+            sort=sort,
+            position=position,
+            deadline=deadline
+        ):
+            all_items.extend(page)
         
         return all_items
     
+    async def get_works_by_doi(self, dois: Sequence[str]) -> DOILookup:
+        """
+        Resolve many DOIs to Crossref work records in bulk.
+        
+        DOIs are deduplicated and resolved ``doi_batch_size`` at a time with
+        ``filter=doi:...,doi:...`` queries, at most ``doi_batch_concurrency``
+        at once. DOIs containing commas cannot be expressed in a filter and
+        are looked up individually. A failed request marks its DOIs as
+        failed without affecting the other chunks.
+        
+        Args:
+            dois: DOIs to resolve
+            
+        Returns:
+            DOILookup with records keyed by normalized DOI, DOIs Crossref
+            does not know, and DOIs whose lookup failed
+        """
+        requested: Dict[str, str] = {}
+        for doi in dois:
+            if doi.strip():
+                requested.setdefault(normalize_doi(doi), doi.strip())
+        
+        batched = [key for key in requested if ',' not in key]
+        chunks = [
+            batched[start:start + self.doi_batch_size]
+            for start in range(0, len(batched), self.doi_batch_size)
+        ]
+        chunks.extend([key] for key in requested if ',' in key)
+        
+        select = ','.join([*self.select.split(','), *self.METADATA_FIELDS]) if self.select else None
+        semaphore = asyncio.Semaphore(self.doi_batch_concurrency)
+        
+        async def fetch(chunk: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                if len(chunk) == 1 and ',' in chunk[0]:
+                    return await self._fetch_work(chunk[0])
+                return await self._fetch_doi_chunk(chunk, select)
+        
+        results = await asyncio.gather(*(fetch(chunk) for chunk in chunks), return_exceptions=True)
+        
+        records: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, str] = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                for key in chunk:
+                    failed[requested[key]] = type(result).__name__
+                continue
+            for item in result:
+                key = normalize_doi(item.get('DOI', ''))
+                if key in requested:
+                    records[key] = item
+        
+        missing = [
+            doi for key, doi in requested.items()
+            if key not in records and doi not in failed
+        ]
+        
+        doi_lookups_total.labels(result='found').inc(len(records))
+        doi_lookups_total.labels(result='missing').inc(len(missing))
+        doi_lookups_total.labels(result='failed').inc(len(failed))
+        
+        return DOILookup(records=records, missing=missing, failed=failed)
+    
+    @_retry_upstream
+    async def _fetch_doi_chunk(
+        self,
+        keys: List[str],
+        select: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        params: Dict[str, Any] = {
+            'filter': ','.join(f'doi:{key}' for key in keys),
+            'rows': len(keys),
+        }
+        if select:
+            params['select'] = select
+        response_data = await self._request_works(params)
+        return response_data.get('message', {}).get('items', [])
+    
+    @_retry_upstream
+    async def _fetch_work(self, key: str) -> List[Dict[str, Any]]:
+        # /works/{doi} does not support select
+        try:
+            response_data = await self._request_works(
+                {}, url=f"{self.BASE_URL}/{quote(key, safe='')}"
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return []
+            raise
+        return [response_data.get('message', {})]
+    
     async def get_bibtex(self, doi: str) -> str:
         """
         Get BibTeX for a specific DOI via content negotiation.
         
+        doi.org answers with a redirect to the registration agency. The
+        redirect target is remembered per DOI prefix so later DOIs of the
+        same registrant skip the extra hop; if the remembered target fails,
+        the DOI is resolved through doi.org again.
+        
         Args:
             doi: DOI to retrieve
             
@@ -229,7 +1107,41 @@ class CrossrefClient:
             'Accept': 'application/x-bibtex'
         }
         
+        prefix = _doi_prefix(doi)
+        target = self._redirect_targets.get(prefix)
+        if target is not None:
+            template, safe = target
+            try:
+                response = await self.client.get(
+                    template.format(doi=quote(doi, safe=safe)),
+                    headers=headers,
+                    follow_redirects=True
+                )
+                if response.is_success:
+                    redirect_cache_total.labels(result='hit').inc()
+                    self._redirect_targets.move_to_end(prefix)
+                    return response.text
+            except httpx.TransportError:
+                pass
+            # Not every DOI of a prefix resolves the same way; doi.org decides
+            redirect_cache_total.labels(result='stale').inc()
+        else:
+            redirect_cache_total.labels(result='miss').inc()
+        
         response = await self.client.get(url, headers=headers, follow_redirects=True)
         response.raise_for_status()
         
+        if self.redirect_cache_size > 0:
+            self._remember_redirect(prefix, doi, response)
+        
         return response.text
+    
+    def _remember_redirect(self, prefix: str, doi: str, response: httpx.Response) -> None:
+        target = _redirect_template(doi, str(response.url)) if response.history else None
+        if target is None:
+            self._redirect_targets.pop(prefix, None)
+            return
+        self._redirect_targets[prefix] = target
+        self._redirect_targets.move_to_end(prefix)
+        while len(self._redirect_targets) > self.redirect_cache_size:
+            self._redirect_targets.popitem(last=False)
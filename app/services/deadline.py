@@ -0,0 +1,74 @@
+"""End-to-end time budgets for requests that fan out to upstream calls."""
+import asyncio
+import time
+from typing import Awaitable, TypeVar
+
+from prometheus_client import Counter
+
+
+deadline_exceeded_total = Counter(
+    'request_deadline_exceeded_total',
+    'Upstream work cut short because the request ran out of time',
+    ['stage']
+)
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's time budget runs out."""
+
+
+class Deadline:
+    """
+    A fixed point in time by which a request must be answered.
+
+    Created once per request and passed down to every upstream call, so
+    per-call timeouts, retries and pagination all draw on one budget.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Initialize deadline.
+
+        Args:
+            seconds: Time budget from now
+        """
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget is spent."""
+        return self.remaining() <= 0
+
+    async def run(self, awaitable: Awaitable[T], stage: str = "request") -> T:
+        """
+        Await a call, abandoning it when the deadline passes.
+
+        Args:
+            awaitable: Call to run
+            stage: Label for the metric recorded on expiry
+
+        Returns:
+            The call's result
+
+        Raises:
+            DeadlineExceeded: If the deadline passes first
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            deadline_exceeded_total.labels(stage=stage).inc()
+            raise DeadlineExceeded(f"deadline of {self.budget:g}s exceeded")
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            deadline_exceeded_total.labels(stage=stage).inc()
+            raise DeadlineExceeded(f"deadline of {self.budget:g}s exceeded") from None
+
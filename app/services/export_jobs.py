@@ -0,0 +1,536 @@
+"""Background export jobs for result sets beyond the interactive cap."""
+import asyncio
+import os
+import secrets
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+from app.models import NormalizedItem, SearchFilters
+from app.services.admission import DEFAULT_PLAN, AdmissionController, AdmissionRejected
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.continuation import Continuation
+from app.services.export_service import ExportService
+from app.services.search_service import SearchService
+from app.utils import fast_json
+from app.utils.exporters import EXPORTERS, StreamingExporter, create_exporter
+from app.utils.validators import ValidationError
+
+
+export_jobs_total = Counter(
+    'export_jobs_total',
+    'Export job lifecycle events',
+    ['event']
+)
+export_jobs_running = Gauge(
+    'export_jobs_running',
+    'Export jobs currently being written'
+)
+export_job_items_total = Counter(
+    'export_job_items_total',
+    'Items written by export jobs'
+)
+
+# Job format -> (file extension, media type)
+JOB_FORMATS = {name: (exporter.extension, exporter.media_type) for name, exporter in EXPORTERS.items()}
+JOB_FORMATS['bibtex'] = ('bib', 'text/plain')
+
+# Job statuses; queued and running jobs are resumed after a restart
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed')
+
+# Rows per yielded page while exporting (only affects write granularity)
+JOB_PAGE_ROWS = 100
+
+
+class ExportJobNotFoundError(LookupError):
+    """Raised for unknown or expired export job ids."""
+
+
+@dataclass
+class ExportJob:
+    """State of a background export, persisted as a manifest next to its file."""
+
+    id: str
+    format: str
+    filters: SearchFilters
+    created_at: float
+    plan: str = DEFAULT_PLAN  # submitter's plan, for admission scheduling
+    status: str = 'queued'
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    items_written: int = 0
+    offset: int = 0  # Crossref results consumed, failed normalizations included
+    bytes_written: int = 0  # output size at the last checkpoint
+    cursor: Optional[str] = None  # Crossref cursor after offset
+    cursor_at: float = 0.0
+    attempts: int = 0
+    failed_dois: int = 0  # BibTeX entries that could not be retrieved
+    error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has completed or failed."""
+        return self.status in ('completed', 'failed')
+
+    def to_dict(self, internal: bool = False) -> Dict[str, Any]:
+        """
+        Convert to dictionary for API response.
+
+        Args:
+            internal: Include checkpoint state (for the manifest, never
+                sent to clients)
+        """
+        data = {
+            'id': self.id,
+            'status': self.status,
+            'format': self.format,
+            'filters': self.filters.to_dict(),
+            'items_written': self.items_written,
+            'failed_dois': self.failed_dois,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'expires_at': self.expires_at,
+            'error': self.error,
+        }
+        if internal:
+            data['offset'] = self.offset
+            data['bytes_written'] = self.bytes_written
+            data['cursor'] = self.cursor
+            data['cursor_at'] = self.cursor_at
+            data['attempts'] = self.attempts
+            data['plan'] = self.plan
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ExportJob":
+        """Rebuild a job from its manifest."""
+        fields = dict(data)
+        fields['filters'] = SearchFilters(**fields['filters'])
+        fields.setdefault('offset', fields['items_written'])
+        return cls(**fields)
+
+
+class ExportJobManager:
+    """
+    Runs exports in the background and keeps their files on local disk.
+
+    Jobs are walked in segments of ``checkpoint_rows`` results. After each
+    segment the output is flushed to disk and the job manifest records
+    the item count, file size and Crossref offset and cursor, so a job interrupted
+    by a failure or restart resumes from its last checkpoint: output past
+    it is truncated and the walk re-walks to the offset. The cursor only
+    carries a walk from one segment to the next within an attempt: a
+    Crossref cursor is a scroll that every page fetched through it moves
+    on, so after an interrupted segment it no longer points at the
+    checkpoint. Failed attempts are retried up to ``max_attempts`` times.
+
+    With an admission controller, every segment waits for a slot under
+    the submitter's plan, so background exports share upstream capacity
+    with interactive requests; free-plan segments cost ``free_bulk_cost``
+    like free-plan bulk requests.
+
+    Finished jobs and their files are deleted ``retention`` seconds after
+    they finish.
+    """
+
+    def __init__(
+        self,
+        search_service: SearchService,
+        export_service: ExportService,
+        directory: str = "data/export_jobs",
+        max_results: int = 10000,
+        workers: int = 2,
+        checkpoint_rows: int = 1000,
+        retention: int = 86400,
+        max_attempts: int = 3,
+        retry_delay: float = 10.0,
+        admission: Optional[AdmissionController] = None,
+        free_bulk_cost: float = 1.0,
+        logger: Any = None,
+    ):
+        """
+        Initialize export job manager.
+
+        Args:
+            search_service: Service used to page through results
+            export_service: Service used to encode results
+            directory: Where job manifests and files are stored
+            max_results: Largest max_results a job may request
+            workers: Jobs exported concurrently
+            checkpoint_rows: Results written between checkpoints
+            retention: Seconds finished jobs are kept
+            max_attempts: Attempts before a job is marked failed
+            retry_delay: Base delay between attempts, in seconds
+            admission: Controller segments are admitted through (optional)
+            free_bulk_cost: Admission cost of a free-plan segment
+            logger: Structured logger (optional)
+        """
+        self.search_service = search_service
+        self.export_service = export_service
+        self.directory = Path(directory)
+        self.max_results = max_results
+        self.workers = workers
+        self.checkpoint_rows = checkpoint_rows
+        self.retention = retention
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.admission = admission
+        self.free_bulk_cost = free_bulk_cost
+        self.logger = logger or structlog.get_logger()
+        self.jobs: Dict[str, ExportJob] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Load jobs from disk, requeue unfinished ones and start the workers."""
+        await asyncio.to_thread(self.directory.mkdir, parents=True, exist_ok=True)
+
+        resumed = 0
+        for job in await asyncio.to_thread(self._load_manifests):
+            self.jobs[job.id] = job
+            if not job.finished:
+                # The interrupted segment may have moved the cursor on
+                job.status = 'queued'
+                job.cursor = None
+                self._queue.put_nowait(job.id)
+                resumed += 1
+        export_jobs_total.labels(event='resumed').inc(resumed)
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._sweep_periodically()))
+
+        self.logger.info(
+            "Export jobs started",
+            directory=str(self.directory),
+            jobs=len(self.jobs),
+            resumed=resumed
+        )
+
+    async def close(self) -> None:
+        """Stop the workers; running jobs resume from their checkpoint on next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, filters: SearchFilters, format: str, plan: str = DEFAULT_PLAN) -> ExportJob:
+        """
+        Queue an export.
+
+        Args:
+            filters: Search filters; max_results may go up to ``max_results``
+            format: One of JOB_FORMATS
+            plan: Submitter's subscription plan
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValidationError: If the format or filters are invalid
+        """
+        if format not in JOB_FORMATS:
+            raise ValidationError(
+                f"format must be one of: {', '.join(JOB_FORMATS)}, got: {format}"
+            )
+        if format in EXPORTERS and not EXPORTERS[format].available:
+            raise ValidationError(f"{format} export is not available on this server")
+        self.search_service.validate_filters(filters, max_results_limit=self.max_results)
+
+        job = ExportJob(
+            id=secrets.token_urlsafe(16),
+            format=format,
+            filters=filters,
+            created_at=time.time(),
+            plan=plan,
+        )
+        await self._save(job)
+        self.jobs[job.id] = job
+        self._queue.put_nowait(job.id)
+        export_jobs_total.labels(event='submitted').inc()
+
+        self.logger.info(
+            "Export job submitted",
+            job_id=job.id,
+            format=format,
+            plan=plan,
+            query=filters.query,
+            max_results=filters.max_results
+        )
+
+        return job
+
+    def get(self, job_id: str) -> ExportJob:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job id returned by submit()
+
+        Returns:
+            The job
+
+        Raises:
+            ExportJobNotFoundError: If the job is unknown or expired
+        """
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise ExportJobNotFoundError(job_id)
+        return job
+
+    def file_path(self, job: ExportJob) -> Path:
+        """Path of a completed job's file."""
+        extension, _ = JOB_FORMATS[job.format]
+        return self.directory / f"{job.id}.{extension}"
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is not None and not job.finished:
+                await self._run(job)
+
+    async def _run(self, job: ExportJob) -> None:
+        job.status = 'running'
+        job.started_at = job.started_at or time.time()
+        export_jobs_running.inc()
+        try:
+            while True:
+                job.attempts += 1
+                await self._save(job)
+                try:
+                    await self._export(job)
+                    break
+                except Exception as e:
+                    self.logger.warning(
+                        "Export job attempt failed",
+                        job_id=job.id,
+                        attempt=job.attempts,
+                        items_written=job.items_written,
+                        error=str(e),
+                        error_type=type(e).__name__
+                    )
+                    if job.attempts >= self.max_attempts:
+                        await self._finish(job, 'failed', error=type(e).__name__)
+                        return
+                    # Pages fetched before the failure moved the cursor
+                    # past the checkpoint; re-walk to the offset instead
+                    job.cursor = None
+                    delay = self.retry_delay * job.attempts
+                    if isinstance(e, CircuitOpenError):
+                        delay = max(delay, e.retry_after)
+                    await asyncio.sleep(delay)
+
+            await asyncio.to_thread(os.replace, self._part_path(job), self.file_path(job))
+            await self._finish(job, 'completed')
+        finally:
+            export_jobs_running.dec()
+
+    async def _export(self, job: ExportJob) -> None:
+        """Write the job's remaining results, checkpointing after each segment."""
+        exporter: Optional[StreamingExporter] = None
+        if job.format in EXPORTERS:
+            if job.bytes_written and not EXPORTERS[job.format].resumable:
+                # Columnar files cannot be continued; start over
+                job.items_written = job.offset = job.bytes_written = 0
+                job.cursor = None
+            exporter = create_exporter(
+                job.format,
+                resume=job.bytes_written > 0,
+                content_type=job.filters.content_type
+            )
+
+        part = self._part_path(job)
+        # Drop anything written after the last checkpoint
+        await asyncio.to_thread(self._truncate, part, job.bytes_written)
+
+        total = job.filters.max_results
+        while job.offset < total:
+            size = min(self.checkpoint_rows, total - job.offset)
+            filters = replace(job.filters, rows=JOB_PAGE_ROWS, max_results=size)
+            continuation = None
+            if job.offset:
+                continuation = Continuation(
+                    filters=job.filters,
+                    offset=job.offset,
+                    cursor=job.cursor,
+                    cursor_at=job.cursor_at,
+                )
+
+            position: Dict[str, Any] = {}
+            count = 0
+            written = job.bytes_written
+            await self._admit(job)
+            started = time.monotonic()
+            try:
+                async for items in self.search_service.iter_pages(
+                    filters,
+                    continuation=continuation,
+                    position=position,
+                    shard=False
+                ):
+                    if exporter is not None:
+                        data = exporter.write(items)
+                    else:
+                        data = await self._encode_bibtex(job, items, first=written == 0)
+                    await asyncio.to_thread(self._append, part, data)
+                    written += len(data)
+                    count += len(items)
+            finally:
+                if self.admission is not None:
+                    self.admission.release(time.monotonic() - started)
+
+            job.bytes_written = await asyncio.to_thread(self._sync, part)
+            job.items_written += count
+            job.offset += position['consumed']
+            job.cursor = position.get('cursor')
+            job.cursor_at = time.time()
+            await self._save(job)
+            export_job_items_total.inc(count)
+
+            self.logger.debug(
+                "Export job checkpoint",
+                job_id=job.id,
+                items_written=job.items_written,
+                bytes_written=job.bytes_written
+            )
+
+            if position['consumed'] < size:
+                # Results exhausted
+                break
+
+        if exporter is not None:
+            await asyncio.to_thread(self._append, part, exporter.close())
+            job.bytes_written = await asyncio.to_thread(self._sync, part)
+            await self._save(job)
+
+    async def _admit(self, job: ExportJob) -> None:
+        """Wait for an admission slot; being shed only delays the job."""
+        if self.admission is None:
+            return
+        cost = self.free_bulk_cost if job.plan == DEFAULT_PLAN else 1.0
+        while True:
+            try:
+                await self.admission.acquire(job.plan, cost)
+                return
+            except AdmissionRejected as e:
+                await asyncio.sleep(e.retry_after)
+
+    async def _encode_bibtex(self, job: ExportJob, items: List[NormalizedItem], first: bool) -> bytes:
+        dois = [item.doi for item in items if item.doi]
+        if not dois:
+            return b''
+        export = await self.export_service.export_bibtex_report(dois)
+        job.failed_dois += len(export.failed)
+        if not export.entries:
+            return b''
+        separator = '' if first else '\n\n'
+        return (separator + export.content).encode('utf-8')
+
+    async def _finish(self, job: ExportJob, status: str, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.expires_at = job.finished_at + self.retention
+        job.cursor = None
+        if status == 'failed':
+            await asyncio.to_thread(self._unlink, self._part_path(job))
+        await self._save(job)
+        export_jobs_total.labels(event=status).inc()
+
+        self.logger.info(
+            "Export job finished",
+            job_id=job.id,
+            status=status,
+            items_written=job.items_written,
+            bytes_written=job.bytes_written,
+            attempts=job.attempts,
+            duration_seconds=round(job.finished_at - job.started_at, 3)
+        )
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(min(self.retention, 600))
+            try:
+                await self.sweep()
+            except Exception as e:
+                self.logger.warning("Export job sweep failed", error=str(e))
+
+    async def sweep(self) -> int:
+        """
+        Delete finished jobs past their retention.
+
+        Returns:
+            Number of jobs deleted
+        """
+        now = time.time()
+        expired = [job for job in self.jobs.values() if job.finished and job.expires_at <= now]
+        for job in expired:
+            del self.jobs[job.id]
+            await asyncio.to_thread(self._delete_files, job)
+        if expired:
+            export_jobs_total.labels(event='expired').inc(len(expired))
+            self.logger.info("Expired export jobs deleted", count=len(expired))
+        return len(expired)
+
+    def _part_path(self, job: ExportJob) -> Path:
+        extension, _ = JOB_FORMATS[job.format]
+        return self.directory / f"{job.id}.{extension}.part"
+
+    def _manifest_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    async def _save(self, job: ExportJob) -> None:
+        await asyncio.to_thread(self._write_manifest, job.id, fast_json.dumps(job.to_dict(internal=True)))
+
+    def _write_manifest(self, job_id: str, encoded: bytes) -> None:
+        path = self._manifest_path(job_id)
+        tmp = self.directory / f"{job_id}.json.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _load_manifests(self) -> List[ExportJob]:
+        jobs = []
+        for path in self.directory.glob('*.json'):
+            try:
+                jobs.append(ExportJob.from_dict(fast_json.loads(path.read_bytes())))
+            except Exception as e:
+                self.logger.warning("Unreadable export job manifest", path=str(path), error=str(e))
+        return jobs
+
+    def _delete_files(self, job: ExportJob) -> None:
+        for path in (self.file_path(job), self._part_path(job), self._manifest_path(job.id)):
+            self._unlink(path)
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def _truncate(path: Path, size: int) -> None:
+        with open(path, 'ab') as f:
+            f.truncate(size)
+
+    @staticmethod
+    def _append(path: Path, data: bytes) -> None:
+        if data:
+            with open(path, 'ab') as f:
+                f.write(data)
+
+    @staticmethod
+    def _sync(path: Path) -> int:
+        with open(path, 'ab') as f:
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
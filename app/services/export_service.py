@@ -1,26 +1,52 @@
-"""Export service for generating CSV and BibTeX exports."""
-import csv
-import io
-from typing import List, Any
+"""Export service for generating CSV, BibTeX and streamed exports."""
+import asyncio
+from typing import AsyncIterator, Dict, List, Any, Optional
+import httpx
 import structlog
 
-from app.models import NormalizedItem
+from app.models import BibtexExport, NormalizedItem
+from app.services.bibtex_store import BibtexStore, NOT_FOUND, normalize_doi
 from app.services.crossref_client import CrossrefClient
+from app.utils.bibtex import BibtexRenderer, BibtexRenderError
+from app.utils.exporters import CSV_FIELDNAMES, create_exporter, encode_csv
+
+# BibTeX sources: content negotiation at doi.org, or rendered from metadata
+BIBTEX_MODES = ('remote', 'local')
 
 
 class ExportService:
     """Handles export operations in different formats."""
     
-    def __init__(self, crossref_client: CrossrefClient = None, logger: Any = None):
+    def __init__(
+        self,
+        crossref_client: CrossrefClient = None,
+        logger: Any = None,
+        bibtex_concurrency: int = 10,
+        bibtex_store: Optional[BibtexStore] = None,
+        bibtex_mode: str = "remote",
+    ):
         """
         Initialize export service.
         
         Args:
             crossref_client: Crossref client for BibTeX export (optional)
             logger: Structured logger (optional)
+            bibtex_concurrency: Maximum concurrent BibTeX lookups
+            bibtex_store: Persistent DOI-to-BibTeX store (optional)
+            bibtex_mode: "remote" to fetch every entry from doi.org, or
+                "local" to render entries from Crossref metadata and use
+                doi.org only for records that cannot be rendered
         """
+        if bibtex_mode not in BIBTEX_MODES:
+            raise ValueError(f"Unknown BibTeX mode: {bibtex_mode}")
         self.crossref_client = crossref_client
         self.logger = logger or structlog.get_logger()
+        self.bibtex_concurrency = bibtex_concurrency
+        self.bibtex_store = bibtex_store
+        self.bibtex_mode = bibtex_mode
+    
+    # CSV columns
+    CSV_FIELDNAMES = CSV_FIELDNAMES
     
     def export_csv(self, items: List[NormalizedItem]) -> str:
         """
@@ -32,59 +58,126 @@ class ExportService:
         Returns:
             CSV content as string with UTF-8 BOM
         """
-        # Create string buffer
-        output = io.StringIO()
-        
         # Add UTF-8 BOM for Excel compatibility
-        output.write('\ufeff')
+        csv_content = '\ufeff' + self.encode_csv(items, header=True)
         
-        # Define CSV columns
-        fieldnames = ['doi', 'title', 'authors', 'year', 'journal', 'abstract', 'url']
-        
-        # Create CSV writer
-        writer = csv.DictWriter(
-            output,
-            fieldnames=fieldnames,
-            quoting=csv.QUOTE_MINIMAL,
-            lineterminator='\n'
+        self.logger.info(
+            "CSV export generated",
+            items_count=len(items)
         )
         
-        # Write header
-        writer.writeheader()
+        return csv_content
+    
+    async def stream_csv(
+        self,
+        pages: AsyncIterator[List[NormalizedItem]],
+    ) -> AsyncIterator[str]:
+        """
+        Encode pages of normalized items as CSV chunks.
+        
+        The header is emitted together with the first page so that an
+        upstream failure on the first page surfaces before any bytes are sent.
         
-        # Write rows
-        for item in items:
-            row = item.to_dict()
+        Args:
+            pages: Async iterator of normalized item pages
             
-            # Replace newlines in abstract with space
-            if row.get('abstract'):
-                row['abstract'] = row['abstract'].replace('\n', ' ').replace('\r', ' ')
+        Yields:
+            CSV chunks; the first one starts with a UTF-8 BOM and the header
+        """
+        items_count = 0
+        header = True
+        
+        async for items in pages:
+            chunk = self.encode_csv(items, header=header)
+            if header:
+                chunk = '\ufeff' + chunk
+                header = False
+            items_count += len(items)
+            yield chunk
+        
+        if header:
+            # No results: still produce a valid file
+            yield '\ufeff' + self.encode_csv([], header=True)
+        
+        self.logger.info(
+            "CSV export streamed",
+            items_count=items_count
+        )
+    
+    def encode_csv(self, items: List[NormalizedItem], header: bool = False) -> str:
+        """
+        Encode items as CSV rows.
+        
+        Args:
+            items: Items to encode
+            header: Whether to start with the header row
+            
+        Returns:
+            CSV text
+        """
+        return encode_csv(items, header=header)
+    
+    async def stream_export(
+        self,
+        format: str,
+        pages: AsyncIterator[List[NormalizedItem]],
+        content_type: str = "journal-article",
+    ) -> AsyncIterator[bytes]:
+        """
+        Encode pages of normalized items with a streaming exporter.
+        
+        Each page is encoded as soon as it arrives, so memory stays bounded
+        by the page size (or a Parquet row group) whatever the export size.
+        
+        Args:
+            format: One of EXPORTERS
+            pages: Async iterator of normalized item pages
+            content_type: Crossref content type of the items
             
-            # Handle None values
-            row = {k: (v if v is not None else '') for k, v in row.items()}
+        Yields:
+            Encoded chunks
             
-            writer.writerow(row)
+        Raises:
+            ValueError: If the format is unknown
+            ExporterUnavailableError: If the format's optional package is missing
+        """
+        exporter = create_exporter(format, content_type=content_type)
+        bytes_count = 0
+        
+        async for items in pages:
+            chunk = exporter.write(items)
+            if chunk:
+                bytes_count += len(chunk)
+                yield chunk
         
-        # Get CSV content
-        csv_content = output.getvalue()
-        output.close()
+        chunk = exporter.close()
+        if chunk:
+            bytes_count += len(chunk)
+            yield chunk
         
         self.logger.info(
-            "CSV export generated",
-            items_count=len(items)
+            "Export streamed",
+            format=format,
+            items_count=exporter.items_count,
+            bytes_count=bytes_count
         )
-        
-        return csv_content
     
-    async def export_bibtex(self, dois: List[str]) -> str:
+    async def export_bibtex_report(self, dois: List[str]) -> BibtexExport:
         """
-        Get BibTeX entries for multiple DOIs.
+        Get BibTeX entries for multiple DOIs concurrently.
+        
+        In local mode, entries are first rendered from metadata fetched
+        with bulk Crossref queries. DOIs that still need doi.org (remote
+        mode, or records that cannot be rendered) are served from the
+        BibTeX store when known; the rest are fetched with at most
+        ``bibtex_concurrency`` lookups at once and written back. Entries
+        keep the order of the input DOIs and failures are reported per DOI.
         
         Args:
             dois: List of DOIs to retrieve
             
         Returns:
-            Concatenated BibTeX entries
+            BibtexExport with entries and failed DOIs
             
         Raises:
             ValueError: If crossref_client is not configured
@@ -92,37 +185,138 @@ class ExportService:
         if not self.crossref_client:
             raise ValueError("CrossrefClient is required for BibTeX export")
         
+        rendered: Dict[str, str] = {}
+        if self.bibtex_mode == 'local':
+            rendered = await self._render_local(dois)
+        remote_dois = [doi for doi in dois if doi not in rendered]
+        
+        stored = await self._lookup_stored(remote_dois)
+        semaphore = asyncio.Semaphore(self.bibtex_concurrency)
+        
+        async def fetch(doi: str) -> str:
+            async with semaphore:
+                bibtex = await self.crossref_client.get_bibtex(doi)
+            self.logger.debug(
+                "BibTeX retrieved",
+                doi=doi
+            )
+            return bibtex.strip()
+        
+        # Each DOI is fetched once, however often (and in whatever case)
+        # it is repeated
+        to_fetch: Dict[str, str] = {}
+        for doi in remote_dois:
+            key = normalize_doi(doi)
+            if key not in stored:
+                to_fetch.setdefault(key, doi)
+        fetched = await asyncio.gather(
+            *(fetch(doi) for doi in to_fetch.values()),
+            return_exceptions=True
+        )
+        fetched_by_key = dict(zip(to_fetch, fetched))
+        await self._write_back(dict(zip(to_fetch.values(), fetched)))
+        
         bibtex_entries = []
-        failed_dois = []
+        failed_dois: Dict[str, str] = {}
         
         for doi in dois:
-            try:
-                bibtex = await self.crossref_client.get_bibtex(doi)
-                bibtex_entries.append(bibtex.strip())
-                
-                self.logger.debug(
-                    "BibTeX retrieved",
-                    doi=doi
-                )
-                
-            except Exception as e:
-                # Log error but continue with other DOIs
+            if doi in rendered:
+                bibtex_entries.append(rendered[doi])
+                continue
+            
+            key = normalize_doi(doi)
+            if key in stored:
+                if stored[key] is NOT_FOUND:
+                    failed_dois[doi] = "NotFound"
+                else:
+                    bibtex_entries.append(stored[key])
+                continue
+            
+            result = fetched_by_key[key]
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.CancelledError):
+                    raise result
+                # Log error but keep the other DOIs
                 self.logger.warning(
                     "Failed to retrieve BibTeX",
                     doi=doi,
-                    error=str(e),
-                    error_type=type(e).__name__
+                    error=str(result),
+                    error_type=type(result).__name__
                 )
-                failed_dois.append(doi)
-        
-        # Concatenate entries with double newline
-        result = '\n\n'.join(bibtex_entries)
+                failed_dois[doi] = type(result).__name__
+            else:
+                bibtex_entries.append(result)
         
         self.logger.info(
             "BibTeX export completed",
             total_dois=len(dois),
             successful=len(bibtex_entries),
-            failed=len(failed_dois)
+            failed=len(failed_dois),
+            rendered_locally=len(rendered),
+            from_store=len(stored)
         )
         
-        return result
+        return BibtexExport(entries=bibtex_entries, failed=failed_dois)
+    
+    async def _render_local(self, dois: List[str]) -> Dict[str, str]:
+        """
+        Render BibTeX entries from Crossref metadata.
+        
+        Args:
+            dois: DOIs to render
+            
+        Returns:
+            Entries keyed by input DOI; DOIs that are unknown to Crossref,
+            failed or lack required fields are left out
+        """
+        try:
+            lookup = await self.crossref_client.get_works_by_doi(dois)
+        except Exception as e:
+            # doi.org can still serve every DOI
+            self.logger.warning("Metadata lookup for BibTeX failed", error=str(e))
+            return {}
+        
+        renderer = BibtexRenderer()
+        rendered: Dict[str, str] = {}
+        
+        for doi in dict.fromkeys(dois):
+            record = lookup.records.get(normalize_doi(doi))
+            if record is None:
+                continue
+            try:
+                rendered[doi] = renderer.render(record)
+            except BibtexRenderError as e:
+                self.logger.debug("BibTeX not renderable locally", doi=doi, reason=str(e))
+        
+        return rendered
+    
+    async def _lookup_stored(self, dois: List[str]) -> Dict[str, Optional[str]]:
+        """Bulk-load known DOIs from the BibTeX store, ignoring store errors."""
+        if self.bibtex_store is None:
+            return {}
+        try:
+            return await self.bibtex_store.get_many(dois)
+        except Exception as e:
+            self.logger.warning("BibTeX store lookup failed", error=str(e))
+            return {}
+    
+    async def _write_back(self, fetched: Dict[str, Any]) -> None:
+        """Persist fetched entries and DOIs that returned 404."""
+        if self.bibtex_store is None:
+            return
+        
+        entries = {
+            doi: result for doi, result in fetched.items()
+            if isinstance(result, str)
+        }
+        not_found = [
+            doi for doi, result in fetched.items()
+            if isinstance(result, httpx.HTTPStatusError)
+            and result.response.status_code == 404
+        ]
+        
+        try:
+            await self.bibtex_store.put_many(entries)
+            await self.bibtex_store.put_not_found(not_found)
+        except Exception as e:
+            self.logger.warning("BibTeX store write failed", error=str(e))
@@ -0,0 +1,175 @@
+"""Hedged upstream requests for tail-latency reduction."""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Optional
+
+from prometheus_client import Counter, Gauge
+
+
+hedges_sent_total = Counter(
+    'upstream_hedges_sent_total',
+    'Duplicate requests sent because the first one was slow',
+    ['name']
+)
+hedges_won_total = Counter(
+    'upstream_hedges_won_total',
+    'Hedged requests that answered before the original',
+    ['name']
+)
+hedges_skipped_total = Counter(
+    'upstream_hedges_skipped_total',
+    'Hedges not sent because the extra-load budget was spent',
+    ['name']
+)
+hedge_delay_seconds = Gauge(
+    'upstream_hedge_delay_seconds',
+    'Current delay before a hedge is sent',
+    ['name']
+)
+
+
+class LatencyTracker:
+    """Percentile over a sliding window of recent latencies."""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Number of recent samples kept
+        """
+        self._samples: deque = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample."""
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Get a percentile of the recorded latencies.
+
+        Args:
+            fraction: Percentile as a fraction (0.95 for p95)
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+        return ordered[index]
+
+
+class HedgingPolicy:
+    """
+    Sends a duplicate request when the first one runs past a percentile.
+
+    The hedge delay follows ``percentile`` of recent latencies (falling
+    back to ``initial_delay`` until ``min_samples`` are recorded).
+    Whichever request succeeds first wins and the other is cancelled.
+    Extra load is capped by a budget: every call earns ``budget`` hedge
+    credits and each hedge spends one, so at most roughly ``budget``
+    times the call volume is duplicated.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        percentile: float = 0.95,
+        budget: float = 0.05,
+        initial_delay: float = 1.0,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+    ):
+        """
+        Initialize hedging policy.
+
+        Args:
+            name: Name used in metrics
+            percentile: Latency percentile after which a hedge is sent
+            budget: Hedges allowed per call, on average
+            initial_delay: Hedge delay until enough samples exist
+            min_delay: Lower bound for the hedge delay
+            min_samples: Samples needed before the percentile is used
+            window: Number of recent latencies tracked
+        """
+        self.name = name
+        self.percentile = percentile
+        self.budget = budget
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker(window)
+        # Start with one credit so the first slow call can be hedged
+        self._max_credits = max(1.0, budget * 100)
+        self._credits = 1.0
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait before hedging."""
+        if len(self.latencies) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, self.latencies.percentile(self.percentile))
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, hedging it if it is slow.
+
+        Args:
+            fn: Coroutine factory performing one request; called again
+                for the hedge
+
+        Returns:
+            Result of the first request to succeed
+
+        Raises:
+            Exception: The original request's error if both requests fail
+        """
+        self._credits = min(self._max_credits, self._credits + self.budget)
+        delay = self.delay
+        hedge_delay_seconds.labels(name=self.name).set(delay)
+
+        primary = asyncio.create_task(self._timed(fn))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or self._credits < 1:
+                if not done:
+                    hedges_skipped_total.labels(name=self.name).inc()
+                return await primary
+
+            self._credits -= 1
+            hedges_sent_total.labels(name=self.name).inc()
+            hedge = asyncio.create_task(self._timed(fn))
+            return await self._first_success(primary, hedge)
+        finally:
+            if not primary.done():
+                primary.cancel()
+
+    async def _first_success(self, primary: asyncio.Task, hedge: asyncio.Task) -> Any:
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in (primary, hedge):
+                    if task in done and task.exception() is None:
+                        if task is hedge:
+                            hedges_won_total.labels(name=self.name).inc()
+                        return task.result()
+            # Both failed: report the original request's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        result = await fn()
+        self.latencies.record(time.monotonic() - started)
+        return result
@@ -0,0 +1,228 @@
+"""HTTP transport helpers for upstream clients."""
+import asyncio
+import time
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+from prometheus_client import Gauge, Histogram
+
+from app.services.rate_governor import RateGovernedTransport, RateGovernor
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
+
+upstream_requests_in_flight = Gauge(
+    'upstream_requests_in_flight',
+    'Upstream requests holding a per-host slot',
+    ['host']
+)
+upstream_pool_connections = Gauge(
+    'upstream_pool_connections',
+    'Connections in the upstream pool by state',
+    ['state']
+)
+upstream_connection_setup_seconds = Histogram(
+    'upstream_connection_setup_seconds',
+    'Time spent opening upstream connections',
+    ['host', 'phase'],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5]
+)
+
+try:
+    from httpx._decoders import SUPPORTED_DECODERS
+except ImportError:  # pragma: no cover - private httpx module moved
+    SUPPORTED_DECODERS = {'gzip': None, 'deflate': None}
+
+# Content codings httpx can decode here (br and zstd when their optional
+# packages are installed), most compact first
+ACCEPT_ENCODING = ', '.join(
+    coding for coding in ('zstd', 'br', 'gzip', 'deflate')
+    if coding in SUPPORTED_DECODERS
+)
+
+# httpcore trace events timed as connection setup, by phase
+_SETUP_PHASES = {
+    'connection.connect_tcp': 'tcp',
+    'connection.start_tls': 'tls',
+    'http2.send_connection_init': 'http2_init',
+}
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that releases a host slot once the body is closed."""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        semaphore: asyncio.Semaphore,
+        host: str,
+        on_release: Any = None,
+    ):
+        self._stream = stream
+        self._semaphore = semaphore
+        self._host = host
+        self._on_release = on_release
+        self._released = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                self._semaphore.release()
+                upstream_requests_in_flight.labels(host=self._host).dec()
+                if self._on_release is not None:
+                    self._on_release()
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper capping concurrent requests per host.
+
+    httpx only limits the pool as a whole, so a burst against one host
+    (e.g. doi.org during a bibliography export) could take every
+    connection. Each hop of a redirect chain is limited against its own
+    host, and a slot stays taken until the response body is closed.
+
+    The wrapper also exports per-host slot usage, pool connection counts
+    and connection setup time (from httpcore trace events) to Prometheus.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        max_per_host: int = 10,
+        host_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize host-limited transport.
+
+        Args:
+            transport: Underlying transport performing the requests
+            max_per_host: Default concurrent requests allowed per host
+            host_limits: Per-host overrides of max_per_host
+        """
+        self._transport = transport
+        self.max_per_host = max_per_host
+        self.host_limits = host_limits or {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            limit = self.host_limits.get(host, self.max_per_host)
+            semaphore = asyncio.Semaphore(limit)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphore_for(host)
+        await semaphore.acquire()
+        in_flight = upstream_requests_in_flight.labels(host=host)
+        in_flight.inc()
+        request.extensions['trace'] = self._trace_for(host, request.extensions.get('trace'))
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            in_flight.dec()
+            self._update_pool_gauges()
+            raise
+
+        if isinstance(response.stream, httpx.ByteStream):
+            # In-memory body: no connection is held while it is read
+            semaphore.release()
+            in_flight.dec()
+            self._update_pool_gauges()
+            return response
+
+        self._update_pool_gauges()
+        response.stream = _ReleasingStream(
+            response.stream, semaphore, host, self._update_pool_gauges
+        )
+        return response
+
+    @staticmethod
+    def _trace_for(host: str, inner: Any = None) -> Any:
+        started: Dict[str, float] = {}
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            step, _, stage = event.rpartition('.')
+            phase = _SETUP_PHASES.get(step)
+            if phase is not None:
+                if stage == 'started':
+                    started[phase] = time.perf_counter()
+                elif stage == 'complete' and phase in started:
+                    upstream_connection_setup_seconds.labels(host=host, phase=phase).observe(
+                        time.perf_counter() - started.pop(phase)
+                    )
+            if inner is not None:
+                await inner(event, info)
+
+        return trace
+
+    def _update_pool_gauges(self) -> None:
+        # httpx does not expose its httpcore pool publicly
+        pool = getattr(self._transport, '_pool', None)
+        connections = getattr(pool, 'connections', None)
+        if connections is None:
+            return
+        idle = sum(1 for connection in connections if connection.is_idle())
+        upstream_pool_connections.labels(state='idle').set(idle)
+        upstream_pool_connections.labels(state='active').set(len(connections) - idle)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def build_transport(
+    max_connections: int = 50,
+    max_connections_per_host: int = 10,
+    host_limits: Optional[Dict[str, int]] = None,
+    keepalive_expiry: float = 30.0,
+    http2: bool = False,
+    rate_governor: Optional[RateGovernor] = None,
+    rate_limited_hosts: Iterable[str] = (),
+) -> httpx.AsyncBaseTransport:
+    """
+    Build the pooled, host-limited transport used for upstream requests.
+
+    HTTP/2 is only enabled when the optional ``h2`` package is installed;
+    otherwise connections fall back to HTTP/1.1.
+
+    Args:
+        max_connections: Maximum connections in the shared pool
+        max_connections_per_host: Default concurrent requests per host
+        host_limits: Per-host overrides of max_connections_per_host
+        keepalive_expiry: Seconds an idle connection is kept open
+        http2: Negotiate HTTP/2 where the server supports it
+        rate_governor: Governor pacing requests to rate_limited_hosts
+        rate_limited_hosts: Hosts sharing the governor's budget
+
+    Returns:
+        Configured transport
+    """
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    transport: httpx.AsyncBaseTransport = HostLimitedTransport(
+        httpx.AsyncHTTPTransport(limits=limits, http2=http2 and HTTP2_AVAILABLE),
+        max_per_host=max_connections_per_host,
+        host_limits=host_limits,
+    )
+    if rate_governor is not None:
+        # Pace before taking a host slot so waiting requests hold no slot
+        transport = RateGovernedTransport(transport, rate_governor, rate_limited_hosts)
+    return transport
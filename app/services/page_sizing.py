@@ -0,0 +1,106 @@
+"""Adaptive upstream page sizing."""
+import math
+from typing import Optional
+
+from prometheus_client import Histogram
+
+
+upstream_page_rows = Histogram(
+    'upstream_page_rows',
+    'Rows requested per upstream page',
+    buckets=[10, 20, 50, 100, 200, 300, 500, 750, 1000]
+)
+
+
+class PageSizer:
+    """
+    Chooses how many rows to request per upstream page.
+
+    The user-facing ``rows`` only shapes how results are presented; the
+    upstream page size is picked here to minimize round trips. A page is
+    as large as the remaining results allow, bounded by:
+
+    - ``max_rows``, the upstream's own limit;
+    - ``max_page_bytes``, using the observed body size per item;
+    - ``target_page_seconds``, using the observed latency per item.
+
+    Latency per item includes each request's fixed overhead, so the
+    estimate starts pessimistic and grows as larger pages amortize it.
+    When several pages are needed the remainder is split evenly, so no
+    page is left with a handful of rows.
+    """
+
+    def __init__(
+        self,
+        min_rows: int = 20,
+        max_rows: int = 1000,
+        initial_rows: int = 200,
+        target_page_seconds: float = 2.0,
+        max_page_bytes: int = 4 * 1024 * 1024,
+        smoothing: float = 0.3,
+    ):
+        """
+        Initialize page sizer.
+
+        Args:
+            min_rows: Smallest page requested when more results are needed
+            max_rows: Largest page the upstream accepts
+            initial_rows: Page size cap until a page has been observed
+            target_page_seconds: Latency a single page should stay under
+            max_page_bytes: Body size a single page should stay under
+            smoothing: Weight of the newest observation (0-1)
+        """
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.initial_rows = initial_rows
+        self.target_page_seconds = target_page_seconds
+        self.max_page_bytes = max_page_bytes
+        self.smoothing = smoothing
+        self.seconds_per_item: Optional[float] = None
+        self.bytes_per_item: Optional[float] = None
+
+    @property
+    def page_limit(self) -> int:
+        """Largest page currently considered safe."""
+        if self.seconds_per_item is None:
+            limit = self.initial_rows
+        else:
+            limit = self.target_page_seconds / self.seconds_per_item
+        if self.bytes_per_item:
+            limit = min(limit, self.max_page_bytes / self.bytes_per_item)
+        return max(self.min_rows, min(self.max_rows, int(limit)))
+
+    def size(self, remaining: int) -> int:
+        """
+        Rows to request for the next page.
+
+        Args:
+            remaining: Results still wanted
+
+        Returns:
+            Page size
+        """
+        limit = self.page_limit
+        pages = max(1, math.ceil(remaining / limit))
+        rows = max(1, min(limit, math.ceil(remaining / pages)))
+        upstream_page_rows.observe(rows)
+        return rows
+
+    def observe(self, items: int, seconds: float, body_bytes: int) -> None:
+        """
+        Learn from a completed page.
+
+        Args:
+            items: Items returned
+            seconds: Time taken by the request
+            body_bytes: Decompressed body size
+        """
+        if items <= 0:
+            return
+        self.seconds_per_item = self._smooth(self.seconds_per_item, seconds / items)
+        self.bytes_per_item = self._smooth(self.bytes_per_item, body_bytes / items)
+
+    def _smooth(self, current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return current + self.smoothing * (sample - current)
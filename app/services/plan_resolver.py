@@ -0,0 +1,80 @@
+"""Resolve the subscription plan behind a request."""
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import structlog
+from fastapi import HTTPException
+
+from app.auth_models.subscription import SubscriptionPlan
+from app.repositories import subscription_repository
+from app.services.auth_service import verify_token
+
+
+class PlanResolver:
+    """
+    Maps a request's bearer token to its subscription plan.
+
+    Search and export endpoints do not require authentication, so this
+    never rejects a request: missing, invalid or expired tokens and users
+    without an active subscription all resolve to the free plan. Plans are
+    cached per user for ``ttl`` seconds so scheduling does not add a
+    database round trip to every request.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000, logger: Any = None):
+        """
+        Initialize plan resolver.
+
+        Args:
+            ttl: Seconds a user's plan is cached
+            max_entries: Cached users before the cache is reset
+            logger: Structured logger (optional)
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.logger = logger or structlog.get_logger()
+        self._plans: Dict[int, Tuple[str, float]] = {}
+
+    async def resolve(self, authorization: Optional[str]) -> str:
+        """
+        Resolve the plan for an Authorization header.
+
+        Args:
+            authorization: Raw Authorization header value, if any
+
+        Returns:
+            Plan name
+        """
+        user_id = self._user_id(authorization)
+        if user_id is None:
+            return SubscriptionPlan.FREE.value
+
+        cached = self._plans.get(user_id)
+        now = time.monotonic()
+        if cached and cached[1] > now:
+            return cached[0]
+
+        try:
+            plan = await subscription_repository.get_active_plan(user_id)
+        except Exception as e:
+            self.logger.warning("Plan lookup failed, scheduling as free", user_id=user_id, error=str(e))
+            return SubscriptionPlan.FREE.value
+
+        name = plan.value if plan else SubscriptionPlan.FREE.value
+        if len(self._plans) >= self.max_entries:
+            self._plans.clear()
+        self._plans[user_id] = (name, now + self.ttl)
+        return name
+
+    @staticmethod
+    def _user_id(authorization: Optional[str]) -> Optional[int]:
+        if not authorization:
+            return None
+        scheme, _, token = authorization.partition(" ")
+        if scheme.lower() != "bearer" or not token.strip():
+            return None
+        try:
+            subject = verify_token(token.strip()).get("sub")
+            return int(subject) if subject is not None else None
+        except (HTTPException, TypeError, ValueError):
+            return None
@@ -0,0 +1,229 @@
+"""Adaptive token-bucket pacing of upstream requests."""
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Mapping, Optional
+
+import httpx
+from prometheus_client import Counter, Gauge, Histogram
+
+
+upstream_rate_limit = Gauge(
+    'upstream_rate_limit_per_second',
+    'Request rate currently allowed by the rate governor'
+)
+upstream_rate_wait_seconds = Histogram(
+    'upstream_rate_wait_seconds',
+    'Time requests waited for the rate governor',
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+)
+upstream_throttled_total = Counter(
+    'upstream_throttled_total',
+    'Upstream responses asking the client to slow down',
+    ['status']
+)
+
+# Statuses after which the upstream may send Retry-After
+THROTTLE_STATUSES = (429, 503)
+
+_INTERVAL_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+def parse_interval(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Crossref ``X-Rate-Limit-Interval`` value such as ``1s``.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Interval in seconds, or None if missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip().lower()
+    unit = _INTERVAL_UNITS.get(value[-1:])
+    number = value[:-1] if unit else value
+    try:
+        seconds = float(number) * (unit or 1)
+    except ValueError:
+        return None
+    return seconds if seconds > 0 else None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a ``Retry-After`` header (delay in seconds or an HTTP date).
+
+    Args:
+        value: Header value
+
+    Returns:
+        Seconds to wait, or None if missing or malformed
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateGovernor:
+    """
+    Token bucket shared by every request to a rate-limited upstream.
+
+    The rate starts at a configured value and is replaced by the one
+    advertised in ``X-Rate-Limit-Limit``/``X-Rate-Limit-Interval`` headers,
+    scaled by ``headroom`` to stay clear of the limit. A ``Retry-After``
+    on a throttling response blocks all callers until it has elapsed;
+    without one, a 429 halves the rate until the headers restore it.
+    Waiters are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        headroom: float = 0.9,
+        max_retry_after: float = 60.0,
+        min_rate: float = 0.5,
+    ):
+        """
+        Initialize rate governor.
+
+        Args:
+            rate: Requests per second allowed until headers say otherwise
+            headroom: Fraction of the advertised limit actually used
+            max_retry_after: Longest Retry-After honored, in seconds
+            min_rate: Floor for the rate after repeated throttling
+        """
+        self.headroom = headroom
+        self.max_retry_after = max_retry_after
+        self.min_rate = min_rate
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        upstream_rate_limit.set(rate)
+
+    async def acquire(self) -> float:
+        """
+        Wait for permission to send one request.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                delay = self.blocked_until - now
+                if delay <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    delay = (1 - self.tokens) / self.rate
+                await asyncio.sleep(delay)
+
+        waited = time.monotonic() - started
+        upstream_rate_wait_seconds.observe(waited)
+        return waited
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """
+        Learn from an upstream response.
+
+        Args:
+            status_code: Response status
+            headers: Response headers
+        """
+        limit = headers.get('x-rate-limit-limit')
+        interval = parse_interval(headers.get('x-rate-limit-interval'))
+        if limit and interval:
+            try:
+                self._set_rate(float(limit) / interval * self.headroom)
+            except ValueError:
+                pass
+
+        if status_code not in THROTTLE_STATUSES:
+            return
+
+        upstream_throttled_total.labels(status=str(status_code)).inc()
+        retry_after = parse_retry_after(headers.get('retry-after'))
+        if retry_after is None:
+            if status_code != 429:
+                return
+            self._set_rate(self.rate / 2)
+            retry_after = 1 / self.rate
+        self.block_for(retry_after)
+
+    def block_for(self, seconds: float) -> None:
+        """
+        Hold back every request for a while.
+
+        Args:
+            seconds: Delay, capped at max_retry_after
+        """
+        now = time.monotonic()
+        self._refill(now)
+        self.blocked_until = max(self.blocked_until, now + min(seconds, self.max_retry_after))
+        # Resume with a single request, not a burst accumulated while blocked
+        self.tokens = 1.0
+        self._updated_at = self.blocked_until
+
+    def _set_rate(self, rate: float) -> None:
+        rate = max(rate, self.min_rate)
+        if rate == self.rate:
+            return
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = min(self.tokens, self.capacity)
+        upstream_rate_limit.set(rate)
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+
+class RateGovernedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper pacing requests to selected hosts through a governor."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        governor: RateGovernor,
+        hosts: Iterable[str],
+    ):
+        """
+        Initialize governed transport.
+
+        Args:
+            transport: Underlying transport performing the requests
+            governor: Shared rate governor
+            hosts: Hosts whose requests are paced
+        """
+        self._transport = transport
+        self.governor = governor
+        self.hosts = frozenset(hosts)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.host not in self.hosts:
+            return await self._transport.handle_async_request(request)
+
+        await self.governor.acquire()
+        response = await self._transport.handle_async_request(request)
+        self.governor.observe(response.status_code, response.headers)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
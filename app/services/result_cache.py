@@ -0,0 +1,428 @@
+"""Tiered result cache for Crossref searches."""
+import asyncio
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import structlog
+from prometheus_client import Counter, Gauge
+
+from app.models import SearchFilters
+from app.utils import fast_json
+
+
+# Cache metrics (exported through the default registry on /metrics)
+result_cache_hits_total = Counter(
+    'result_cache_hits_total',
+    'Result cache hits',
+    ['tier', 'freshness']
+)
+result_cache_misses_total = Counter('result_cache_misses_total', 'Result cache misses')
+result_cache_evictions_total = Counter(
+    'result_cache_evictions_total',
+    'Result cache evictions from the in-process tier',
+    ['reason']
+)
+result_cache_refreshes_total = Counter(
+    'result_cache_refreshes_total',
+    'Background stale-while-revalidate refreshes',
+    ['outcome']
+)
+result_cache_bytes = Gauge('result_cache_bytes', 'Bytes held by the in-process result cache')
+result_cache_entries = Gauge('result_cache_entries', 'Entries held by the in-process result cache')
+
+
+def make_cache_key(filters: SearchFilters) -> str:
+    """
+    Build a cache key from normalized search filters.
+
+    The query is case-folded and whitespace-collapsed so trivially
+    different spellings of the same search share one entry. ``rows``
+    only affects presentation, not which results are fetched, so it is
+    left out.
+
+    Args:
+        filters: Search filters
+
+    Returns:
+        Hex digest identifying the search
+    """
+    normalized = filters.to_dict()
+    normalized['query'] = ' '.join(filters.query.split()).casefold()
+    normalized.pop('rows', None)
+    encoded = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """A cached value with its storage time and encoded size."""
+
+    value: Any
+    stored_at: float
+    size: int
+
+
+class LRUCache:
+    """In-process LRU cache bounded by entry count and encoded byte size."""
+
+    def __init__(self, max_bytes: int, max_entries: int = 1024):
+        """
+        Initialize LRU cache.
+
+        Args:
+            max_bytes: Maximum total encoded size of all entries
+            max_entries: Maximum number of entries
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.current_bytes = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Get an entry and mark it as most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cache entry or None if absent
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Store an entry, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            entry: Entry to store
+        """
+        self.delete(key)
+
+        # Entries larger than the whole budget are never stored
+        if entry.size > self.max_bytes:
+            result_cache_evictions_total.labels(reason='oversize').inc()
+            return
+
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+
+        while self._entries and (
+            self.current_bytes > self.max_bytes or len(self._entries) > self.max_entries
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            result_cache_evictions_total.labels(reason='capacity').inc()
+
+        self._update_gauges()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: Cache key
+        """
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+            self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        result_cache_bytes.set(self.current_bytes)
+        result_cache_entries.set(len(self._entries))
+
+
+class SharedCacheBackend(ABC):
+    """Interface for a cache shared between worker processes."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for key, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        """Store bytes under key for ttl seconds."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class LocalSharedCache(SharedCacheBackend):
+    """
+    Process-local stand-in for a shared backend.
+
+    Useful in development and single-worker deployments where no
+    external cache server is available. Expired entries are dropped on
+    access and swept every ``SWEEP_EVERY`` writes; beyond ``max_entries``
+    the oldest writes are evicted.
+    """
+
+    SWEEP_EVERY = 1000
+
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize local backend.
+
+        Args:
+            max_entries: Maximum number of stored entries
+        """
+        self.max_entries = max_entries
+        self._store: Dict[str, Tuple[bytes, float]] = {}
+        self._writes = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        item = self._store.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if time.monotonic() >= expires_at:
+            del self._store[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        # Re-inserting keeps the dict in write order for eviction
+        self._store.pop(key, None)
+        self._store[key] = (value, time.monotonic() + ttl)
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            now = time.monotonic()
+            for expired in [k for k, (_, expires_at) in self._store.items() if now >= expires_at]:
+                del self._store[expired]
+        while len(self._store) > self.max_entries:
+            del self._store[next(iter(self._store))]
+
+
+class RedisSharedCache(SharedCacheBackend):
+    """Shared backend on Redis (requires the optional ``redis`` package)."""
+
+    def __init__(self, url: str, prefix: str = "uiresearch:search:"):
+        """
+        Initialize Redis backend.
+
+        Args:
+            url: Redis connection URL
+            prefix: Key prefix for cache entries
+        """
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: int) -> None:
+        await self.client.set(self.prefix + key, value, ex=ttl)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+class ResultCache:
+    """
+    Two-tier search result cache with stale-while-revalidate.
+
+    Entries younger than ``ttl`` are served as fresh. Entries between
+    ``ttl`` and ``ttl + stale_ttl`` are served immediately while a
+    background task refreshes them. Older entries count as misses.
+    Values must be JSON-serializable so they can live in the shared tier.
+    """
+
+    def __init__(
+        self,
+        ttl: int = 300,
+        stale_ttl: int = 900,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 1024,
+        shared: Optional[SharedCacheBackend] = None,
+        logger: Any = None,
+    ):
+        """
+        Initialize result cache.
+
+        Args:
+            ttl: Seconds an entry is considered fresh
+            stale_ttl: Extra seconds a stale entry may be served while refreshing
+            max_bytes: Byte budget of the in-process tier
+            max_entries: Entry budget of the in-process tier
+            shared: Optional shared backend used as second tier
+            logger: Structured logger (optional)
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.local = LRUCache(max_bytes=max_bytes, max_entries=max_entries)
+        self.shared = shared
+        self.logger = logger or structlog.get_logger()
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        refresh: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Return the cached value for key, fetching it on a miss.
+
+        Args:
+            key: Cache key
+            fetch: Coroutine factory producing a fresh value
+            refresh: Coroutine factory for background refreshes, which
+                outlive the caller (defaults to fetch)
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        entry, tier = await self._lookup(key)
+
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            if age < self.ttl:
+                result_cache_hits_total.labels(tier=tier, freshness='fresh').inc()
+                return entry.value
+            if age < self.ttl + self.stale_ttl:
+                result_cache_hits_total.labels(tier=tier, freshness='stale').inc()
+                self._schedule_refresh(key, refresh or fetch)
+                return entry.value
+
+        result_cache_misses_total.inc()
+        value = await fetch()
+        await self.set(key, value)
+        return value
+
+    async def get_stale(self, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Return a cached value regardless of its age.
+
+        Used as a fallback when the upstream is unavailable; entries stay
+        in the in-process tier past their stale window until evicted.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, age in seconds), or None if nothing is cached
+        """
+        entry, tier = await self._lookup(key)
+        if entry is None:
+            return None
+        result_cache_hits_total.labels(tier=tier, freshness='fallback').inc()
+        return entry.value, time.time() - entry.stored_at
+
+    async def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        stored_at = time.time()
+        encoded = fast_json.dumps({'stored_at': stored_at, 'value': value})
+
+        self.local.set(key, CacheEntry(value=value, stored_at=stored_at, size=len(encoded)))
+
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, encoded, self.ttl + self.stale_ttl)
+            except Exception as e:
+                self.logger.warning("Shared cache write failed", error=str(e))
+
+    async def close(self) -> None:
+        """Cancel pending refreshes and close the shared backend."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+        if self.shared is not None:
+            await self.shared.close()
+
+    async def _lookup(self, key: str) -> Tuple[Optional[CacheEntry], str]:
+        entry = self.local.get(key)
+        if entry is not None:
+            return entry, 'memory'
+
+        if self.shared is None:
+            return None, 'memory'
+
+        try:
+            encoded = await self.shared.get(key)
+        except Exception as e:
+            self.logger.warning("Shared cache read failed", error=str(e))
+            return None, 'shared'
+
+        if encoded is None:
+            return None, 'shared'
+
+        data = fast_json.loads(encoded)
+        entry = CacheEntry(value=data['value'], stored_at=data['stored_at'], size=len(encoded))
+        # Promote to the in-process tier
+        self.local.set(key, entry)
+        return entry, 'shared'
+
+    def _schedule_refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            value = await fetch()
+            await self.set(key, value)
+            result_cache_refreshes_total.labels(outcome='success').inc()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result_cache_refreshes_total.labels(outcome='error').inc()
+            self.logger.warning("Background cache refresh failed", error=str(e))
+
+
+def create_result_cache(settings: Any, logger: Any = None) -> Optional[ResultCache]:
+    """
+    Build the result cache described by application settings.
+
+    Args:
+        settings: Application settings
+        logger: Structured logger (optional)
+
+    Returns:
+        Configured ResultCache, or None if caching is disabled
+    """
+    if not settings.result_cache_enabled:
+        return None
+
+    logger = logger or structlog.get_logger()
+    shared: Optional[SharedCacheBackend] = None
+
+    if settings.result_cache_backend == "redis":
+        try:
+            shared = RedisSharedCache(settings.result_cache_redis_url)
+        except ImportError:
+            logger.warning("redis package not installed, using local shared cache stand-in")
+            shared = LocalSharedCache()
+    elif settings.result_cache_backend == "local":
+        shared = LocalSharedCache()
+
+    return ResultCache(
+        ttl=settings.result_cache_ttl,
+        stale_ttl=settings.result_cache_stale_ttl,
+        max_bytes=settings.result_cache_max_bytes,
+        max_entries=settings.result_cache_max_entries,
+        shared=shared,
+        logger=logger,
+    )
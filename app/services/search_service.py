@@ -1,33 +1,65 @@
 """Search service for orchestrating Crossref searches."""
-from typing import Any
+import time
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import structlog
 
 from app.models import SearchFilters, SearchResult, NormalizedItem
+from app.services.circuit_breaker import CircuitOpenError
+from app.services.continuation import Continuation, ContinuationStore
 from app.services.crossref_client import CrossrefClient
-from app.utils.normalizer import DataNormalizer
+from app.services.deadline import Deadline, DeadlineExceeded
+from app.services.normalization_pool import NormalizationPool, normalize_batch
+from app.services.result_cache import ResultCache, make_cache_key
+from app.services.single_flight import SingleFlight
 from app.utils.validators import Validators, ValidationError
 
 
+class _PartialResult(Exception):
+    """Carries a deadline-truncated result past the cache, which must not store it."""
+    
+    def __init__(self, value: dict):
+        super().__init__("partial result")
+        self.value = value
+
+
 class SearchService:
     """Orchestrates search operations with validation and logging."""
     
-    def __init__(self, crossref_client: CrossrefClient, logger: Any = None):
+    def __init__(
+        self,
+        crossref_client: CrossrefClient,
+        logger: Any = None,
+        result_cache: Optional[ResultCache] = None,
+        normalization_pool: Optional[NormalizationPool] = None,
+        continuations: Optional[ContinuationStore] = None,
+    ):
         """
         Initialize search service.
         
         Args:
             crossref_client: Crossref API client
             logger: Structured logger (optional)
+            result_cache: Cache for search results (optional)
+            normalization_pool: Worker pool for large normalizations (optional)
+            continuations: Store for continuation tokens (optional; without
+                it results carry no next_token)
         """
         self.crossref_client = crossref_client
         self.logger = logger or structlog.get_logger()
+        self.result_cache = result_cache
+        self.normalization_pool = normalization_pool
+        self.continuations = continuations
+        self._in_flight = SingleFlight("search")
     
-    def validate_filters(self, filters: SearchFilters) -> None:
+    def validate_filters(self, filters: SearchFilters, max_results_limit: int = 500) -> None:
         """
         Validate search filters.
         
         Args:
             filters: Search filters to validate
+            max_results_limit: Largest max_results accepted (higher for
+                background export jobs than for interactive requests)
             
         Raises:
             ValidationError: If any filter is invalid
@@ -50,7 +82,7 @@ class SearchService:
         Validators.validate_numeric_range(
             filters.max_results,
             min_val=1,
-            max_val=500,
+            max_val=max_results_limit,
             field_name="max_results"
         )
         
@@ -64,6 +96,7 @@ class SearchService:
         self,
         query: str,
         filters: SearchFilters,
+        deadline: Optional[Deadline] = None,
     ) -> SearchResult:
         """
         Execute search with validation and logging.
@@ -71,12 +104,15 @@ class SearchService:
         Args:
             query: Search query (for logging, already in filters)
             filters: Validated search filters
+            deadline: Request deadline; when it passes, the results fetched
+                so far are returned with ``partial`` set (never cached)
             
         Returns:
             SearchResult with normalized items
             
         Raises:
             ValidationError: If filters are invalid
+            DeadlineExceeded: If the deadline passes before any result arrives
             Exception: For other errors during search
         """
         # Validate filters
@@ -96,44 +132,38 @@ class SearchService:
         )
         
         try:
-            # Execute search via Crossref client
-            raw_items = await self.crossref_client.search(
-                query=filters.query,
-                from_date=filters.from_date,
-                until_date=filters.until_date,
-                content_type=filters.content_type,
-                has_abstract=filters.has_abstract,
-                rows=filters.rows,
-                max_results=filters.max_results,
-                sort=filters.sort
-            )
+            key = make_cache_key(filters)
+            # Crossref cursor of a fetch this call ran itself; results
+            # from the cache or another caller's fetch share a cursor that
+            # only one continuation may use
+            fetched: Dict[str, Any] = {}
             
-            # Normalize items
-            normalized_items = []
-            for raw_item in raw_items:
-                try:
-                    normalized = DataNormalizer.normalize_item(raw_item)
-                    normalized_items.append(normalized)
-                except Exception as e:
-                    # Log normalization error but continue
-                    self.logger.warning(
-                        "Failed to normalize item",
-                        error=str(e),
-                        doi=raw_item.get('DOI', 'unknown')
-                    )
-            
-            # Create result
-            result = SearchResult(
-                count=len(normalized_items),
-                items=normalized_items
-            )
+            # Identical concurrent searches share one upstream fetch
+            async def fetch() -> dict:
+                return await self._fetch_shared(key, filters, deadline, fetched)
             
-            # Log success
-            self.logger.info(
-                "Search completed",
-                query=filters.query,
-                results_count=result.count,
-                pages_fetched=(len(raw_items) + filters.rows - 1) // filters.rows
+            # Background refreshes have no caller waiting, hence no deadline
+            async def refresh() -> dict:
+                return await self._fetch_shared(key, filters)
+            
+            try:
+                if self.result_cache is None:
+                    cached = await fetch()
+                else:
+                    cached = await self.result_cache.get_or_fetch(key, fetch, refresh)
+            except _PartialResult as e:
+                cached = e.value
+            except CircuitOpenError:
+                stale = await self.stale_result(filters)
+                if stale is None:
+                    raise
+                return stale
+            
+            result = SearchResult.from_dict(cached)
+            consumed = result.count if result.upstream_count is None else result.upstream_count
+            result.next_token = await self.issue_token(
+                filters, 0, consumed, fetched.get('cursor'), fetched.get('cursor_at'),
+                partial=result.partial, sharded=result.sharded
             )
             
             return result
@@ -147,3 +177,353 @@ class SearchService:
                 error_type=type(e).__name__
             )
             raise
+    
+    async def stale_result(self, filters: SearchFilters) -> Optional[SearchResult]:
+        """
+        Get a cached result of any age, flagged as stale.
+        
+        Args:
+            filters: Search filters
+            
+        Returns:
+            Stale SearchResult, or None if nothing is cached
+        """
+        if self.result_cache is None:
+            return None
+        
+        cached = await self.result_cache.get_stale(make_cache_key(filters))
+        if cached is None:
+            return None
+        
+        value, age = cached
+        self.logger.warning(
+            "Serving stale search results",
+            query=filters.query,
+            age_seconds=round(age)
+        )
+        result = SearchResult.from_dict(value)
+        result.stale = True
+        return result
+    
+    async def continue_search(
+        self,
+        token: str,
+        max_results: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> SearchResult:
+        """
+        Fetch the results following a previous search.
+        
+        Args:
+            token: Continuation token from a previous result
+            max_results: Size of the next slice (defaults to the original
+                search's max_results)
+            deadline: Request deadline (see search)
+            
+        Returns:
+            SearchResult with the next slice and its own next_token
+            
+        Raises:
+            ValidationError: If the token is invalid or expired
+            DeadlineExceeded: If the deadline passes before any result arrives
+        """
+        filters, continuation = await self.open_continuation(token, max_results)
+        
+        position: Dict[str, Any] = {}
+        items: List[NormalizedItem] = []
+        partial = False
+        try:
+            async for page in self.iter_pages(filters, continuation, position, deadline):
+                items.extend(page)
+        except DeadlineExceeded:
+            if not items:
+                raise
+            partial = True
+        
+        result = SearchResult(count=len(items), items=items, partial=partial)
+        result.next_token = await self.issue_token(
+            filters, continuation.offset, position['consumed'], position.get('cursor'),
+            partial=partial, sharded=position.get('sharded', False)
+        )
+        return result
+    
+    async def open_continuation(
+        self,
+        token: str,
+        max_results: Optional[int] = None,
+    ) -> Tuple[SearchFilters, Continuation]:
+        """
+        Resolve a continuation token to validated filters.
+        
+        Args:
+            token: Continuation token
+            max_results: Size of the next slice (optional)
+            
+        Returns:
+            Filters for the next slice and the stored continuation
+            
+        Raises:
+            ValidationError: If continuations are disabled, the token is
+                invalid or the filters are
+        """
+        if self.continuations is None:
+            raise ValidationError("continuation tokens are disabled")
+        
+        continuation = await self.continuations.resolve(token)
+        filters = continuation.filters
+        if max_results is not None:
+            filters = replace(filters, max_results=max_results)
+        self.validate_filters(filters)
+        return filters, continuation
+    
+    async def issue_token(
+        self,
+        filters: SearchFilters,
+        offset: int,
+        count: int,
+        cursor: Optional[str],
+        cursor_at: Optional[float] = None,
+        partial: bool = False,
+        sharded: bool = False,
+    ) -> Optional[str]:
+        """
+        Issue a token continuing after a slice of results.
+        
+        Offsets count raw Crossref results, including any that failed
+        normalization, so a resume that skips ``offset`` results lines
+        up with the cursor chain. A slice merged from date shards does
+        not follow that chain, so it gets no token.
+        
+        Args:
+            filters: Filters of the slice
+            offset: Crossref results consumed before the slice
+            count: Crossref results consumed by the slice
+            cursor: Crossref cursor after the slice, if known
+            cursor_at: When the cursor was obtained (defaults to now)
+            partial: Whether the slice was cut short by a deadline
+            sharded: Whether the slice was merged from date shards
+            
+        Returns:
+            Token, or None when the results are exhausted, were sharded or
+            tokens are disabled
+        """
+        # A short slice means Crossref had nothing more, unless time ran out
+        if self.continuations is None or sharded or (count < filters.max_results and not partial):
+            return None
+        return await self.continuations.issue(filters, offset + count, cursor, cursor_at)
+    
+    async def _fetch_shared(
+        self,
+        key: str,
+        filters: SearchFilters,
+        deadline: Optional[Deadline] = None,
+        fetched: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        """
+        Fetch results, sharing the work with identical concurrent searches.
+        
+        The shared fetch runs on its first caller's deadline. A result it
+        truncated is only taken by callers whose own deadline has passed
+        too; the others fetch again within their own budget. Only the
+        caller whose fetch ran receives its Crossref cursor in ``fetched``.
+        
+        Raises:
+            _PartialResult: Carrying the result when the caller's deadline
+                cut it short
+        """
+        try:
+            return await self._in_flight.do(
+                key,
+                lambda: self._execute_as_dict(filters, deadline, fetched)
+            )
+        except _PartialResult:
+            if deadline is not None and deadline.expired:
+                raise
+            return await self._execute_as_dict(filters, deadline, fetched)
+    
+    async def _execute_as_dict(
+        self,
+        filters: SearchFilters,
+        deadline: Optional[Deadline] = None,
+        fetched: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        """
+        Fetch and normalize results in their shareable dictionary form.
+        
+        Raises:
+            _PartialResult: Carrying the result when the deadline cut it short
+        """
+        result = await self._execute(filters, deadline)
+        if fetched is not None:
+            fetched['cursor'] = result.cursor
+            fetched['cursor_at'] = result.cursor_at
+        if result.partial:
+            raise _PartialResult(result.to_dict(internal=True))
+        return result.to_dict(internal=True)
+    
+    async def _execute(
+        self,
+        filters: SearchFilters,
+        deadline: Optional[Deadline] = None,
+    ) -> SearchResult:
+        """
+        Fetch and normalize results from Crossref.
+        
+        Args:
+            filters: Validated search filters
+            deadline: Request deadline (optional)
+            
+        Returns:
+            SearchResult with normalized items, ``partial`` if the
+            deadline passed before all pages arrived
+            
+        Raises:
+            DeadlineExceeded: If the deadline passes before any result arrives
+        """
+        # Execute search via Crossref client
+        position: Dict[str, Any] = {}
+        raw_items: List[Dict[str, Any]] = []
+        partial = False
+        try:
+            async for page in self.crossref_client.iter_pages(
+                query=filters.query,
+                from_date=filters.from_date,
+                until_date=filters.until_date,
+                content_type=filters.content_type,
+                has_abstract=filters.has_abstract,
+                rows=filters.rows,
+                max_results=filters.max_results,
+                sort=filters.sort,
+                position=position,
+                deadline=deadline
+            ):
+                raw_items.extend(page)
+        except DeadlineExceeded:
+            if not raw_items:
+                raise
+            partial = True
+        
+        # Normalize items
+        normalized_items = await self._normalize_items(raw_items)
+        
+        # Create result
+        result = SearchResult(
+            count=len(normalized_items),
+            items=normalized_items,
+            partial=partial,
+            cursor=position['cursor'],
+            cursor_at=time.time(),
+            upstream_count=len(raw_items),
+            sharded=position['sharded']
+        )
+        
+        # Log success
+        self.logger.info(
+            "Search completed",
+            query=filters.query,
+            results_count=result.count,
+            partial=partial
+        )
+        
+        return result
+    
+    async def iter_pages(
+        self,
+        filters: SearchFilters,
+        continuation: Optional[Continuation] = None,
+        position: Optional[Dict[str, Any]] = None,
+        deadline: Optional[Deadline] = None,
+        shard: bool = True,
+    ) -> AsyncIterator[List[NormalizedItem]]:
+        """
+        Stream normalized results page by page, bypassing the result cache.
+        
+        Filters are expected to be validated by the caller before the
+        iteration starts, so errors can still be reported with a status code.
+        
+        A continuation resumes from its Crossref cursor while Crossref still
+        honors it, and otherwise re-walks the results up to its offset.
+        
+        Args:
+            filters: Validated search filters
+            continuation: Continuation to resume (optional)
+            position: Updated with the Crossref cursor after the last page,
+                ``sharded`` (see CrossrefClient.iter_pages) and ``consumed``,
+                the raw Crossref results yielded so far (normalization
+                failures included)
+            deadline: Request deadline; when it passes, DeadlineExceeded is
+                raised after the pages fetched so far
+            shard: Allow date sharding; disable to always follow a single
+                cursor chain, so ``position`` receives a resumable cursor
+            
+        Yields:
+            Lists of normalized items, one per upstream page
+        """
+        resume: Dict[str, Any] = {}
+        if continuation is not None:
+            cursor = continuation.live_cursor
+            resume = {'cursor': cursor} if cursor else {'skip': continuation.offset}
+
+        self.logger.info(
+            "Streaming search started",
+            query=filters.query,
+            max_results=filters.max_results
+        )
+        
+        if position is None:
+            position = {}
+        position['consumed'] = 0
+        
+        count = 0
+        async for raw_items in self.crossref_client.iter_pages(
+            query=filters.query,
+            from_date=filters.from_date,
+            until_date=filters.until_date,
+            content_type=filters.content_type,
+            has_abstract=filters.has_abstract,
+            rows=filters.rows,
+            max_results=filters.max_results,
+            sort=filters.sort,
+            position=position,
+            deadline=deadline,
+            shard=shard,
+            **resume
+        ):
+            position['consumed'] += len(raw_items)
+            items = await self._normalize_items(raw_items)
+            count += len(items)
+            yield items
+        
+        self.logger.info(
+            "Streaming search completed",
+            query=filters.query,
+            results_count=count
+        )
+    
+    async def _normalize_items(self, raw_items: List[Dict[str, Any]]) -> List[NormalizedItem]:
+        """
+        Normalize raw Crossref items, skipping items that fail.
+        
+        Large batches are offloaded to the normalization pool when one
+        is configured, keeping the event loop responsive.
+        
+        Args:
+            raw_items: Raw items from Crossref
+            
+        Returns:
+            Normalized items
+        """
+        if self.normalization_pool is not None:
+            normalized_items, failures = await self.normalization_pool.normalize(raw_items)
+        else:
+            _, _, normalized_items, failures, _ = normalize_batch(raw_items)
+        
+        for doi, error in failures:
+            # Log normalization error but continue
+            self.logger.warning(
+                "Failed to normalize item",
+                error=error,
+                doi=doi
+            )
+        
+        return normalized_items
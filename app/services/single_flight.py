@@ -0,0 +1,90 @@
+"""In-flight request deduplication (single-flight)."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+from prometheus_client import Counter, Gauge
+
+
+single_flight_coalesced_total = Counter(
+    'single_flight_coalesced_total',
+    'Calls that joined an identical in-flight call instead of starting their own',
+    ['name']
+)
+single_flight_in_flight = Gauge(
+    'single_flight_in_flight',
+    'Distinct calls currently in flight',
+    ['name']
+)
+
+
+class _Call:
+    """A shared in-flight call and the number of callers waiting on it."""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the work in its own task; callers
+    arriving while it runs await the same result. A waiter that is
+    cancelled only detaches itself: the shared task keeps running for the
+    others and is cancelled only when its last waiter goes away.
+    """
+
+    def __init__(self, name: str = "default"):
+        """
+        Initialize single-flight group.
+
+        Args:
+            name: Label used for metrics
+        """
+        self.name = name
+        self._calls: Dict[str, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key among concurrent callers.
+
+        Args:
+            key: Deduplication key
+            fn: Coroutine factory to execute
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.create_task(fn()))
+            self._calls[key] = call
+            single_flight_in_flight.labels(name=self.name).inc()
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+        else:
+            single_flight_coalesced_total.labels(name=self.name).inc()
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: str, call: _Call) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+            single_flight_in_flight.labels(name=self.name).dec()
+        # Retrieve the exception so an unobserved failure is not logged
+        if not call.task.cancelled():
+            call.task.exception()
@@ -12,6 +12,12 @@ function isLoggedIn() {
     return !!getToken();
 }
 
+// Bearer header for logged-in users, so requests are scheduled under their plan
+function authHeaders() {
+    const token = getToken();
+    return token ? { 'Authorization': `Bearer ${token}` } : {};
+}
+
 function logout() {
     localStorage.removeItem('auth_token');
     updateAuthUI();
@@ -169,17 +175,10 @@ function hideStatus() {
 }
 
 /**
- * Display search results as cards
+ * Build the HTML card for a single result
  */
-function displayResults(items) {
-    const container = document.getElementById('results');
-    
-    if (!items || items.length === 0) {
-        container.innerHTML = '<p class="no-results">No se encontraron resultados</p>';
-        return;
-    }
-    
-    const cardsHtml = items.map(item => `
+function renderResultCard(item) {
+    return `
         <article class="result-card">
             <h2 class="result-title">${escapeHtml(item.title)}</h2>
             
@@ -201,9 +200,57 @@ function displayResults(items) {
                 <p>${escapeHtml(item.abstract)}</p>
             </details>
         </article>
-    `).join('');
+    `;
+}
+
+/**
+ * Display search results as cards
+ */
+function displayResults(items) {
+    const container = document.getElementById('results');
+    
+    if (!items || items.length === 0) {
+        container.innerHTML = '<p class="no-results">No se encontraron resultados</p>';
+        return;
+    }
+    
+    container.innerHTML = items.map(renderResultCard).join('');
+}
+
+/**
+ * Append a page of streamed results to the list
+ */
+function appendResults(items) {
+    const container = document.getElementById('results');
+    container.insertAdjacentHTML('beforeend', items.map(renderResultCard).join(''));
+}
+
+/**
+ * Read an NDJSON response, calling onFrame for every parsed line
+ */
+async function readNdjson(response, onFrame) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
     
-    container.innerHTML = cardsHtml;
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        
+        for (const line of lines) {
+            if (line.trim()) {
+                onFrame(JSON.parse(line));
+            }
+        }
+    }
+    
+    if (buffer.trim()) {
+        onFrame(JSON.parse(buffer));
+    }
 }
 
 /**
@@ -220,8 +267,9 @@ document.getElementById('searchForm').addEventListener('submit', async (e) => {
         formData.set('has_abstract', 'false');
     }
     
-    // Build query params
+    // Build query params (stream results as pages arrive)
     const params = new URLSearchParams(formData);
+    params.set('stream', 'true');
     
     // Show loading status
     showStatus('Buscando...', 'loading');
@@ -231,27 +279,46 @@ document.getElementById('searchForm').addEventListener('submit', async (e) => {
     
     // Clear previous results
     document.getElementById('results').innerHTML = '';
+    currentResults = [];
     
     try {
         // Make API request
-        const response = await fetch(`/search?${params}`);
-        const data = await response.json();
+        const response = await fetch(`/search?${params}`, { headers: authHeaders() });
         
-        if (response.ok) {
-            // Success
-            currentResults = data.items;
-            displayResults(data.items);
-            showStatus(`${data.count} resultado${data.count !== 1 ? 's' : ''} encontrado${data.count !== 1 ? 's' : ''}`, 'success');
-            
-            // Show export button if there are results
-            if (data.count > 0) {
-                document.getElementById('exportCsv').style.display = 'block';
-            }
-        } else {
+        if (!response.ok) {
             // Error response from API
+            const data = await response.json();
             const errorMessage = data.error?.message || 'Error desconocido';
             showStatus(`Error: ${errorMessage}`, 'error');
+            return;
         }
+        
+        await readNdjson(response, (frame) => {
+            if (frame.type === 'items') {
+                currentResults.push(...frame.items);
+                appendResults(frame.items);
+                showStatus(`Buscando... ${currentResults.length} resultados`, 'loading');
+            } else if (frame.type === 'summary') {
+                if (frame.count === 0) {
+                    displayResults([]);
+                }
+                const found = `${frame.count} resultado${frame.count !== 1 ? 's' : ''} encontrado${frame.count !== 1 ? 's' : ''}`;
+                if (frame.stale) {
+                    // Crossref unavailable: results come from cache
+                    showStatus(`${found} (resultados en caché, Crossref no disponible)`, 'info');
+                } else {
+                    showStatus(found, 'success');
+                }
+                
+                // Show export button if there are results
+                if (frame.count > 0) {
+                    document.getElementById('exportCsv').style.display = 'block';
+                }
+            } else if (frame.type === 'error') {
+                const errorMessage = frame.error?.message || 'Error desconocido';
+                showStatus(`Error: ${errorMessage}`, 'error');
+            }
+        });
     } catch (error) {
         // Network or other error
         console.error('Search error:', error);
@@ -279,13 +346,27 @@ document.getElementById('exportCsv').addEventListener('click', async () => {
     showStatus('Generando CSV...', 'loading');
     
     try {
+        // Fetched rather than navigated to, so the bearer header is sent
+        const response = await fetch(`/export/csv?${params}`, { headers: authHeaders() });
+        
+        if (!response.ok) {
+            const data = await response.json();
+            const errorMessage = data.error?.message || 'Error desconocido';
+            showStatus(`Error: ${errorMessage}`, 'error');
+            return;
+        }
+        
         // Trigger download
-        window.location.href = `/export/csv?${params}`;
+        const url = URL.createObjectURL(await response.blob());
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = 'crossref_results.csv';
+        document.body.appendChild(link);
+        link.click();
+        link.remove();
+        URL.revokeObjectURL(url);
         
-        // Show success message after a short delay
-        setTimeout(() => {
-            showStatus('CSV descargado exitosamente', 'success');
-        }, 1000);
+        showStatus('CSV descargado exitosamente', 'success');
     } catch (error) {
         console.error('Export error:', error);
         showStatus('Error al exportar CSV', 'error');
@@ -0,0 +1,58 @@
+"""Async iteration helpers."""
+import asyncio
+from typing import AsyncIterator, TypeVar
+
+
+T = TypeVar("T")
+
+# Marks the end of the producer's iteration
+_DONE = object()
+
+
+async def prefetch(source: AsyncIterator[T], depth: int = 1) -> AsyncIterator[T]:
+    """
+    Consume an async iterator in a background task, staying ahead of the caller.
+    
+    At most ``depth`` values are buffered; once the buffer is full the
+    producer waits, which gives natural backpressure. Exceptions raised by
+    the source are re-raised to the caller in order. Closing the returned
+    iterator cancels the producer.
+    
+    Args:
+        source: Async iterator to read ahead
+        depth: Maximum number of buffered values
+        
+    Yields:
+        Values from source in order
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=depth)
+    
+    async def produce() -> None:
+        try:
+            async for value in source:
+                await queue.put((value, None))
+            await queue.put((_DONE, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put((_DONE, e))
+    
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            value, error = await queue.get()
+            if error is not None:
+                raise error
+            if value is _DONE:
+                break
+            yield value
+    finally:
+        if not producer.done():
+            producer.cancel()
+            try:
+                await producer
+            except asyncio.CancelledError:
+                pass
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
@@ -0,0 +1,279 @@
+"""Local BibTeX rendering from Crossref work metadata."""
+import html
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional, Set
+
+from app.utils.normalizer import DataNormalizer
+
+
+class BibtexRenderError(ValueError):
+    """Raised when a record lacks the fields its entry type requires."""
+
+
+# Crossref work type -> BibTeX entry type
+ENTRY_TYPES = {
+    'journal-article': 'article',
+    'proceedings-article': 'inproceedings',
+    'book-chapter': 'incollection',
+    'book-section': 'incollection',
+    'book-part': 'incollection',
+    'reference-entry': 'incollection',
+    'book': 'book',
+    'monograph': 'book',
+    'edited-book': 'book',
+    'reference-book': 'book',
+    'book-set': 'book',
+    'report': 'techreport',
+    'dissertation': 'phdthesis',
+}
+
+# Field holding the container title, for entry types that need one
+CONTAINER_FIELDS = {
+    'article': 'journal',
+    'inproceedings': 'booktitle',
+    'incollection': 'booktitle',
+}
+
+_LATEX_SPECIALS = {
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+}
+_LATEX_SPECIALS_RE = re.compile('[' + re.escape(''.join(_LATEX_SPECIALS)) + ']')
+
+# Inline markup in Crossref titles (HTML or JATS) kept as LaTeX commands
+_MARKUP_COMMANDS = {
+    'i': r'\textit{',
+    'em': r'\textit{',
+    'italic': r'\textit{',
+    'b': r'\textbf{',
+    'strong': r'\textbf{',
+    'bold': r'\textbf{',
+    'sub': r'\textsubscript{',
+    'sup': r'\textsuperscript{',
+    'sc': r'\textsc{',
+    'scp': r'\textsc{',
+}
+_TAG_SPLIT_RE = re.compile(r'(<[^<>]+>)')
+_TAG_NAME_RE = re.compile(r'<\s*(/)?\s*(?:[\w.-]+:)?([\w.-]+)')
+
+_KEY_STOPWORDS = frozenset(['a', 'an', 'the', 'on', 'of', 'in', 'for', 'and', 'to', 'with', 'from', 'at', 'by'])
+
+
+def escape_latex(text: str) -> str:
+    """
+    Escape characters with special meaning in LaTeX.
+
+    Args:
+        text: Plain text
+
+    Returns:
+        Text safe to place inside a BibTeX field
+    """
+    return _LATEX_SPECIALS_RE.sub(lambda match: _LATEX_SPECIALS[match.group(0)], text)
+
+
+def markup_to_latex(text: str) -> str:
+    """
+    Convert a Crossref title with HTML/JATS markup to LaTeX.
+
+    Italic, bold, sub/superscript and small caps become LaTeX commands;
+    other tags are dropped. Braces always come out balanced.
+
+    Args:
+        text: Title as provided by Crossref
+
+    Returns:
+        Escaped LaTeX text
+    """
+    out: List[str] = []
+    open_tags: List[str] = []
+
+    for token in _TAG_SPLIT_RE.split(text):
+        if not token:
+            continue
+        match = _TAG_NAME_RE.match(token) if token.startswith('<') else None
+        if match is None:
+            out.append(escape_latex(html.unescape(token)))
+            continue
+
+        is_end, name = match.group(1), match.group(2).lower()
+        if name not in _MARKUP_COMMANDS or token.endswith('/>'):
+            continue
+        if not is_end:
+            open_tags.append(name)
+            out.append(_MARKUP_COMMANDS[name])
+        elif open_tags and open_tags[-1] == name:
+            open_tags.pop()
+            out.append('}')
+
+    out.append('}' * len(open_tags))
+    return ' '.join(''.join(out).split())
+
+
+def _ascii_word(text: str) -> str:
+    folded = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]', '', folded.lower())
+
+
+def _format_person(person: Dict[str, Any]) -> Optional[str]:
+    family = person.get('family', '').strip()
+    given = person.get('given', '').strip()
+    if family and given:
+        return f"{escape_latex(family)}, {escape_latex(given)}"
+    if family or given:
+        return escape_latex(family or given)
+    name = person.get('name', '').strip()
+    # Organizations are braced so BibTeX does not split them into names
+    return f"{{{escape_latex(name)}}}" if name else None
+
+
+def _format_people(people: List[Dict[str, Any]]) -> str:
+    names = [name for name in (_format_person(person) for person in people) if name]
+    return ' and '.join(names)
+
+
+def _first(record: Dict[str, Any], field: str) -> str:
+    value = record.get(field) or ''
+    if isinstance(value, list):
+        value = value[0] if value else ''
+    return str(value).strip()
+
+
+def extract_year(record: Dict[str, Any]) -> Optional[int]:
+    """
+    Publication year, falling back to the ``issued`` date.
+
+    Args:
+        record: Crossref work record
+
+    Returns:
+        Year or None
+    """
+    year = DataNormalizer.extract_year(record)
+    if year is None:
+        date_parts = record.get('issued', {}).get('date-parts', [])
+        if date_parts and date_parts[0] and date_parts[0][0]:
+            year = date_parts[0][0]
+    return year
+
+
+class BibtexRenderer:
+    """
+    Renders BibTeX entries from Crossref work records.
+
+    One renderer should be used per export: it remembers the citation
+    keys it handed out and disambiguates collisions with letter
+    suffixes (``smith2024deep``, ``smith2024deepb``, ...).
+    """
+
+    def __init__(self):
+        self._keys: Set[str] = set()
+
+    def render(self, record: Dict[str, Any]) -> str:
+        """
+        Render one BibTeX entry.
+
+        Args:
+            record: Crossref work record
+
+        Returns:
+            BibTeX entry
+
+        Raises:
+            BibtexRenderError: If the title, year or required container
+                title is missing
+        """
+        entry_type = ENTRY_TYPES.get(record.get('type', ''), 'misc')
+        title = _first(record, 'title')
+        year = extract_year(record)
+        container = _first(record, 'container-title')
+        container_field = CONTAINER_FIELDS.get(entry_type)
+
+        if not title or year is None:
+            raise BibtexRenderError("title and year are required")
+        if container_field and not container:
+            raise BibtexRenderError(f"{container_field} is required for @{entry_type}")
+
+        fields: List[tuple] = [('title', markup_to_latex(title))]
+
+        authors = _format_people(record.get('author', []))
+        editors = _format_people(record.get('editor', []))
+        if authors:
+            fields.append(('author', authors))
+        if editors and (not authors or entry_type in ('incollection', 'inproceedings')):
+            fields.append(('editor', editors))
+
+        if container_field:
+            fields.append((container_field, markup_to_latex(container)))
+
+        fields.append(('year', str(year)))
+
+        for field, source in (('volume', 'volume'), ('number', 'issue')):
+            value = _first(record, source)
+            if value:
+                fields.append((field, escape_latex(value)))
+
+        pages = _first(record, 'page')
+        if pages:
+            fields.append(('pages', escape_latex(re.sub(r'\s*[-–]+\s*', '--', pages))))
+
+        publisher = _first(record, 'publisher')
+        if publisher:
+            field = 'school' if entry_type == 'phdthesis' else (
+                'institution' if entry_type == 'techreport' else 'publisher'
+            )
+            fields.append((field, escape_latex(publisher)))
+        address = _first(record, 'publisher-location')
+        if address and entry_type in ('book', 'incollection'):
+            fields.append(('address', escape_latex(address)))
+
+        if entry_type == 'article':
+            issn = _first(record, 'ISSN')
+            if issn:
+                fields.append(('issn', issn))
+        elif entry_type in ('book', 'incollection'):
+            isbn = _first(record, 'ISBN')
+            if isbn:
+                fields.append(('isbn', isbn))
+
+        doi = record.get('DOI', '').strip()
+        if doi:
+            fields.append(('doi', doi))
+            fields.append(('url', f"https://doi.org/{doi}"))
+
+        key = self._unique_key(self._base_key(record, title, year))
+        body = ',\n'.join(f"  {name} = {{{value}}}" for name, value in fields)
+        return f"@{entry_type}{{{key},\n{body}\n}}"
+
+    @staticmethod
+    def _base_key(record: Dict[str, Any], title: str, year: int) -> str:
+        people = record.get('author') or record.get('editor') or []
+        name = ''
+        if people:
+            first = people[0]
+            name = first.get('family') or first.get('name') or first.get('given') or ''
+            name = _ascii_word(name.split()[0]) if name.split() else ''
+
+        plain_title = html.unescape(_TAG_SPLIT_RE.sub('', title))
+        words = [_ascii_word(word) for word in plain_title.split()]
+        word = next((w for w in words if w and w not in _KEY_STOPWORDS), '')
+
+        return f"{name or 'anon'}{year}{word}"
+
+    def _unique_key(self, base: str) -> str:
+        key = base
+        suffix = 1
+        while key in self._keys:
+            suffix += 1
+            key = base + (chr(ord('a') + suffix - 1) if suffix <= 26 else str(suffix))
+        self._keys.add(key)
+        return key
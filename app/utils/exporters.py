@@ -0,0 +1,357 @@
+"""Streaming encoders for exporting normalized items."""
+import csv
+import io
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Type
+
+from app.models import NormalizedItem
+from app.utils import fast_json
+from app.utils.normalizer import DataNormalizer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+
+class ExporterUnavailableError(RuntimeError):
+    """Raised when a format needs an optional package that is not installed."""
+
+
+# CSV columns, in NormalizedItem.to_row() order
+CSV_FIELDNAMES = ['doi', 'title', 'authors', 'year', 'journal', 'abstract', 'url']
+
+# Position of the abstract in NormalizedItem.to_row()
+ABSTRACT_COLUMN = 5
+
+# Separator NormalizedItem.authors is joined with
+AUTHOR_SEPARATOR = '; '
+
+# Crossref content type -> RIS reference type
+RIS_TYPES = {
+    'journal-article': 'JOUR',
+    'proceedings-article': 'CPAPER',
+    'book-chapter': 'CHAP',
+    'book': 'BOOK',
+    'monograph': 'BOOK',
+    'edited-book': 'EDBOOK',
+    'report': 'RPRT',
+    'dissertation': 'THES',
+    'dataset': 'DATA',
+    'posted-content': 'UNPB',
+}
+
+
+def encode_csv(items: List[NormalizedItem], header: bool = False) -> str:
+    """
+    Encode items as CSV rows.
+
+    Args:
+        items: Items to encode
+        header: Whether to start with the header row
+
+    Returns:
+        CSV text
+    """
+    output = io.StringIO()
+    writer = csv.writer(
+        output,
+        quoting=csv.QUOTE_MINIMAL,
+        lineterminator='\n'
+    )
+
+    if header:
+        writer.writerow(CSV_FIELDNAMES)
+
+    for item in items:
+        row = list(item.to_row())
+
+        # Replace newlines in abstract with space
+        if row[ABSTRACT_COLUMN]:
+            row[ABSTRACT_COLUMN] = row[ABSTRACT_COLUMN].replace('\n', ' ').replace('\r', ' ')
+
+        # Handle None values
+        writer.writerow(['' if v is None else v for v in row])
+
+    return output.getvalue()
+
+
+class StreamingExporter(ABC):
+    """
+    Incrementally encodes pages of normalized items.
+
+    ``write()`` is called once per page and ``close()`` once at the end;
+    each returns the bytes to append to the output, possibly none while
+    the encoder buffers.
+    """
+
+    extension = 'bin'
+    media_type = 'application/octet-stream'
+    # Whether output truncated at a checkpoint can be continued by a new
+    # exporter (constructed with resume=True)
+    resumable = True
+    # Whether the optional packages the format needs are installed
+    available = True
+
+    def __init__(self, resume: bool = False, content_type: str = "journal-article"):
+        """
+        Initialize exporter.
+
+        Args:
+            resume: Continue existing output instead of starting a file
+            content_type: Crossref content type of the exported items
+        """
+        self.resume = resume
+        self.content_type = content_type
+        self.items_count = 0
+
+    def write(self, items: List[NormalizedItem]) -> bytes:
+        """
+        Encode a page of items.
+
+        Args:
+            items: Items to encode
+
+        Returns:
+            Bytes to append to the output
+        """
+        self.items_count += len(items)
+        return self._encode(items)
+
+    def close(self) -> bytes:
+        """
+        Finish the output.
+
+        Returns:
+            Trailing bytes to append to the output
+        """
+        return b''
+
+    @abstractmethod
+    def _encode(self, items: List[NormalizedItem]) -> bytes:
+        """Encode a page of items into the bytes to append."""
+
+
+class CsvExporter(StreamingExporter):
+    """CSV with a UTF-8 BOM for Excel, same columns as /export/csv."""
+
+    extension = 'csv'
+    media_type = 'text/csv'
+
+    def __init__(self, resume: bool = False, content_type: str = "journal-article"):
+        super().__init__(resume, content_type)
+        self._header = not resume
+
+    def _encode(self, items: List[NormalizedItem]) -> bytes:
+        if not self._header:
+            return encode_csv(items).encode('utf-8')
+        self._header = False
+        return ('\ufeff' + encode_csv(items, header=True)).encode('utf-8')
+
+    def close(self) -> bytes:
+        # No results: still produce a valid file
+        return self._encode([]) if self._header else b''
+
+
+class JsonlExporter(StreamingExporter):
+    """One JSON object per line, with the same fields as /search items."""
+
+    extension = 'jsonl'
+    media_type = 'application/x-ndjson'
+
+    def _encode(self, items: List[NormalizedItem]) -> bytes:
+        return b''.join(fast_json.dumps(item.to_dict()) + b'\n' for item in items)
+
+
+def _known(value: str, placeholder: str) -> Optional[str]:
+    """The value, or None for empty values and normalizer placeholders."""
+    return value if value and value != placeholder else None
+
+
+def _author_names(item: NormalizedItem) -> List[str]:
+    authors = _known(item.authors, DataNormalizer.UNKNOWN_AUTHORS)
+    return authors.split(AUTHOR_SEPARATOR) if authors else []
+
+
+class RisExporter(StreamingExporter):
+    """RIS records for reference managers."""
+
+    extension = 'ris'
+    media_type = 'application/x-research-info-systems'
+
+    def _encode(self, items: List[NormalizedItem]) -> bytes:
+        ris_type = RIS_TYPES.get(self.content_type, 'GEN')
+        lines: List[str] = []
+        for item in items:
+            title = _known(item.title, DataNormalizer.NO_TITLE)
+            journal = _known(item.journal, DataNormalizer.UNKNOWN_JOURNAL)
+            abstract = _known(item.abstract, DataNormalizer.NO_ABSTRACT)
+
+            lines.append(f"TY  - {ris_type}")
+            if title:
+                lines.append(f"TI  - {_ris_value(title)}")
+            for author in _author_names(item):
+                lines.append(f"AU  - {_ris_value(author)}")
+            if item.year is not None:
+                lines.append(f"PY  - {item.year}")
+            if journal:
+                lines.append(f"T2  - {_ris_value(journal)}")
+            if abstract:
+                lines.append(f"AB  - {_ris_value(abstract)}")
+            if item.doi:
+                lines.append(f"DO  - {item.doi}")
+            if item.url:
+                lines.append(f"UR  - {item.url}")
+            lines.append("ER  - ")
+            lines.append("")
+        return ''.join(line + '\r\n' for line in lines).encode('utf-8')
+
+
+def _ris_value(value: str) -> str:
+    return ' '.join(value.split())
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file collecting what pyarrow writes until it is drained."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+# Typed columns for Arrow and Parquet; missing values are nulls
+ITEM_SCHEMA = pa.schema([
+    ('doi', pa.string()),
+    ('title', pa.string()),
+    ('authors', pa.list_(pa.string())),
+    ('year', pa.int32()),
+    ('journal', pa.string()),
+    ('abstract', pa.string()),
+    ('url', pa.string()),
+]) if pa is not None else None
+
+
+def _record_batch(items: List[NormalizedItem]) -> Any:
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([item.doi for item in items], pa.string()),
+            pa.array([_known(item.title, DataNormalizer.NO_TITLE) for item in items], pa.string()),
+            pa.array([_author_names(item) for item in items], pa.list_(pa.string())),
+            pa.array([item.year for item in items], pa.int32()),
+            pa.array([_known(item.journal, DataNormalizer.UNKNOWN_JOURNAL) for item in items], pa.string()),
+            pa.array([_known(item.abstract, DataNormalizer.NO_ABSTRACT) for item in items], pa.string()),
+            pa.array([item.url for item in items], pa.string()),
+        ],
+        schema=ITEM_SCHEMA
+    )
+
+
+class ArrowExporter(StreamingExporter):
+    """Arrow IPC stream with one record batch per page."""
+
+    extension = 'arrows'
+    media_type = 'application/vnd.apache.arrow.stream'
+    resumable = False
+    available = pa is not None
+
+    def __init__(self, resume: bool = False, content_type: str = "journal-article"):
+        if not self.available:
+            raise ExporterUnavailableError("Arrow export requires the pyarrow package")
+        super().__init__(resume, content_type)
+        self._sink = _ChunkSink()
+        self._writer = pa.ipc.new_stream(self._sink, ITEM_SCHEMA)
+
+    def _encode(self, items: List[NormalizedItem]) -> bytes:
+        if items:
+            self._writer.write_batch(_record_batch(items))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+class ParquetExporter(StreamingExporter):
+    """Parquet file written one row group at a time."""
+
+    extension = 'parquet'
+    media_type = 'application/vnd.apache.parquet'
+    resumable = False
+    available = pq is not None
+
+    # Rows buffered per row group; bounds memory while keeping groups
+    # large enough for efficient columnar reads
+    ROW_GROUP_ROWS = 10000
+
+    def __init__(self, resume: bool = False, content_type: str = "journal-article"):
+        if not self.available:
+            raise ExporterUnavailableError("Parquet export requires the pyarrow package")
+        super().__init__(resume, content_type)
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, ITEM_SCHEMA, compression='zstd')
+        self._buffered: List[NormalizedItem] = []
+
+    def _encode(self, items: List[NormalizedItem]) -> bytes:
+        self._buffered.extend(items)
+        if len(self._buffered) >= self.ROW_GROUP_ROWS:
+            self._flush()
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._flush()
+        self._writer.close()
+        return self._sink.drain()
+
+    def _flush(self) -> None:
+        if self._buffered:
+            self._writer.write_batch(_record_batch(self._buffered))
+            self._buffered = []
+
+
+EXPORTERS: Dict[str, Type[StreamingExporter]] = {
+    'csv': CsvExporter,
+    'jsonl': JsonlExporter,
+    'ris': RisExporter,
+    'arrow': ArrowExporter,
+    'parquet': ParquetExporter,
+}
+
+
+def create_exporter(format: str, **options: Any) -> StreamingExporter:
+    """
+    Create an exporter for a format.
+
+    Args:
+        format: One of EXPORTERS
+        **options: Exporter options (resume, content_type)
+
+    Returns:
+        New exporter
+
+    Raises:
+        ValueError: If the format is unknown
+        ExporterUnavailableError: If the format's optional package is missing
+    """
+    if format not in EXPORTERS:
+        raise ValueError(f"Unknown export format: {format}")
+    return EXPORTERS[format](**options)
@@ -0,0 +1,80 @@
+"""JSON encoding with an optional fast backend."""
+import json
+from typing import Any, Callable, Dict
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact UTF-8 JSON.
+    
+    Uses orjson when installed and the standard library otherwise.
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        Encoded JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: Any) -> Any:
+    """
+    Decode JSON from bytes or str.
+    
+    Args:
+        data: JSON document
+        
+    Returns:
+        Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _stdlib_loads(data: Any) -> Any:
+    return json.loads(data)
+
+
+# Decoders selectable by name; "auto" picks the fastest one installed
+DECODERS: Dict[str, Callable[[Any], Any]] = {'stdlib': _stdlib_loads}
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+
+def get_decoder(name: str = "auto") -> Callable[[Any], Any]:
+    """
+    Look up a JSON decoder by name.
+    
+    Args:
+        name: "auto", "orjson" or "stdlib"
+        
+    Returns:
+        Function decoding bytes or str
+        
+    Raises:
+        ValueError: If the decoder is unknown or not installed
+    """
+    if name == "auto":
+        return loads
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ValueError(f"JSON decoder not available: {name}") from None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with the fast encoder."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
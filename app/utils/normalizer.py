@@ -1,16 +1,40 @@
 """Data normalization utilities for Crossref API responses."""
 from typing import Dict, List, Optional, Any
-import bleach
 from app.models import NormalizedItem
+from app.utils.sanitizer import HTMLSanitizer
 
 
 class DataNormalizer:
     """Transforms Crossref API responses to consistent internal format."""
     
+    # Crossref work fields read by normalize_item; everything else can be
+    # left out of upstream responses
+    CROSSREF_FIELDS = (
+        'DOI',
+        'title',
+        'author',
+        'published-print',
+        'published-online',
+        'published',
+        'container-title',
+        'publisher',
+        'abstract',
+    )
+    
+    # Placeholders for missing fields; typed exports turn them back into nulls
+    NO_TITLE = 'No title'
+    UNKNOWN_AUTHORS = 'Unknown authors'
+    UNKNOWN_JOURNAL = 'Unknown'
+    NO_ABSTRACT = 'No abstract available'
+    
     # Allowed HTML tags for abstract sanitization
     ALLOWED_TAGS = ['p', 'br', 'i', 'b', 'em', 'strong']
     ALLOWED_ATTRIBUTES: Dict[str, List[str]] = {}
     
+    # Same output as bleach.clean with the allowlist above, without a full
+    # HTML parse for the common cases (plain text, JATS markup)
+    SANITIZER = HTMLSanitizer(ALLOWED_TAGS)
+    
     @staticmethod
     def normalize_item(raw_item: Dict[str, Any]) -> NormalizedItem:
         """
@@ -27,7 +51,7 @@ class DataNormalizer:
         
         # Extract title (first element of title array)
         title_list = raw_item.get('title', [])
-        title = title_list[0] if title_list else 'No title'
+        title = title_list[0] if title_list else DataNormalizer.NO_TITLE
         
         # Format authors
         authors_list = raw_item.get('author', [])
@@ -38,14 +62,14 @@ class DataNormalizer:
         
         # Extract journal (container-title or publisher as fallback)
         container_title = raw_item.get('container-title', [])
-        journal = container_title[0] if container_title else raw_item.get('publisher', 'Unknown')
+        journal = container_title[0] if container_title else raw_item.get('publisher', DataNormalizer.UNKNOWN_JOURNAL)
         
         # Clean abstract
         abstract = raw_item.get('abstract', '')
         if abstract:
             abstract = DataNormalizer.clean_abstract(abstract)
         else:
-            abstract = 'No abstract available'
+            abstract = DataNormalizer.NO_ABSTRACT
         
         # Construct URL
         url = f"https://doi.org/{doi}" if doi else ''
@@ -71,12 +95,7 @@ class DataNormalizer:
         Returns:
             Sanitized abstract with only safe tags
         """
-        cleaned = bleach.clean(
-            html_abstract,
-            tags=DataNormalizer.ALLOWED_TAGS,
-            attributes=DataNormalizer.ALLOWED_ATTRIBUTES,
-            strip=True
-        )
+        cleaned = DataNormalizer.SANITIZER.clean(html_abstract)
         return cleaned.strip()
     
     @staticmethod
@@ -91,7 +110,7 @@ class DataNormalizer:
             Formatted author string
         """
         if not authors_list:
-            return 'Unknown authors'
+            return DataNormalizer.UNKNOWN_AUTHORS
         
         formatted_authors = []
         for author in authors_list:
@@ -110,7 +129,7 @@ class DataNormalizer:
             
             formatted_authors.append(full_name)
         
-        return '; '.join(formatted_authors) if formatted_authors else 'Unknown authors'
+        return '; '.join(formatted_authors) if formatted_authors else DataNormalizer.UNKNOWN_AUTHORS
     
     @staticmethod
     def extract_year(raw_item: Dict[str, Any]) -> Optional[int]:
@@ -0,0 +1,222 @@
+"""Fast allowlist HTML sanitizer for Crossref abstracts."""
+import re
+import string
+from typing import Dict, Iterable, List
+
+import bleach
+from bleach.html5lib_shim import ENTITIES
+from prometheus_client import Counter
+
+
+sanitizer_calls_total = Counter(
+    'abstract_sanitizer_calls_total',
+    'Abstract sanitization calls by code path',
+    ['path']
+)
+
+# Code paths a clean() call can take
+PATHS = ('plain', 'fast', 'bleach')
+
+# HTML whitespace as seen by the html5lib tokenizer (CR is normalized away)
+_WS = ' \t\n\f'
+
+# A start or end tag whose attributes (if any) are well-formed
+_TAG_RE = re.compile(
+    r'<(/)?([A-Za-z][A-Za-z0-9:_.-]*)'
+    r'((?:[' + _WS + r']+[^' + _WS + r'/>"\'=<]+'
+    r'(?:[' + _WS + r']*=[' + _WS + r']*(?:"[^"]*"|\'[^\']*\'|[^' + _WS + r'"\'=<>`]+))?)*)'
+    r'[' + _WS + r']*(/)?>'
+)
+
+# Characters that make the html5lib tokenizer or bleach rewrite text
+_UNSAFE_CHARS_RE = re.compile('[\x00-\x08\x0b-\x1f\ud800-\udfff]')
+
+# Entity name candidates, following bleach.html5lib_shim.match_entity
+_ENTITY_RUN_RE = re.compile('[^<&=;' + re.escape(string.whitespace) + ']*')
+_NUMERIC_ENTITY_RE = re.compile(r'#(?:[0-9]+|[xX][0-9a-fA-F]+)')
+
+# bleach keeps a named entity when its name is a prefix of a known entity
+_ENTITY_PREFIXES = frozenset(
+    name[:i] for name in ENTITIES for i in range(1, len(name) + 1)
+)
+
+# Elements the fast path strips without changing tree construction:
+# html5lib treats them as ordinary elements. Namespaced names such as
+# JATS ``jats:p`` or ``jats:italic`` fall in this category too.
+_PLAIN_STRIPPED_TAGS = frozenset(['span', 'sub', 'sup'])
+
+_VOID_TAGS = frozenset(['br'])
+
+
+class _Fallback(Exception):
+    """Raised when the input needs the full html5lib-based sanitizer."""
+
+
+class HTMLSanitizer:
+    """
+    Allowlist sanitizer producing the same output as ``bleach.clean``.
+
+    Allowed tags are kept without attributes, other tags are stripped
+    and their text kept, and text is escaped the way bleach escapes it.
+    The single-pass tokenizer only handles input whose tree construction
+    is trivial: properly nested tags, no raw-text elements, comments or
+    implicitly closed paragraphs. Everything else is delegated to bleach,
+    so results are identical either way.
+
+    Calls are counted per code path in ``sanitizer_calls_total`` and in
+    ``path_counts``; the latter lets worker processes report their counts
+    back to the process that exports metrics.
+    """
+
+    def __init__(self, tags: Iterable[str]):
+        """
+        Initialize sanitizer.
+
+        Args:
+            tags: Allowed tag names (no attributes are allowed)
+        """
+        self.tags = frozenset(tag.lower() for tag in tags)
+        self._bleach_tags = sorted(self.tags)
+        self.path_counts: Dict[str, int] = dict.fromkeys(PATHS, 0)
+
+    def clean(self, text: str) -> str:
+        """
+        Sanitize HTML text.
+
+        Args:
+            text: HTML or plain text
+
+        Returns:
+            Sanitized text
+        """
+        # Fast path: nothing to parse or escape
+        if '<' not in text and '>' not in text and '&' not in text:
+            if not _UNSAFE_CHARS_RE.search(text):
+                self._record('plain')
+                return text
+
+        try:
+            cleaned = self._clean_fast(text)
+            self._record('fast')
+            return cleaned
+        except _Fallback:
+            self._record('bleach')
+            return bleach.clean(text, tags=self._bleach_tags, attributes={}, strip=True)
+
+    def _record(self, path: str) -> None:
+        self.path_counts[path] += 1
+        sanitizer_calls_total.labels(path=path).inc()
+
+    def _clean_fast(self, text: str) -> str:
+        if _UNSAFE_CHARS_RE.search(text):
+            raise _Fallback()
+
+        out: List[str] = []
+        # Text is escaped only at allowed tags: bleach merges the text
+        # around stripped tags before it looks for entities
+        pending: List[str] = []
+        stack: List[str] = []
+        # bleach's serializer re-checks entities after "=" until the next
+        # start tag once an end tag was written; leave that case to bleach
+        after_end_tag = False
+        pos = 0
+        length = len(text)
+
+        while True:
+            lt = text.find('<', pos)
+            if lt == -1:
+                pending.append(text[pos:])
+                break
+
+            pending.append(text[pos:lt])
+            nxt = text[lt + 1:lt + 2]
+
+            if not (nxt.isascii() and nxt.isalpha()) and nxt != '/':
+                if nxt in ('!', '?'):
+                    # Comments, doctypes and processing instructions
+                    raise _Fallback()
+                # A bare '<' is plain text
+                pending.append('<')
+                pos = lt + 1
+                continue
+
+            match = _TAG_RE.match(text, lt)
+            if match is None:
+                raise _Fallback()
+
+            is_end, name, _, self_closing = match.groups()
+            name = name.lower()
+            allowed = name in self.tags
+
+            if not allowed and ':' not in name and name not in _PLAIN_STRIPPED_TAGS:
+                raise _Fallback()
+
+            if is_end:
+                if self_closing or not stack or stack[-1] != name:
+                    raise _Fallback()
+                stack.pop()
+                tag = f'</{name}>'
+            elif name in _VOID_TAGS:
+                tag = f'<{name}>'
+            else:
+                if self_closing or (name == 'p' and 'p' in stack):
+                    raise _Fallback()
+                stack.append(name)
+                tag = f'<{name}>'
+
+            if allowed:
+                out.append(self._flush_text(pending, after_end_tag))
+                pending = []
+                out.append(tag)
+                after_end_tag = bool(is_end)
+
+            pos = match.end()
+            if pos >= length:
+                break
+
+        out.append(self._flush_text(pending, after_end_tag))
+
+        # Elements still open at the end are closed by the parser
+        for name in reversed(stack):
+            if name in self.tags:
+                out.append(f'</{name}>')
+
+        return ''.join(out)
+
+    def _flush_text(self, pending: List[str], after_end_tag: bool) -> str:
+        text = ''.join(pending)
+        if after_end_tag and '=' in text and '&' in text:
+            raise _Fallback()
+        return self._escape_text(text)
+
+    @staticmethod
+    def _escape_text(text: str) -> str:
+        if '&' not in text:
+            return text.replace('<', '&lt;').replace('>', '&gt;')
+
+        parts = text.split('&')
+        out = [parts[0].replace('<', '&lt;').replace('>', '&gt;')]
+
+        for part in parts[1:]:
+            name = _ENTITY_RUN_RE.match(part).group(0)
+            rest = part
+
+            if name and part[len(name):len(name) + 1] == ';':
+                if name[0] == '#':
+                    if not _NUMERIC_ENTITY_RE.fullmatch(name):
+                        raise _Fallback()
+                    out.append(f'&{name};')
+                    rest = part[len(name) + 1:]
+                elif name in _ENTITY_PREFIXES:
+                    out.append('&amp;' if name == 'amp' else f'&{name};')
+                    rest = part[len(name) + 1:]
+                else:
+                    out.append('&amp;')
+            else:
+                if name[:1] == '#' and not _NUMERIC_ENTITY_RE.fullmatch(name):
+                    raise _Fallback()
+                out.append('&amp;')
+
+            out.append(rest.replace('<', '&lt;').replace('>', '&gt;'))
+
+        return ''.join(out)
@@ -0,0 +1,123 @@
+"""
+Benchmark Crossref page payloads: bytes on the wire and decode time.
+
+Compares full work records decoded with the standard library against
+projected records (``select=``) decoded with the configured fast decoder.
+
+Usage:
+    python -m cli.bench_crossref_payload --query "machine learning" --pages 5
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from app.services.http_transport import ACCEPT_ENCODING
+from app.utils import fast_json
+from app.utils.normalizer import DataNormalizer
+
+
+BASE_URL = "https://api.crossref.org/works"
+
+
+def _time_decode(body: bytes, loads: Callable[[bytes], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        loads(body)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+async def _measure(
+    client: httpx.AsyncClient,
+    params: Dict[str, Any],
+    headers: Dict[str, str],
+    loads: Callable[[bytes], Any],
+    pages: int,
+    repeat: int,
+) -> List[Dict[str, float]]:
+    results = []
+    cursor = "*"
+    for _ in range(pages):
+        response = await client.get(BASE_URL, params={**params, 'cursor': cursor}, headers=headers)
+        response.raise_for_status()
+        body = response.content
+        results.append({
+            'wire_bytes': response.num_bytes_downloaded,
+            'body_bytes': len(body),
+            'decode_ms': _time_decode(body, loads, repeat) * 1000,
+        })
+        cursor = loads(body)['message'].get('next-cursor')
+        if not cursor:
+            break
+    return results
+
+
+def _summary(label: str, results: List[Dict[str, float]]) -> str:
+    wire = statistics.mean(r['wire_bytes'] for r in results)
+    body = statistics.mean(r['body_bytes'] for r in results)
+    decode = statistics.mean(r['decode_ms'] for r in results)
+    return f"{label:<10} {wire / 1024:>10.1f} {body / 1024:>10.1f} {decode:>10.2f}"
+
+
+async def run(
+    query: str,
+    rows: int,
+    pages: int,
+    repeat: int,
+    mailto: Optional[str],
+    decoder: str,
+) -> None:
+    """
+    Fetch the same pages in both modes and print per-page averages.
+
+    Args:
+        query: Search query
+        rows: Results per page
+        pages: Pages per mode
+        repeat: Decode repetitions per page (median is reported)
+        mailto: Contact email for the polite pool
+        decoder: Fast decoder name (see fast_json.get_decoder)
+    """
+    user_agent = "CrossrefSearch/1.0 (payload benchmark"
+    user_agent += f"; mailto:{mailto})" if mailto else ")"
+    params = {'query': query, 'rows': rows, 'sort': 'relevance'}
+    select = ','.join([*DataNormalizer.CROSSREF_FIELDS, 'score'])
+
+    modes = {
+        'before': (params, {'Accept-Encoding': 'identity'}, json.loads),
+        'gzip': (params, {'Accept-Encoding': ACCEPT_ENCODING}, json.loads),
+        'after': (
+            {**params, 'select': select},
+            {'Accept-Encoding': ACCEPT_ENCODING},
+            fast_json.get_decoder(decoder),
+        ),
+    }
+
+    async with httpx.AsyncClient(headers={'User-Agent': user_agent}, timeout=60) as client:
+        print(f"{'mode':<10} {'wire KiB':>10} {'body KiB':>10} {'decode ms':>10}  (per page)")
+        for label, (mode_params, headers, loads) in modes.items():
+            results = await _measure(client, mode_params, headers, loads, pages, repeat)
+            print(_summary(label, results))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--query", default="machine learning")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--mailto", default=None)
+    parser.add_argument("--decoder", default="auto")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.query, args.rows, args.pages, args.repeat, args.mailto, args.decoder))
+
+
+if __name__ == "__main__":
+    main()
@@ -86,6 +86,14 @@ CREATE TABLE IF NOT EXISTS favorites (
 -- Create index for faster favorites lookups
 CREATE INDEX IF NOT EXISTS idx_favorites_user_id ON favorites(user_id);
 
+-- BibTeX cache table (DOI content negotiation results)
+CREATE TABLE IF NOT EXISTS bibtex_cache (
+    doi VARCHAR(255) PRIMARY KEY,
+    bibtex TEXT,
+    not_found BOOLEAN NOT NULL DEFAULT FALSE,
+    fetched_at DOUBLE PRECISION NOT NULL
+);
+
 -- Function to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -113,3 +121,4 @@ COMMENT ON TABLE subscriptions IS 'User subscription plans and Stripe data';
 COMMENT ON TABLE usage_tracking IS 'Daily usage tracking for rate limiting';
 COMMENT ON TABLE search_history IS 'Search history for premium users';
 COMMENT ON TABLE favorites IS 'Favorite papers for premium users';
+COMMENT ON TABLE bibtex_cache IS 'Persistent DOI to BibTeX cache for exports';
@@ -0,0 +1,27 @@
+"""Shared data for benchmarks."""
+from typing import List
+
+import pytest
+
+from app.models import NormalizedItem
+
+
+def make_items(count: int) -> List[NormalizedItem]:
+    """Build ``count`` varied items shaped like typical Crossref results."""
+    return [
+        NormalizedItem(
+            doi=f"10.{1000 + n % 50}/journal.{n:07d}",
+            title=f"Effects of treatment {n} on outcome measures in cohort {n % 97}",
+            authors="; ".join(f"Author{n % 13 + k} Surname{n % 31 + k}" for k in range(1 + n % 6)),
+            year=2000 + n % 25 if n % 17 else None,
+            journal=f"Journal of Applied Studies {n % 40}",
+            abstract=f"We report results for sample {n}. " * (5 + n % 20),
+            url=f"https://doi.org/10.{1000 + n % 50}/journal.{n:07d}",
+        )
+        for n in range(count)
+    ]
+
+
+@pytest.fixture(scope="session")
+def items_500() -> List[NormalizedItem]:
+    return make_items(500)
@@ -0,0 +1,46 @@
+"""Benchmarks: streaming exporter throughput and peak memory at 500 items."""
+import tracemalloc
+
+import pyarrow as pa
+import pytest
+
+from app.utils.exporters import EXPORTERS, create_exporter
+
+
+PAGE_ROWS = 100
+
+
+def export(format, items):
+    exporter = create_exporter(format)
+    size = 0
+    for start in range(0, len(items), PAGE_ROWS):
+        size += len(exporter.write(items[start:start + PAGE_ROWS]))
+    return size + len(exporter.close())
+
+
+def peak_bytes(format, items):
+    """Peak Python and Arrow allocations while exporting items."""
+    arrow_peak = arrow_base = pa.total_allocated_bytes()
+    exporter = create_exporter(format)
+    tracemalloc.start()
+    try:
+        for start in range(0, len(items), PAGE_ROWS):
+            exporter.write(items[start:start + PAGE_ROWS])
+            arrow_peak = max(arrow_peak, pa.total_allocated_bytes())
+        exporter.close()
+        python_peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return python_peak, arrow_peak - arrow_base
+
+
+@pytest.mark.parametrize('format', sorted(EXPORTERS))
+def test_export(benchmark, items_500, format):
+    benchmark.group = "export-500"
+    python_peak, arrow_peak = peak_bytes(format, items_500)
+    benchmark.extra_info['peak_python_bytes'] = python_peak
+    benchmark.extra_info['peak_arrow_bytes'] = arrow_peak
+
+    size = benchmark(export, format, items_500)
+    benchmark.extra_info['output_bytes'] = size
+    assert size > 0
@@ -0,0 +1,43 @@
+"""Benchmarks: HTMLSanitizer against bleach.clean on typical abstracts."""
+import bleach
+import pytest
+
+from app.utils.normalizer import DataNormalizer
+
+
+JATS_ABSTRACT = (
+    "<jats:title>Abstract</jats:title>"
+    "<jats:sec><jats:title>Background</jats:title><jats:p>Growth of "
+    "<jats:italic>Escherichia coli</jats:italic> under nutrient stress is poorly "
+    "characterized at temperatures &lt; 20&#x00B0;C.</jats:p></jats:sec>"
+    "<jats:sec><jats:title>Results</jats:title><jats:p>Expression of "
+    "<jats:italic>rpoS</jats:italic> rose 3.2-fold (<jats:italic>p</jats:italic> &lt; 0.01) "
+    "and H<jats:sub>2</jats:sub>O<jats:sub>2</jats:sub> tolerance improved.</jats:p></jats:sec>"
+)
+HTML_ABSTRACT = (
+    "<p>We propose a <b>simple</b> method for <i>sparse</i> regression.</p>"
+    "<p>Experiments on 12 datasets show a 4&times; speed-up.<br>Code is available.</p>"
+)
+PLAIN_ABSTRACT = (
+    "We propose a simple method for sparse regression. Experiments on twelve "
+    "datasets show a fourfold speed-up over the state of the art."
+)
+
+ABSTRACTS = {'jats': JATS_ABSTRACT, 'html': HTML_ABSTRACT, 'plain': PLAIN_ABSTRACT}
+
+
+def bleach_clean(text: str) -> str:
+    return bleach.clean(text, tags=DataNormalizer.ALLOWED_TAGS, attributes={}, strip=True)
+
+
+@pytest.mark.parametrize("kind", sorted(ABSTRACTS))
+def test_sanitizer(benchmark, kind):
+    benchmark.group = f"sanitize-{kind}"
+    text = ABSTRACTS[kind]
+    assert benchmark(DataNormalizer.SANITIZER.clean, text) == bleach_clean(text)
+
+
+@pytest.mark.parametrize("kind", sorted(ABSTRACTS))
+def test_bleach(benchmark, kind):
+    benchmark.group = f"sanitize-{kind}"
+    benchmark(bleach_clean, ABSTRACTS[kind])
@@ -0,0 +1,70 @@
+"""Benchmarks: slotted NormalizedItem serialization against asdict + json at 500 items."""
+import json
+import tracemalloc
+from dataclasses import asdict, dataclass, fields
+from typing import Optional
+
+from app.models import NormalizedItem, SearchResult
+from app.utils import fast_json
+
+
+@dataclass
+class DictItem:
+    """NormalizedItem as it was before slots: a plain dataclass serialized with asdict."""
+
+    doi: str
+    title: str
+    authors: str
+    year: Optional[int]
+    journal: str
+    abstract: str
+    url: str
+
+
+def as_dict_items(items):
+    return [DictItem(**{f.name: getattr(item, f.name) for f in fields(item)}) for item in items]
+
+
+def allocated_bytes(build) -> int:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def test_serialize_asdict_json(benchmark, items_500):
+    benchmark.group = "serialize-500"
+    items = as_dict_items(items_500)
+
+    def encode():
+        return json.dumps(
+            {'count': len(items), 'items': [asdict(item) for item in items]},
+            ensure_ascii=False
+        ).encode('utf-8')
+
+    benchmark(encode)
+
+
+def test_serialize_to_dict_fast_json(benchmark, items_500):
+    benchmark.group = "serialize-500"
+    result = SearchResult(count=len(items_500), items=items_500)
+    encoded = benchmark(lambda: fast_json.dumps(result.to_dict()))
+    assert fast_json.loads(encoded)['items'][0] == asdict(as_dict_items(items_500[:1])[0])
+
+
+def test_item_memory(benchmark, items_500):
+    benchmark.group = "construct-500"
+    rows = [item.to_row() for item in items_500]
+
+    slotted = allocated_bytes(lambda: [NormalizedItem(*row) for row in rows])
+    plain = allocated_bytes(lambda: [DictItem(*row) for row in rows])
+    benchmark.extra_info['slotted_bytes'] = slotted
+    benchmark.extra_info['dict_bytes'] = plain
+
+    benchmark(lambda: [NormalizedItem(*row) for row in rows])
+    assert slotted < plain
@@ -0,0 +1,161 @@
+"""Shared fixtures: an in-memory Crossref /works endpoint."""
+import asyncio
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import unquote
+
+import httpx
+import pytest
+import pytest_asyncio
+
+# Required setting, so app.main can be imported
+os.environ.setdefault("APP_MAILTO", "test@example.org")
+
+from app.services.crossref_client import CrossrefClient
+
+
+def make_work(n: int, year: int = 2024) -> Dict[str, Any]:
+    """A raw Crossref work with a predictable DOI and date."""
+    return {
+        'DOI': f'10.1000/{n}',
+        'title': [f'Title {n}'],
+        'author': [{'given': 'Ada', 'family': f'Author{n}'}],
+        'published': {'date-parts': [[year, 1 + n % 12, 1]]},
+        'container-title': ['Journal'],
+        'abstract': f'<jats:p>Abstract {n}</jats:p>',
+        'score': 1000.0 - n,
+    }
+
+
+class FakeCrossref:
+    """
+    Serves /works pages from a list of works.
+
+    Cursors are ``c<offset>``; ``from-pub-date``/``until-pub-date``
+    filters select works by publication date and ``doi`` filters by DOI;
+    ``/works/{doi}`` serves a single work. ``delay`` (seconds, or a callable
+    taking the request) slows every response, ``statuses`` queues
+    status codes returned instead of a page and ``headers`` are added to
+    every response.
+
+    With ``scrolling`` set, cursors behave like Crossref's: a deep-paging
+    request starts a scroll whose ``s<n>`` cursor stays the same while
+    every request made with it moves the scroll on, so repeating a
+    request skips a page.
+    """
+
+    def __init__(self, works: List[Dict[str, Any]]):
+        self.works = works
+        self.requests: List[httpx.Request] = []
+        self.request_times: List[float] = []
+        self.delay: Any = 0.0
+        self.statuses: List[int] = []
+        self.headers: Dict[str, str] = {}
+        self.scrolling = False
+        self._scrolls: Dict[str, int] = {}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.request_times.append(time.monotonic())
+        # The page is served (and a scroll moved on) before a slow response
+        response = self._respond(request)
+        delay = self.delay(request) if callable(self.delay) else self.delay
+        if delay:
+            await asyncio.sleep(delay)
+        return response
+
+    def _respond(self, request: httpx.Request) -> httpx.Response:
+        if self.statuses:
+            return httpx.Response(self.statuses.pop(0), headers=self.headers)
+
+        if request.url.path.startswith('/works/'):
+            return self._work(unquote(request.url.path[len('/works/'):]))
+
+        params = request.url.params
+        works = self._filtered(params.get('filter', ''))
+        cursor = params.get('cursor', '*')
+        rows = int(params.get('rows', 20))
+        if not self.scrolling:
+            offset = 0 if cursor == '*' else int(cursor[1:])
+            page = works[offset:offset + rows]
+            next_cursor = f'c{offset + len(page)}'
+        else:
+            if cursor == '*':
+                cursor = f's{len(self._scrolls)}'
+                self._scrolls[cursor] = 0
+            elif cursor not in self._scrolls:
+                return httpx.Response(400, headers=self.headers)
+            offset = self._scrolls[cursor]
+            page = works[offset:offset + rows]
+            self._scrolls[cursor] = offset + len(page)
+            next_cursor = cursor
+        message = {
+            'items': page,
+            'total-results': len(works),
+            'next-cursor': next_cursor if page else None,
+        }
+        return httpx.Response(200, json={'message': message}, headers=self.headers)
+
+    def _work(self, doi: str) -> httpx.Response:
+        for work in self.works:
+            if work['DOI'].lower() == doi.lower():
+                return httpx.Response(200, json={'message': work}, headers=self.headers)
+        return httpx.Response(404, headers=self.headers)
+
+    def _filtered(self, filter_str: str) -> List[Dict[str, Any]]:
+        pairs = [part.split(':', 1) for part in filter_str.split(',') if part]
+        filters = dict(pairs)
+        dois = {value.lower() for name, value in pairs if name == 'doi'}
+        low = filters.get('from-pub-date', '0000-00-00')
+        high = filters.get('until-pub-date', '9999-99-99')
+        return [
+            work for work in self.works
+            if low <= _published(work) <= high and (not dois or work['DOI'].lower() in dois)
+        ]
+
+
+class FailingTransport(httpx.AsyncBaseTransport):
+    """Answers the ``fail_at``-th request (1-based) with a 400."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, fail_at: int):
+        self.transport = transport
+        self.fail_at = fail_at
+        self.count = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.count += 1
+        if self.count == self.fail_at:
+            return httpx.Response(400)
+        return await self.transport.handle_async_request(request)
+
+def _published(work: Dict[str, Any]) -> str:
+    year, month, day = work['published']['date-parts'][0]
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+@pytest.fixture
+def fake_crossref() -> FakeCrossref:
+    return FakeCrossref([make_work(n) for n in range(300)])
+
+
+@pytest_asyncio.fixture
+async def crossref_client_factory(fake_crossref):
+    """Build CrossrefClients talking to ``fake_crossref``."""
+    clients: List[httpx.AsyncClient] = []
+
+    def build(
+        transport: Optional[Callable[[httpx.AsyncBaseTransport], httpx.AsyncBaseTransport]] = None,
+        **options: Any,
+    ) -> CrossrefClient:
+        options.setdefault('prefetch_pages', 0)
+        client = CrossrefClient(user_agent="test", mailto="test@example.org", **options)
+        mock: httpx.AsyncBaseTransport = httpx.MockTransport(fake_crossref.handler)
+        clients.append(client.client)
+        client.client = httpx.AsyncClient(transport=transport(mock) if transport else mock)
+        clients.append(client.client)
+        return client
+
+    yield build
+    for client in clients:
+        await client.aclose()
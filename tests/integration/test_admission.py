@@ -0,0 +1,119 @@
+"""Integration tests: admission control in front of an ASGI app."""
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.services.admission import AdmissionController, AdmissionMiddleware
+
+
+class PlanByHeader:
+    """Resolves the plan from the bearer token's text, for tests."""
+
+    async def resolve(self, authorization):
+        return authorization.split(" ", 1)[1] if authorization else "free"
+
+
+def build_app(controller, release: asyncio.Event, served: list):
+    async def search(request):
+        served.append(request.headers.get("authorization"))
+        await release.wait()
+        return JSONResponse({"ok": True})
+
+    async def health(request):
+        return JSONResponse({"status": "ok"})
+
+    app = Starlette(routes=[Route("/search", search), Route("/healthz", health)])
+    return AdmissionMiddleware(
+        app,
+        controller,
+        path_prefixes=("/search",),
+        plan_resolver=PlanByHeader(),
+    )
+
+
+@pytest.mark.asyncio
+async def test_overload_is_shed_with_retry_after():
+    controller = AdmissionController(max_concurrent=2, max_queue=2, max_wait=5)
+    release = asyncio.Event()
+    app = build_app(controller, release, [])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        requests = [asyncio.create_task(client.get("/search")) for _ in range(6)]
+        await asyncio.sleep(0.1)
+
+        # Unadmitted paths are never queued
+        assert (await client.get("/healthz")).status_code == 200
+
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 200, 200, 200, 503, 503]
+    for response in responses:
+        if response.status_code == 503:
+            assert int(response.headers["retry-after"]) >= 1
+    assert controller.active == 0 and controller.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_bounded():
+    controller = AdmissionController(max_concurrent=1, max_queue=4, max_wait=0.1)
+    release = asyncio.Event()
+    app = build_app(controller, release, [])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        holder = asyncio.create_task(client.get("/search"))
+        await asyncio.sleep(0.05)
+        waiting = await client.get("/search")
+        release.set()
+        assert (await holder).status_code == 200
+
+    assert waiting.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_paid_plan_is_served_ahead_of_queued_free_requests():
+    controller = AdmissionController(
+        max_concurrent=1, max_queue=20, max_wait=5, weights={"free": 1, "pro": 4}
+    )
+    release = asyncio.Event()
+    served: list = []
+    app = build_app(controller, release, served)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        holder = asyncio.create_task(client.get("/search"))
+        await asyncio.sleep(0.05)
+        free = [asyncio.create_task(client.get("/search", headers={"authorization": "Bearer free"})) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        pro = [asyncio.create_task(client.get("/search", headers={"authorization": "Bearer pro"})) for _ in range(4)]
+        await asyncio.sleep(0.05)
+
+        release.set()
+        await asyncio.gather(holder, *free, *pro)
+
+    # After the holder, pro requests overtake the free ones queued before them
+    order = [auth.split(" ")[1] for auth in served[1:]]
+    assert order[:4].count("pro") >= 3
+    assert sorted(order) == ["free"] * 4 + ["pro"] * 4
+
+
+@pytest.mark.asyncio
+async def test_endpoint_sees_the_plan_it_was_scheduled_under():
+    async def submit(request):
+        return JSONResponse({"plan": request.state.plan})
+
+    app = AdmissionMiddleware(
+        Starlette(routes=[Route("/export-jobs", submit, methods=["POST"])]),
+        AdmissionController(),
+        path_prefixes=("/export-jobs",),
+        plan_resolver=PlanByHeader(),
+    )
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/export-jobs", headers={"authorization": "Bearer pro"})
+
+    assert response.json() == {"plan": "pro"}
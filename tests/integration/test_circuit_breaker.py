@@ -0,0 +1,71 @@
+"""Integration tests: Crossref outages tripping the circuit breaker."""
+import asyncio
+
+import httpx
+import pytest
+from tenacity import wait_none
+
+from app.models import SearchFilters
+from app.services.circuit_breaker import CLOSED, OPEN, CircuitBreaker, CircuitOpenError
+from app.services.crossref_client import CrossrefClient
+from app.services.result_cache import ResultCache
+from app.services.search_service import SearchService
+
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch):
+    monkeypatch.setattr(CrossrefClient._fetch_page.retry, 'wait', wait_none())
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("crossref-test", failure_threshold=3, recovery_timeout=0.2)
+
+
+@pytest.mark.asyncio
+async def test_outage_opens_the_circuit_and_stops_upstream_calls(fake_crossref, crossref_client_factory, breaker):
+    fake_crossref.statuses = [500] * 3
+    client = crossref_client_factory(circuit_breaker=breaker)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.search("test", rows=5, max_results=5)
+    assert breaker.state == OPEN
+    assert len(fake_crossref.requests) == 3
+
+    with pytest.raises(CircuitOpenError):
+        await client.search("test", rows=5, max_results=5)
+    assert len(fake_crossref.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_probe_after_recovery_timeout_closes_the_circuit(fake_crossref, crossref_client_factory, breaker):
+    fake_crossref.statuses = [500] * 3
+    client = crossref_client_factory(circuit_breaker=breaker)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.search("test", rows=5, max_results=5)
+
+    await asyncio.sleep(0.25)
+    items = await client.search("test", rows=5, max_results=5)
+
+    assert len(items) == 5
+    assert breaker.state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_stale_results(fake_crossref, crossref_client_factory, breaker):
+    # Entries are expired as soon as they are stored
+    service = SearchService(
+        crossref_client_factory(circuit_breaker=breaker),
+        result_cache=ResultCache(ttl=0, stale_ttl=0),
+    )
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+    fresh = await service.search(filters.query, filters)
+
+    fake_crossref.statuses = [500] * 3
+    with pytest.raises(httpx.HTTPStatusError):
+        await service.search(filters.query, filters)
+    result = await service.search(filters.query, filters)
+
+    assert breaker.state == OPEN
+    assert result.stale
+    assert [item.doi for item in result.items] == [item.doi for item in fresh.items]
@@ -0,0 +1,57 @@
+"""Integration tests: Crossref requests paced by the rate governor."""
+import asyncio
+import time
+
+import pytest
+
+from app.services.rate_governor import RateGovernedTransport, RateGovernor
+
+
+def governed(governor):
+    return lambda transport: RateGovernedTransport(transport, governor, ["api.crossref.org"])
+
+
+@pytest.mark.asyncio
+async def test_requests_are_paced_at_the_configured_rate(fake_crossref, crossref_client_factory):
+    # Timed from the governor's creation, as tokens accrue from then on
+    started = time.monotonic()
+    governor = RateGovernor(rate=10)
+    governor.tokens = 1
+    client = crossref_client_factory(transport=governed(governor))
+
+    pages = [page async for page in client.iter_pages("test", rows=1, max_results=5)]
+    elapsed = time.monotonic() - started
+
+    assert len(pages) == 5
+    # One request available at once, then one every 0.1s
+    assert elapsed >= 0.35
+
+
+@pytest.mark.asyncio
+async def test_advertised_limit_sets_the_rate(fake_crossref, crossref_client_factory):
+    fake_crossref.headers = {'x-rate-limit-limit': '50', 'x-rate-limit-interval': '1s'}
+    governor = RateGovernor(rate=10, headroom=0.9)
+    client = crossref_client_factory(transport=governed(governor))
+
+    await client.search("test", rows=5, max_results=5)
+
+    assert governor.rate == pytest.approx(45)
+
+
+@pytest.mark.asyncio
+async def test_retry_after_holds_back_every_caller(fake_crossref, crossref_client_factory):
+    fake_crossref.statuses = [429]
+    fake_crossref.headers = {'retry-after': '0.3'}
+    governor = RateGovernor(rate=100)
+    client = crossref_client_factory(transport=governed(governor))
+
+    throttled = asyncio.create_task(client.search("test", rows=5, max_results=5))
+    while not fake_crossref.request_times:
+        await asyncio.sleep(0.01)
+    # An unrelated search issued after the 429 waits out the Retry-After too
+    other = await client.search("other", rows=5, max_results=5)
+    assert len(other) == 5
+    assert len(await throttled) == 5
+
+    throttled_at = fake_crossref.request_times[0]
+    assert min(fake_crossref.request_times[1:]) - throttled_at >= 0.29
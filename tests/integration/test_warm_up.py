@@ -0,0 +1,51 @@
+"""Integration tests: opening upstream connections at startup."""
+import httpx
+import pytest
+
+
+class HeadRecorder(httpx.AsyncBaseTransport):
+    """Answers HEAD requests itself, refusing connections to ``down`` hosts."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, down=()):
+        self.transport = transport
+        self.down = set(down)
+        self.heads = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != 'HEAD':
+            return await self.transport.handle_async_request(request)
+        self.heads.append(request)
+        if request.url.host in self.down:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(405)
+
+
+def recording(recorders, down=()):
+    def wrap(transport):
+        recorders.append(HeadRecorder(transport, down))
+        return recorders[-1]
+    return wrap
+
+
+@pytest.mark.asyncio
+async def test_warm_up_reaches_every_upstream_host(fake_crossref, crossref_client_factory):
+    recorders = []
+    client = crossref_client_factory(transport=recording(recorders))
+
+    warmed = await client.warm_up()
+
+    # Any response, even an error status, means the connection is open
+    assert warmed == {url: True for url in client.WARM_UP_URLS}
+    assert {request.url.host for request in recorders[0].heads} == {"api.crossref.org", "doi.org"}
+    assert fake_crossref.requests == []
+
+
+@pytest.mark.asyncio
+async def test_unreachable_host_is_reported_without_failing_startup(fake_crossref, crossref_client_factory):
+    client = crossref_client_factory(transport=recording([], down=["doi.org"]))
+
+    warmed = await client.warm_up()
+
+    assert warmed == {"https://api.crossref.org/": True, "https://doi.org/": False}
+    # The pool still serves searches afterwards
+    assert len(await client.search("test", rows=5, max_results=5)) == 5
@@ -0,0 +1,90 @@
+"""Tests for weighted fair admission."""
+import asyncio
+
+import pytest
+
+from app.services.admission import AdmissionController, AdmissionRejected
+
+
+def controller(**options):
+    options.setdefault('max_concurrent', 1)
+    return AdmissionController(weights={'free': 1.0, 'pro': 4.0}, **options)
+
+
+async def queue(admission, plans, order):
+    async def wait(plan):
+        await admission.acquire(plan)
+        order.append(plan)
+
+    tasks = []
+    for plan in plans:
+        tasks.append(asyncio.create_task(wait(plan)))
+        await asyncio.sleep(0)
+    return tasks
+
+
+async def drain(admission, tasks):
+    for _ in tasks:
+        admission.release()
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    admission.release()
+
+
+async def interleaving(admission):
+    # One free request waiting behind eight pro ones
+    order = []
+    await admission.acquire('pro')
+    await drain(admission, await queue(admission, ['free'] + ['pro'] * 8, order))
+    return order
+
+
+@pytest.mark.asyncio
+async def test_shed_requests_do_not_push_back_their_plan():
+    admission = controller(max_queue=2)
+    await admission.acquire('pro')
+    waiting = await queue(admission, ['free', 'free'], [])
+    for _ in range(20):
+        with pytest.raises(AdmissionRejected) as e:
+            await admission.acquire('free')
+        assert e.value.reason == 'queue_full'
+    await drain(admission, waiting)
+
+    admission.max_queue = 64
+    order = await interleaving(admission)
+
+    assert order == ['pro'] * 3 + ['free'] + ['pro'] * 5
+
+
+@pytest.mark.asyncio
+async def test_timed_out_requests_do_not_push_back_their_plan():
+    admission = controller(max_wait=0.01)
+    await admission.acquire('pro')
+    for _ in range(20):
+        with pytest.raises(AdmissionRejected) as e:
+            await admission.acquire('free')
+        assert e.value.reason == 'timeout'
+    admission.release()
+
+    admission.max_wait = 2.0
+    order = await interleaving(admission)
+
+    assert order == ['pro'] * 3 + ['free'] + ['pro'] * 5
+
+
+@pytest.mark.asyncio
+async def test_preempted_request_gives_back_its_share():
+    admission = controller(max_queue=1)
+    await admission.acquire('pro')
+    free = await queue(admission, ['free'], [])
+    pro = await queue(admission, ['pro'], [])
+
+    with pytest.raises(AdmissionRejected) as e:
+        await free[0]
+    assert e.value.reason == 'preempted'
+    await drain(admission, pro)
+
+    admission.max_queue = 64
+    order = await interleaving(admission)
+
+    assert order == ['pro'] * 3 + ['free'] + ['pro'] * 5
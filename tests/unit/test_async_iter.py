@@ -0,0 +1,111 @@
+"""Tests for reading async iterators ahead of the consumer."""
+import asyncio
+import time
+from contextlib import aclosing
+
+import pytest
+
+from app.utils.async_iter import prefetch
+
+
+class Source:
+    """Async generator recording how far it was read and whether it was closed."""
+
+    def __init__(self, count, delay=0.0, error_at=None):
+        self.count = count
+        self.delay = delay
+        self.error_at = error_at
+        self.produced = 0
+        self.closed = False
+
+    async def generate(self):
+        try:
+            for n in range(self.count):
+                if n == self.error_at:
+                    raise ValueError(n)
+                await asyncio.sleep(self.delay)
+                self.produced += 1
+                yield n
+        finally:
+            self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_values_keep_their_order():
+    source = Source(20)
+
+    assert [value async for value in prefetch(source.generate(), depth=3)] == list(range(20))
+    assert source.closed
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_is_bounded_by_depth():
+    source = Source(20)
+    values = prefetch(source.generate(), depth=2)
+
+    assert await values.__anext__() == 0
+    await asyncio.sleep(0.01)
+
+    # One value taken, two buffered, one waiting for room
+    assert source.produced == 4
+    await values.aclose()
+
+
+@pytest.mark.asyncio
+async def test_production_overlaps_consumption():
+    source = Source(5, delay=0.02)
+
+    started = time.monotonic()
+    async for _ in prefetch(source.generate(), depth=1):
+        await asyncio.sleep(0.02)
+    elapsed = time.monotonic() - started
+
+    # Sequential reading would take 0.2s
+    assert elapsed < 0.17
+
+
+@pytest.mark.asyncio
+async def test_errors_follow_the_values_before_them():
+    source = Source(10, error_at=3)
+    received = []
+
+    with pytest.raises(ValueError):
+        async for value in prefetch(source.generate(), depth=5):
+            received.append(value)
+
+    assert received == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_closing_early_cancels_the_producer_and_closes_the_source():
+    source = Source(1000, delay=0.001)
+    values = prefetch(source.generate(), depth=2)
+
+    async for value in values:
+        if value == 2:
+            break
+    await values.aclose()
+    produced = source.produced
+    await asyncio.sleep(0.02)
+
+    assert source.closed
+    assert source.produced == produced
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_consumer_stops_the_producer():
+    source = Source(1000, delay=0.001)
+
+    async def consume():
+        async with aclosing(prefetch(source.generate(), depth=2)) as values:
+            async for _ in values:
+                await asyncio.sleep(1)
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0.02)
+    consumer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await consumer
+
+    assert source.closed
+    assert source.produced <= 4
@@ -0,0 +1,143 @@
+"""Tests for local BibTeX rendering."""
+import re
+
+import pytest
+
+from app.utils.bibtex import (
+    CONTAINER_FIELDS,
+    ENTRY_TYPES,
+    BibtexRenderer,
+    BibtexRenderError,
+    escape_latex,
+    markup_to_latex,
+)
+
+
+def record(**fields):
+    base = {
+        'DOI': '10.1000/xyz',
+        'type': 'journal-article',
+        'title': ['Deep learning for proteins'],
+        'author': [{'given': 'Ada', 'family': 'Smith'}, {'given': 'Alan', 'family': 'Jones'}],
+        'published': {'date-parts': [[2024, 3, 1]]},
+        'container-title': ['Journal of Tests'],
+    }
+    base.update(fields)
+    return base
+
+
+def parse(entry):
+    """(entry type, key, {field: value}) of a rendered entry."""
+    header = re.match(r'@(\w+)\{([^,]+),\n', entry)
+    fields = dict(re.findall(r'^  (\w+) = \{(.*)\},?$', entry, re.MULTILINE))
+    return header.group(1), header.group(2), fields
+
+
+@pytest.mark.parametrize("crossref_type, entry_type", sorted(ENTRY_TYPES.items()))
+def test_entry_types(crossref_type, entry_type):
+    rendered, key, fields = parse(BibtexRenderer().render(record(type=crossref_type)))
+
+    assert rendered == entry_type
+    assert key == 'smith2024deep'
+    assert fields['author'] == 'Smith, Ada and Jones, Alan'
+    assert fields['year'] == '2024'
+    assert fields['doi'] == '10.1000/xyz'
+    container_field = CONTAINER_FIELDS.get(entry_type)
+    if container_field:
+        assert fields[container_field] == 'Journal of Tests'
+    else:
+        assert 'journal' not in fields and 'booktitle' not in fields
+
+
+def test_unknown_type_is_misc():
+    entry_type, _, _ = parse(BibtexRenderer().render(record(type='peer-review')))
+    assert entry_type == 'misc'
+
+
+def test_publisher_field_depends_on_entry_type():
+    renderer = BibtexRenderer()
+    _, _, thesis = parse(renderer.render(record(type='dissertation', publisher='MIT')))
+    _, _, report = parse(renderer.render(record(type='report', publisher='NASA')))
+    _, _, book = parse(renderer.render(record(type='book', publisher='Springer', ISBN=['978-3-16'])))
+
+    assert thesis['school'] == 'MIT'
+    assert report['institution'] == 'NASA'
+    assert book['publisher'] == 'Springer' and book['isbn'] == '978-3-16'
+
+
+def test_missing_required_fields_are_rejected():
+    renderer = BibtexRenderer()
+    with pytest.raises(BibtexRenderError):
+        renderer.render(record(title=[]))
+    with pytest.raises(BibtexRenderError):
+        renderer.render(record(published={}, issued={}))
+    with pytest.raises(BibtexRenderError):
+        renderer.render(record(**{'container-title': []}))
+
+
+@pytest.mark.parametrize("text, escaped", [
+    ('R&D', r'R\&D'),
+    ('50% off', r'50\% off'),
+    ('{braces}', r'\{braces\}'),
+    ('snake_case', r'snake\_case'),
+    ('$5 #1', r'\$5 \#1'),
+    ('a~b^c', r'a\textasciitilde{}b\textasciicircum{}c'),
+    ('back\\slash', r'back\textbackslash{}slash'),
+    ('Ünïcödé — Núñez', 'Ünïcödé — Núñez'),
+])
+def test_escape_latex(text, escaped):
+    assert escape_latex(text) == escaped
+
+
+def test_special_characters_in_fields():
+    entry = BibtexRenderer().render(record(
+        title=['Costs & benefits of 100% {open} data_sets'],
+        author=[{'given': 'José', 'family': 'Núñez'}],
+        page='10-20',
+    ))
+    _, key, fields = parse(entry)
+
+    assert fields['title'] == r'Costs \& benefits of 100\% \{open\} data\_sets'
+    assert fields['author'] == 'Núñez, José'
+    assert fields['pages'] == '10--20'
+    # Keys are plain ASCII
+    assert key == 'nunez2024costs'
+
+
+@pytest.mark.parametrize("title, latex", [
+    ('Growth of <i>E. coli</i>', r'Growth of \textit{E. coli}'),
+    ('<jats:italic>In vivo</jats:italic> H<jats:sub>2</jats:sub>O', r'\textit{In vivo} H\textsubscript{2}O'),
+    ('<b>Bold</b> and <sup>3</sup>He', r'\textbf{Bold} and \textsuperscript{3}He'),
+    ('<scp>DNA</scp> repair', r'\textsc{DNA} repair'),
+    ('Dropped <span class="x">tags</span> &amp; entities', r'Dropped tags \& entities'),
+    # Unclosed and stray tags still give balanced braces
+    ('<i>Unclosed', r'\textit{Unclosed}'),
+    ('Stray</i> close', 'Stray close'),
+])
+def test_markup_to_latex(title, latex):
+    assert markup_to_latex(title) == latex
+
+
+def test_markup_in_titles_does_not_reach_the_key():
+    _, key, fields = parse(BibtexRenderer().render(record(title=['<i>The</i> <b>Quantum</b> leap'])))
+
+    assert fields['title'] == r'\textit{The} \textbf{Quantum} leap'
+    assert key == 'smith2024quantum'
+
+
+def test_duplicate_keys_get_distinct_suffixes():
+    renderer = BibtexRenderer()
+    keys = [parse(renderer.render(record(DOI=f'10.1000/{n}')))[1] for n in range(4)]
+
+    assert keys == ['smith2024deep', 'smith2024deepb', 'smith2024deepc', 'smith2024deepd']
+
+
+def test_keys_are_only_unique_within_one_renderer():
+    assert parse(BibtexRenderer().render(record()))[1] == parse(BibtexRenderer().render(record()))[1]
+
+
+def test_organization_authors_are_braced():
+    _, key, fields = parse(BibtexRenderer().render(record(author=[{'name': 'WHO Consortium'}])))
+
+    assert fields['author'] == '{WHO Consortium}'
+    assert key == 'who2024deep'
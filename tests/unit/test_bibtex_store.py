@@ -0,0 +1,109 @@
+"""Tests for the persistent DOI-to-BibTeX stores."""
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from app.services import bibtex_store as bibtex_store_module
+from app.services.bibtex_store import NOT_FOUND, PostgresBibtexStore, SQLiteBibtexStore
+
+
+class SQLiteDatabase:
+    """The ``databases.Database`` calls PostgresBibtexStore makes, run on SQLite."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.row_factory = sqlite3.Row
+        self.selects = []
+
+    async def execute(self, query, values=None):
+        self.conn.execute(query, values or {})
+
+    async def execute_many(self, query, values):
+        self.conn.executemany(query, values)
+
+    async def fetch_all(self, query, values):
+        self.selects.append(values)
+        return self.conn.execute(query, values).fetchall()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1_000_000.0)
+    monkeypatch.setattr(bibtex_store_module, 'time', SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+@pytest_asyncio.fixture(params=['sqlite', 'postgres'])
+async def store(request, tmp_path):
+    if request.param == 'sqlite':
+        store = SQLiteBibtexStore(str(tmp_path / 'cache' / 'bibtex.db'), negative_ttl=60)
+    else:
+        store = PostgresBibtexStore(SQLiteDatabase(), negative_ttl=60)
+    await store.initialize()
+    yield store
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_entries_round_trip(store):
+    await store.put_many({'10.1000/a': '@article{a}', '10.1000/b': '@article{b}'})
+    await store.put_many({'10.1000/b': '@article{b2}'})
+
+    found = await store.get_many(['10.1000/a', '10.1000/b', '10.1000/c'])
+
+    assert found == {'10.1000/a': '@article{a}', '10.1000/b': '@article{b2}'}
+    assert await store.get_many([]) == {}
+
+
+@pytest.mark.asyncio
+async def test_keys_are_case_folded(store):
+    await store.put_many({' 10.1000/ABC ': '@article{abc}'})
+
+    found = await store.get_many(['10.1000/abc', '10.1000/Abc'])
+
+    assert found == {'10.1000/abc': '@article{abc}'}
+
+
+@pytest.mark.asyncio
+async def test_not_found_expires_after_the_negative_ttl(store, clock):
+    await store.put_not_found(['10.1000/gone'])
+
+    clock.now += 59
+    assert await store.get_many(['10.1000/gone']) == {'10.1000/gone': NOT_FOUND}
+
+    clock.now += 2
+    assert await store.get_many(['10.1000/gone']) == {}
+
+
+@pytest.mark.asyncio
+async def test_resolved_entries_replace_not_found(store):
+    await store.put_not_found(['10.1000/late'])
+    await store.put_many({'10.1000/late': '@article{late}'})
+
+    assert await store.get_many(['10.1000/late']) == {'10.1000/late': '@article{late}'}
+
+
+@pytest.mark.asyncio
+async def test_negative_ttl_zero_remembers_nothing(tmp_path):
+    store = SQLiteBibtexStore(str(tmp_path / 'bibtex.db'), negative_ttl=0)
+    await store.initialize()
+
+    await store.put_not_found(['10.1000/gone'])
+
+    assert await store.get_many(['10.1000/gone']) == {}
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_lookups_beyond_the_chunk_size_are_split(store, monkeypatch):
+    monkeypatch.setattr(type(store), 'CHUNK_SIZE', 3)
+    dois = [f'10.1000/{n}' for n in range(8)]
+    await store.put_many({doi: f'@article{{{doi}}}' for doi in dois[::2]})
+
+    found = await store.get_many(dois + ['10.1000/7'.upper()])
+
+    assert sorted(found) == dois[::2]
+    if isinstance(store, PostgresBibtexStore):
+        assert sorted(len(values) for values in store.database.selects) == [2, 3, 3]
@@ -0,0 +1,89 @@
+"""Tests for continuation tokens."""
+import pytest
+
+from app.models import SearchFilters
+from app.services import continuation as continuation_module
+from app.services.continuation import ContinuationStore
+from app.services.result_cache import ResultCache
+from app.services.search_service import SearchService
+
+
+@pytest.fixture
+def search_service(fake_crossref, crossref_client_factory):
+    # Work 2 cannot be normalized
+    fake_crossref.works[2]['author'] = [None]
+    return SearchService(
+        crossref_client_factory(),
+        continuations=ContinuationStore(secret="test"),
+    )
+
+
+def dois(result):
+    return [item.doi for item in result.items]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor_expired", [False, True])
+async def test_continuation_skips_raw_results_after_normalization_failure(
+    search_service, monkeypatch, cursor_expired
+):
+    if cursor_expired:
+        # Resume by re-walking to the stored offset instead of the cursor
+        monkeypatch.setattr(continuation_module, 'CURSOR_MAX_AGE', -1)
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+
+    first = await search_service.search(filters.query, filters)
+    assert dois(first) == ['10.1000/0', '10.1000/1', '10.1000/3', '10.1000/4']
+    assert first.next_token is not None
+
+    second = await search_service.continue_search(first.next_token)
+    assert dois(second) == [f'10.1000/{n}' for n in range(5, 10)]
+
+
+@pytest.mark.asyncio
+async def test_stream_continuation_skips_raw_results(search_service, monkeypatch):
+    monkeypatch.setattr(continuation_module, 'CURSOR_MAX_AGE', -1)
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+
+    position = {}
+    streamed = [item async for page in search_service.iter_pages(filters, position=position) for item in page]
+    assert len(streamed) == 4
+    assert position['consumed'] == 5
+
+    token = await search_service.issue_token(filters, 0, position['consumed'], position['cursor'])
+    second = await search_service.continue_search(token)
+    assert dois(second) == [f'10.1000/{n}' for n in range(5, 10)]
+
+
+@pytest.fixture
+def scrolling_service(fake_crossref, crossref_client_factory):
+    fake_crossref.scrolling = True
+    return SearchService(
+        crossref_client_factory(),
+        result_cache=ResultCache(),
+        continuations=ContinuationStore(secret="test"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_token_redeemed_twice_returns_the_same_slice(scrolling_service):
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+    first = await scrolling_service.search(filters.query, filters)
+
+    # The first redemption moves the Crossref scroll on
+    again = await scrolling_service.continue_search(first.next_token)
+    retried = await scrolling_service.continue_search(first.next_token)
+
+    assert dois(again) == dois(retried) == [f'10.1000/{n}' for n in range(5, 10)]
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_token_does_not_share_the_fetching_callers_cursor(scrolling_service, fake_crossref):
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+    fetched = await scrolling_service.search(filters.query, filters)
+    cached = await scrolling_service.search(filters.query, filters)
+    assert len(fake_crossref.requests) == 1
+
+    for result in (fetched, cached):
+        following = await scrolling_service.continue_search(result.next_token)
+        assert dois(following) == [f'10.1000/{n}' for n in range(5, 10)]
@@ -0,0 +1,73 @@
+"""Tests for streamed CSV exports."""
+import csv
+import io
+
+import pytest
+
+from app import main
+from app.services.export_service import ExportService
+from app.utils.exporters import CSV_FIELDNAMES
+from .test_exporters import ITEMS
+
+
+async def pages_of(*pages, error=None):
+    for page in pages:
+        yield page
+    if error is not None:
+        raise error
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.asyncio
+async def test_one_chunk_per_page_with_a_single_header():
+    service = ExportService()
+
+    chunks = await collect(service.stream_csv(pages_of(ITEMS[:2], ITEMS[2:])))
+
+    assert len(chunks) == 2
+    assert chunks[0].startswith('\ufeff' + ','.join(CSV_FIELDNAMES) + '\n')
+    assert '\ufeff' not in chunks[1] and not chunks[1].startswith(CSV_FIELDNAMES[0])
+    assert ''.join(chunks) == service.export_csv(ITEMS)
+
+
+@pytest.mark.asyncio
+async def test_rows_parse_back():
+    chunks = await collect(ExportService().stream_csv(pages_of(ITEMS)))
+
+    rows = list(csv.DictReader(io.StringIO(''.join(chunks).lstrip('\ufeff'))))
+
+    assert [row['doi'] for row in rows] == [item.doi for item in ITEMS]
+    # Abstracts stay on one line
+    assert rows[0]['abstract'] == 'First line second line'
+
+
+@pytest.mark.asyncio
+async def test_no_results_still_give_a_header():
+    chunks = await collect(ExportService().stream_csv(pages_of()))
+
+    assert chunks == ['\ufeff' + ','.join(CSV_FIELDNAMES) + '\n']
+
+
+@pytest.mark.asyncio
+async def test_first_page_failure_surfaces_before_any_chunk():
+    body = ExportService().stream_csv(pages_of(error=RuntimeError('upstream down')))
+
+    with pytest.raises(RuntimeError):
+        await main.start_stream(body)
+
+
+@pytest.mark.asyncio
+async def test_later_failures_end_the_stream_after_the_pages_sent():
+    body = await main.start_stream(
+        ExportService().stream_csv(pages_of(ITEMS[:1], error=RuntimeError('upstream down')))
+    )
+
+    received = []
+    with pytest.raises(RuntimeError):
+        async for chunk in body:
+            received.append(chunk)
+
+    assert len(received) == 1 and ITEMS[0].doi in received[0]
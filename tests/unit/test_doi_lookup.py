@@ -0,0 +1,58 @@
+"""Tests for bulk DOI metadata lookups."""
+import pytest
+
+from app.services.export_service import ExportService
+from conftest import make_work
+
+
+def doi_filters(request):
+    return [part for part in request.url.params.get('filter', '').split(',') if part.startswith('doi:')]
+
+
+@pytest.mark.asyncio
+async def test_dois_are_chunked_at_the_batch_size(fake_crossref, crossref_client_factory):
+    client = crossref_client_factory(doi_batch_size=3)
+    dois = [f'10.1000/{n}' for n in range(7)]
+
+    # Repeats, in any case, are looked up once
+    lookup = await client.get_works_by_doi(dois + ['10.1000/1', ' 10.1000/2 '])
+
+    assert sorted(len(doi_filters(request)) for request in fake_crossref.requests) == [1, 3, 3]
+    assert sorted(lookup.records) == sorted(dois)
+    assert lookup.missing == [] and lookup.failed == {}
+
+
+@pytest.mark.asyncio
+async def test_dois_with_commas_are_looked_up_individually(fake_crossref, crossref_client_factory):
+    fake_crossref.works.append({**make_work(0), 'DOI': '10.1000/A,B'})
+    client = crossref_client_factory()
+
+    lookup = await client.get_works_by_doi(['10.1000/a,b', '10.1000/5'])
+
+    assert sorted(lookup.records) == ['10.1000/5', '10.1000/a,b']
+    single = [request for request in fake_crossref.requests if 'filter' not in request.url.params]
+    assert [request.url.path for request in single] == ['/works/10.1000/a,b']
+    assert all(',' not in part[len('doi:'):] for request in fake_crossref.requests for part in doi_filters(request))
+
+
+@pytest.mark.asyncio
+async def test_missing_and_failed_dois_are_reported(fake_crossref, crossref_client_factory):
+    # The first chunk is answered with a (non-retried) 400
+    fake_crossref.statuses = [400]
+    client = crossref_client_factory(doi_batch_size=2, doi_batch_concurrency=1)
+
+    lookup = await client.get_works_by_doi(['10.1000/1', '10.1000/2', '10.1000/3', '10.9999/unknown', 'nope/x,y'])
+
+    assert lookup.failed == {'10.1000/1': 'HTTPStatusError', '10.1000/2': 'HTTPStatusError'}
+    assert sorted(lookup.records) == ['10.1000/3']
+    assert sorted(lookup.missing) == ['10.9999/unknown', 'nope/x,y']
+
+
+@pytest.mark.asyncio
+async def test_repeated_dois_are_fetched_from_doi_org_once(fake_crossref, crossref_client_factory):
+    service = ExportService(crossref_client_factory())
+
+    export = await service.export_bibtex_report(['10.1000/1', '10.1000/1', '10.1000/1'.upper(), '10.1000/2'])
+
+    assert len(export.entries) == 4 and export.failed == {}
+    assert sorted(request.url.path for request in fake_crossref.requests) == ['/10.1000/1', '/10.1000/2']
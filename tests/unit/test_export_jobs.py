@@ -0,0 +1,120 @@
+"""Tests for background export jobs."""
+import asyncio
+import csv
+import io
+
+import pytest
+
+from app.models import SearchFilters
+from app.services import continuation as continuation_module
+from app.services import export_jobs as export_jobs_module
+from app.services.admission import AdmissionController
+from app.services.export_jobs import ExportJobManager
+from app.services.export_service import ExportService
+from app.services.search_service import SearchService
+from conftest import FailingTransport
+
+
+async def wait_finished(job, timeout=5.0):
+    async def poll():
+        while not job.finished:
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_segments_resume_at_raw_offset_after_normalization_failure(
+    tmp_path, fake_crossref, crossref_client_factory, monkeypatch
+):
+    # Re-walk to the stored offset at every checkpoint instead of using the cursor
+    monkeypatch.setattr(continuation_module, 'CURSOR_MAX_AGE', -1)
+    fake_crossref.works[2]['author'] = [None]
+    manager = ExportJobManager(
+        SearchService(crossref_client_factory()),
+        ExportService(),
+        directory=str(tmp_path),
+        checkpoint_rows=5,
+    )
+    await manager.start()
+    try:
+        job = await manager.submit(SearchFilters(query="test", max_results=12), 'csv')
+        await wait_finished(job)
+    finally:
+        await manager.close()
+
+    assert job.status == 'completed'
+    rows = list(csv.reader(io.StringIO(manager.file_path(job).read_text('utf-8-sig'))))[1:]
+    assert [row[0] for row in rows] == [f'10.1000/{n}' for n in range(12) if n != 2]
+    assert job.items_written == 11
+
+
+@pytest.mark.asyncio
+async def test_retry_after_failure_mid_segment_does_not_skip_results(
+    tmp_path, fake_crossref, crossref_client_factory, monkeypatch
+):
+    # Two pages per segment; the second page of the second segment fails
+    # after the first one has moved the Crossref scroll on
+    monkeypatch.setattr(export_jobs_module, 'JOB_PAGE_ROWS', 5)
+    fake_crossref.scrolling = True
+    manager = ExportJobManager(
+        SearchService(crossref_client_factory(transport=lambda mock: FailingTransport(mock, fail_at=4))),
+        ExportService(),
+        directory=str(tmp_path),
+        checkpoint_rows=10,
+        retry_delay=0,
+    )
+    await manager.start()
+    try:
+        job = await manager.submit(SearchFilters(query="test", max_results=30), 'csv')
+        await wait_finished(job)
+    finally:
+        await manager.close()
+
+    assert job.status == 'completed'
+    assert job.attempts == 2
+    rows = list(csv.reader(io.StringIO(manager.file_path(job).read_text('utf-8-sig'))))[1:]
+    assert [row[0] for row in rows] == [f'10.1000/{n}' for n in range(30)]
+
+
+class RecordingController(AdmissionController):
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.admitted = []
+
+    async def acquire(self, plan="free", cost=1.0):
+        await super().acquire(plan, cost)
+        self.admitted.append((plan, cost))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("plan, cost", [("free", 4.0), ("pro", 1.0)])
+async def test_segments_are_admitted_under_the_submitters_plan(
+    tmp_path, fake_crossref, crossref_client_factory, plan, cost
+):
+    admission = RecordingController(max_concurrent=1, max_wait=0.05)
+    manager = ExportJobManager(
+        SearchService(crossref_client_factory()),
+        ExportService(),
+        directory=str(tmp_path),
+        checkpoint_rows=10,
+        admission=admission,
+        free_bulk_cost=4.0,
+    )
+    # An interactive request holds the only slot; the job waits, even
+    # past the queue timeout, instead of failing
+    await admission.acquire("pro")
+    await manager.start()
+    try:
+        job = await manager.submit(SearchFilters(query="test", max_results=30), 'csv', plan=plan)
+        await asyncio.sleep(0.2)
+        assert fake_crossref.requests == []
+        assert job.status == 'running' and job.attempts == 1
+
+        admission.release()
+        await wait_finished(job)
+    finally:
+        await manager.close()
+
+    assert job.status == 'completed' and job.items_written == 30
+    assert admission.admitted[1:] == [(plan, cost)] * 3
+    assert admission.active == 0
@@ -0,0 +1,171 @@
+"""Round-trip tests for the streaming exporters."""
+import csv
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from app.models import NormalizedItem
+from app.utils.exporters import CSV_FIELDNAMES, ParquetExporter, create_exporter
+from app.utils.normalizer import DataNormalizer
+
+
+ITEMS = [
+    NormalizedItem(
+        doi="10.1000/1",
+        title="Growth of E. coli, \"stressed\"",
+        authors="Ada Lovelace; Alan Turing",
+        year=2024,
+        journal="Journal of Tests",
+        abstract="First line\nsecond line",
+        url="https://doi.org/10.1000/1",
+    ),
+    # Normalizer placeholders and a missing year
+    NormalizedItem(
+        doi="10.1000/2",
+        title=DataNormalizer.NO_TITLE,
+        authors=DataNormalizer.UNKNOWN_AUTHORS,
+        year=None,
+        journal=DataNormalizer.UNKNOWN_JOURNAL,
+        abstract=DataNormalizer.NO_ABSTRACT,
+        url="https://doi.org/10.1000/2",
+    ),
+    NormalizedItem(
+        doi="10.1000/3",
+        title="Ünïcödé — títle",
+        authors="José Núñez",
+        year=1999,
+        journal="Revista",
+        abstract="Résumé",
+        url="https://doi.org/10.1000/3",
+    ),
+]
+
+
+def export(format, pages, **options):
+    exporter = create_exporter(format, **options)
+    output = b''.join(exporter.write(page) for page in pages) + exporter.close()
+    assert exporter.items_count == sum(len(page) for page in pages)
+    return output
+
+
+def pages():
+    return [ITEMS[:2], [], ITEMS[2:]]
+
+
+def typed(item):
+    """The record Arrow and Parquet store for an item."""
+    def known(value, placeholder):
+        return None if value == placeholder else value
+
+    return {
+        'doi': item.doi,
+        'title': known(item.title, DataNormalizer.NO_TITLE),
+        'authors': [] if item.authors == DataNormalizer.UNKNOWN_AUTHORS else item.authors.split('; '),
+        'year': item.year,
+        'journal': known(item.journal, DataNormalizer.UNKNOWN_JOURNAL),
+        'abstract': known(item.abstract, DataNormalizer.NO_ABSTRACT),
+        'url': item.url,
+    }
+
+
+def test_csv_round_trip():
+    text = export('csv', pages()).decode('utf-8')
+
+    assert text.startswith('\ufeff')
+    header, *rows = csv.reader(io.StringIO(text[1:]))
+    assert header == CSV_FIELDNAMES
+    assert rows == [
+        ['' if value is None else str(value).replace('\n', ' ') for value in item.to_row()]
+        for item in ITEMS
+    ]
+
+
+def test_csv_resume_continues_without_header():
+    text = export('csv', [ITEMS], resume=True).decode('utf-8')
+
+    assert not text.startswith('\ufeff')
+    assert [row[0] for row in csv.reader(io.StringIO(text))] == [item.doi for item in ITEMS]
+
+
+def test_empty_csv_still_has_a_header():
+    assert export('csv', []).decode('utf-8') == '\ufeff' + ','.join(CSV_FIELDNAMES) + '\n'
+
+
+def test_jsonl_round_trip():
+    lines = export('jsonl', pages()).decode('utf-8').splitlines()
+
+    assert [json.loads(line) for line in lines] == [item.to_dict() for item in ITEMS]
+
+
+def parse_ris(text):
+    records, record = [], []
+    for line in text.split('\r\n'):
+        if not line:
+            continue
+        tag, value = line[:2], line[6:]
+        if tag == 'ER':
+            records.append(record)
+            record = []
+        else:
+            record.append((tag, value))
+    return records
+
+
+def test_ris_round_trip():
+    text = export('ris', pages(), content_type='proceedings-article').decode('utf-8')
+
+    first, placeholders, third = parse_ris(text)
+    assert first == [
+        ('TY', 'CPAPER'),
+        ('TI', 'Growth of E. coli, "stressed"'),
+        ('AU', 'Ada Lovelace'),
+        ('AU', 'Alan Turing'),
+        ('PY', '2024'),
+        ('T2', 'Journal of Tests'),
+        ('AB', 'First line second line'),
+        ('DO', '10.1000/1'),
+        ('UR', 'https://doi.org/10.1000/1'),
+    ]
+    # Placeholders are left out rather than exported as values
+    assert placeholders == [('TY', 'CPAPER'), ('DO', '10.1000/2'), ('UR', 'https://doi.org/10.1000/2')]
+    assert ('TI', 'Ünïcödé — títle') in third
+
+
+def test_arrow_round_trip():
+    table = pa.ipc.open_stream(export('arrow', pages())).read_all()
+
+    assert table.schema.field('year').type == pa.int32()
+    assert table.to_pylist() == [typed(item) for item in ITEMS]
+
+
+def test_parquet_round_trip():
+    table = pq.read_table(io.BytesIO(export('parquet', pages())))
+
+    assert table.schema.field('year').type == pa.int32()
+    assert table.to_pylist() == [typed(item) for item in ITEMS]
+
+
+def test_parquet_buffers_at_most_one_row_group(monkeypatch):
+    monkeypatch.setattr(ParquetExporter, 'ROW_GROUP_ROWS', 50)
+    page = [ITEMS[n % 3] for n in range(20)]
+    exporter = ParquetExporter()
+
+    chunks = []
+    for _ in range(30):
+        chunks.append(exporter.write(page))
+        assert len(exporter._buffered) < ParquetExporter.ROW_GROUP_ROWS
+    chunks.append(exporter.close())
+
+    # Row groups are handed out as they fill instead of at close()
+    assert sum(1 for chunk in chunks[:-1] if chunk) >= 10
+    metadata = pq.ParquetFile(io.BytesIO(b''.join(chunks))).metadata
+    assert metadata.num_rows == 600
+    assert max(metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)) < 50 + len(page)
+
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        create_exporter('xlsx')
@@ -0,0 +1,93 @@
+"""Tests for the ``select=`` field projection and page decoding."""
+import json
+
+import pytest
+
+from app.services.crossref_client import CrossrefClient
+from app.utils import fast_json
+from app.utils.normalizer import DataNormalizer
+from conftest import make_work
+
+
+def full_work(n):
+    return {
+        **make_work(n),
+        'reference': [{'key': f'ref{i}', 'unstructured': 'x' * 200} for i in range(50)],
+        'license': [{'URL': 'https://creativecommons.org/licenses/by/4.0/'}],
+        'funder': [{'name': 'Agency'}],
+        'published-print': {'date-parts': [[2023, 5, 2]]},
+    }
+
+
+def projected(work, select):
+    return {field: work[field] for field in select.split(',') if field in work}
+
+
+@pytest.mark.asyncio
+async def test_searches_request_the_normalized_fields_and_score(fake_crossref, crossref_client_factory):
+    client = crossref_client_factory(select_fields=DataNormalizer.CROSSREF_FIELDS)
+
+    await client.search("test", rows=5, max_results=5)
+
+    (request,) = fake_crossref.requests
+    assert request.url.params['select'].split(',') == [*DataNormalizer.CROSSREF_FIELDS, 'score']
+
+
+@pytest.mark.asyncio
+async def test_select_is_omitted_when_disabled(fake_crossref, crossref_client_factory):
+    client = crossref_client_factory()
+
+    await client.search("test", rows=5, max_results=5)
+
+    assert 'select' not in fake_crossref.requests[0].url.params
+
+
+@pytest.mark.asyncio
+async def test_doi_lookups_add_the_metadata_fields(fake_crossref, crossref_client_factory):
+    client = crossref_client_factory(select_fields=DataNormalizer.CROSSREF_FIELDS)
+
+    await client.get_works_by_doi(['10.1000/1', '10.1000/2'])
+
+    select = fake_crossref.requests[0].url.params['select'].split(',')
+    assert set(DataNormalizer.CROSSREF_FIELDS) <= set(select)
+    assert set(CrossrefClient.METADATA_FIELDS) <= set(select)
+
+
+@pytest.mark.asyncio
+async def test_projected_works_normalize_like_full_works(crossref_client_factory):
+    select = crossref_client_factory(select_fields=DataNormalizer.CROSSREF_FIELDS).select
+
+    for n in range(5):
+        work = full_work(n)
+        assert DataNormalizer.normalize_item(projected(work, select)) == DataNormalizer.normalize_item(work)
+
+
+@pytest.mark.parametrize('name', sorted(fast_json.DECODERS) + ['auto'])
+def test_decoders_agree_with_the_standard_library(name):
+    body = json.dumps({'message': {'items': [full_work(0)], 'title': 'Ünïcödé — ✓'}}, ensure_ascii=False)
+    decode = fast_json.get_decoder(name)
+
+    assert decode(body.encode('utf-8')) == json.loads(body)
+    assert decode(body) == json.loads(body)
+
+
+def test_unknown_decoder_is_rejected():
+    with pytest.raises(ValueError):
+        fast_json.get_decoder('simdjson')
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('name', sorted(fast_json.DECODERS))
+async def test_pages_are_decoded_with_the_configured_decoder(fake_crossref, crossref_client_factory, name):
+    client = crossref_client_factory(json_decoder=name)
+
+    items = await client.search("test", rows=5, max_results=5)
+
+    assert client.json_loads is fast_json.DECODERS[name]
+    assert [item['DOI'] for item in items] == [f'10.1000/{n}' for n in range(5)]
+
+
+def test_dumps_round_trips_through_loads():
+    value = {'doi': '10.1000/1', 'title': 'Ünïcödé', 'year': 2024, 'tags': [None, True, 1.5]}
+
+    assert fast_json.loads(fast_json.dumps(value)) == value
@@ -0,0 +1,96 @@
+"""Tests for hedged Crossref requests."""
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.crossref_client import CrossrefClient
+from app.services.hedging import HedgingPolicy
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_does_not_beat_slow_success():
+    policy = HedgingPolicy("test", initial_delay=0.01)
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) == 1:
+            await asyncio.sleep(0.05)
+            return "primary"
+        raise RuntimeError("hedge failed")
+
+    assert await policy.run(call) == "primary"
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_throttled_hedge_response_does_not_beat_slow_page():
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={'message': {'items': []}})
+        return httpx.Response(429)
+
+    client = CrossrefClient(
+        user_agent="test",
+        mailto="test@example.org",
+        hedging=HedgingPolicy("crossref-test", initial_delay=0.01),
+    )
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        body = await client._request_works({'query': 'x'})
+    finally:
+        await client.close()
+
+    assert body == {'message': {'items': []}}
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_both_requests_failing_raises_the_primary_error():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.02)
+        return httpx.Response(503)
+
+    client = CrossrefClient(
+        user_agent="test",
+        mailto="test@example.org",
+        hedging=HedgingPolicy("crossref-test", initial_delay=0.01),
+    )
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    try:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client._request_works({'query': 'x'})
+    finally:
+        await client.close()
+
+
+@pytest.mark.asyncio
+async def test_cursor_pages_are_not_hedged(fake_crossref, crossref_client_factory):
+    # Repeating a scroll request would skip a page of results
+    fake_crossref.scrolling = True
+    fake_crossref.delay = lambda request: 0.05 if len(fake_crossref.requests) == 2 else 0.0
+    client = crossref_client_factory(hedging=HedgingPolicy("crossref-test", initial_delay=0.01))
+
+    items = await client.search("test", rows=20, max_results=60)
+
+    assert [item['DOI'] for item in items] == [f'10.1000/{n}' for n in range(60)]
+    assert len(fake_crossref.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_first_page_is_still_hedged(fake_crossref, crossref_client_factory):
+    fake_crossref.scrolling = True
+    fake_crossref.delay = lambda request: 0.05 if len(fake_crossref.requests) == 1 else 0.0
+    client = crossref_client_factory(hedging=HedgingPolicy("crossref-test", initial_delay=0.01))
+
+    items = await client.search("test", rows=20, max_results=20)
+
+    assert len(items) == 20
+    assert len(fake_crossref.requests) == 2
@@ -0,0 +1,125 @@
+"""Tests for per-host request limits and concurrent BibTeX fetches."""
+import asyncio
+from collections import Counter
+
+import httpx
+import pytest
+
+from app.services.export_service import ExportService
+from app.services.http_transport import HostLimitedTransport
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """Records the peak number of concurrent requests per host."""
+
+    def __init__(self, transport):
+        self._transport = transport
+        self.active = Counter()
+        self.peak = Counter()
+
+    async def handle_async_request(self, request):
+        host = request.url.host
+        self.active[host] += 1
+        self.peak[host] = max(self.peak[host], self.active[host])
+        try:
+            return await self._transport.handle_async_request(request)
+        finally:
+            self.active[host] -= 1
+
+
+class OpenStream(httpx.AsyncByteStream):
+    """A body still being read from its connection."""
+
+    def __init__(self):
+        self.closed = False
+
+    async def __aiter__(self):
+        yield b'body'
+
+    async def aclose(self):
+        self.closed = True
+
+
+async def slow(request):
+    await asyncio.sleep(0.01)
+    return httpx.Response(200, text='ok')
+
+
+@pytest.mark.asyncio
+async def test_requests_are_capped_per_host():
+    counting = CountingTransport(httpx.MockTransport(slow))
+    transport = HostLimitedTransport(counting, max_per_host=3, host_limits={'doi.org': 2})
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        await asyncio.gather(*(
+            client.get(f'https://{host}/{n}')
+            for host in ('doi.org', 'api.crossref.org')
+            for n in range(8)
+        ))
+
+    assert counting.peak == {'doi.org': 2, 'api.crossref.org': 3}
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_holds_its_slot_until_closed():
+    stream = OpenStream()
+    inner = httpx.MockTransport(lambda request: httpx.Response(200, stream=stream))
+    transport = HostLimitedTransport(inner, max_per_host=1)
+
+    first = await transport.handle_async_request(httpx.Request('GET', 'https://doi.org/1'))
+    second = asyncio.create_task(transport.handle_async_request(httpx.Request('GET', 'https://doi.org/2')))
+    await asyncio.sleep(0.01)
+    assert not second.done()
+
+    await first.aclose()
+    await asyncio.wait_for(second, 1)
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_release_their_slot():
+    def fail(request):
+        raise httpx.ConnectError('refused', request=request)
+
+    transport = HostLimitedTransport(httpx.MockTransport(fail), max_per_host=1)
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await asyncio.wait_for(transport.handle_async_request(httpx.Request('GET', 'https://doi.org/1')), 1)
+
+
+@pytest.mark.asyncio
+async def test_bibtex_fetches_run_concurrently_within_the_limits(fake_crossref, crossref_client_factory):
+    fake_crossref.delay = 0.02
+    counting = None
+
+    def limited(mock):
+        nonlocal counting
+        counting = CountingTransport(mock)
+        return HostLimitedTransport(counting, max_per_host=10, host_limits={'doi.org': 3})
+
+    dois = [f'10.1000/{n}' for n in range(12)]
+    service = ExportService(crossref_client_factory(transport=limited), bibtex_concurrency=5)
+
+    export = await service.export_bibtex_report(dois)
+
+    assert len(export.entries) == 12 and export.failed == {}
+    assert counting.peak['doi.org'] == 3
+    assert sorted(request.url.path for request in fake_crossref.requests) == sorted(f'/{doi}' for doi in dois)
+
+
+@pytest.mark.asyncio
+async def test_bibtex_concurrency_caps_lookups(fake_crossref, crossref_client_factory):
+    fake_crossref.delay = 0.02
+    counting = None
+
+    def counted(mock):
+        nonlocal counting
+        counting = CountingTransport(mock)
+        return counting
+
+    service = ExportService(crossref_client_factory(transport=counted), bibtex_concurrency=4)
+
+    await service.export_bibtex_report([f'10.1000/{n}' for n in range(12)])
+
+    assert counting.peak['doi.org'] == 4
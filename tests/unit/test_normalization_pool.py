@@ -0,0 +1,36 @@
+"""Tests for the normalization worker pool."""
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.normalization_pool import NormalizationPool
+
+
+def raw_item(n: int) -> dict:
+    return {
+        'DOI': f'10.1000/{n}',
+        'title': [f'Title {n}'],
+        'abstract': f'<jats:p>Abstract <jats:italic>{n}</jats:italic></jats:p>',
+    }
+
+
+def sanitizer_calls(path: str) -> float:
+    return REGISTRY.get_sample_value('abstract_sanitizer_calls_total', {'path': path}) or 0.0
+
+
+def test_thread_mode_is_rejected():
+    with pytest.raises(ValueError):
+        NormalizationPool(mode="thread")
+
+
+@pytest.mark.asyncio
+async def test_process_pool_keeps_order_and_reports_sanitizer_metrics():
+    pool = NormalizationPool(workers=2, inline_threshold=10, batch_size=25)
+    try:
+        before = sanitizer_calls('fast')
+        items, failures = await pool.normalize([raw_item(n) for n in range(100)])
+    finally:
+        pool.close()
+
+    assert failures == []
+    assert [item.doi for item in items] == [f'10.1000/{n}' for n in range(100)]
+    assert sanitizer_calls('fast') - before == 100
@@ -0,0 +1,83 @@
+"""Tests for adaptive upstream page sizing."""
+import pytest
+
+from app.services.page_sizing import PageSizer
+
+
+def test_initial_rows_cap_pages_until_observed():
+    sizer = PageSizer(initial_rows=200)
+
+    assert sizer.size(150) == 150
+    assert sizer.size(1000) == 200
+
+
+def test_fast_pages_grow_to_the_upstream_limit():
+    sizer = PageSizer(max_rows=1000, target_page_seconds=2.0)
+
+    sizer.observe(items=200, seconds=0.2, body_bytes=200 * 1000)
+
+    assert sizer.page_limit == 1000
+    assert sizer.size(5000) == 1000
+
+
+def test_slow_pages_shrink_to_the_latency_target():
+    sizer = PageSizer(target_page_seconds=2.0)
+
+    sizer.observe(items=100, seconds=4.0, body_bytes=100 * 1000)
+
+    assert sizer.page_limit == 50
+
+
+def test_large_bodies_cap_pages_by_size():
+    sizer = PageSizer(max_page_bytes=1_000_000)
+
+    sizer.observe(items=100, seconds=0.1, body_bytes=100 * 20_000)
+
+    assert sizer.page_limit == 50
+
+
+def test_limits_never_fall_below_min_rows():
+    sizer = PageSizer(min_rows=20)
+
+    sizer.observe(items=10, seconds=60.0, body_bytes=10 * 10_000_000)
+
+    assert sizer.page_limit == 20
+    # Short remainders are still requested exactly
+    assert sizer.size(7) == 7
+
+
+def test_remainder_is_split_evenly():
+    sizer = PageSizer(initial_rows=200)
+
+    # 450 would be 200 + 200 + 50 at the limit
+    assert sizer.size(450) == 150
+    assert sizer.size(401) == 134
+
+
+def test_empty_pages_teach_nothing():
+    sizer = PageSizer()
+
+    sizer.observe(items=0, seconds=5.0, body_bytes=100)
+
+    assert sizer.seconds_per_item is None and sizer.bytes_per_item is None
+
+
+def test_observations_are_smoothed():
+    sizer = PageSizer(smoothing=0.5)
+
+    sizer.observe(items=100, seconds=1.0, body_bytes=100_000)
+    sizer.observe(items=100, seconds=3.0, body_bytes=300_000)
+
+    assert sizer.seconds_per_item == pytest.approx(0.02)
+    assert sizer.bytes_per_item == pytest.approx(2000)
+
+
+@pytest.mark.asyncio
+async def test_upstream_pages_are_resplit_to_the_requested_rows(fake_crossref, crossref_client_factory):
+    client = crossref_client_factory(page_sizer=PageSizer(initial_rows=200))
+
+    pages = [page async for page in client.iter_pages("test", rows=20, max_results=150)]
+
+    assert [len(page) for page in pages] == [20] * 7 + [10]
+    assert [request.url.params['rows'] for request in fake_crossref.requests] == ['150']
+    assert [item['DOI'] for page in pages for item in page] == [f'10.1000/{n}' for n in range(150)]
@@ -0,0 +1,157 @@
+"""Tests for the result cache and its backends."""
+import asyncio
+import time
+
+import pytest
+
+from app.services.result_cache import (
+    CacheEntry,
+    LocalSharedCache,
+    LRUCache,
+    ResultCache,
+    SharedCacheBackend,
+)
+
+
+def test_shared_backend_is_abstract():
+    with pytest.raises(TypeError):
+        SharedCacheBackend()
+
+
+@pytest.mark.asyncio
+async def test_local_shared_cache_evicts_oldest_writes_beyond_cap():
+    cache = LocalSharedCache(max_entries=3)
+    for key in ('a', 'b', 'c'):
+        await cache.set(key, key.encode(), ttl=60)
+
+    # Rewriting a key makes it the newest
+    await cache.set('a', b'a2', ttl=60)
+    await cache.set('d', b'd', ttl=60)
+
+    assert await cache.get('b') is None
+    assert await cache.get('a') == b'a2'
+    assert await cache.get('c') == b'c'
+    assert await cache.get('d') == b'd'
+    assert len(cache._store) == 3
+
+
+def entry(size, value=None):
+    return CacheEntry(value=value, stored_at=time.time(), size=size)
+
+
+def test_lru_evicts_least_recently_used_beyond_entry_cap():
+    cache = LRUCache(max_bytes=1000, max_entries=3)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, entry(10))
+
+    # Reading a key makes it the most recently used
+    cache.get('a')
+    cache.set('d', entry(10))
+
+    assert cache.get('b') is None
+    assert [key for key in ('a', 'c', 'd') if cache.get(key)] == ['a', 'c', 'd']
+    assert len(cache) == 3 and cache.current_bytes == 30
+
+
+def test_lru_evicts_until_within_byte_budget():
+    cache = LRUCache(max_bytes=100, max_entries=10)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, entry(30))
+
+    cache.set('d', entry(50))
+
+    assert cache.get('a') is None and cache.get('b') is None
+    assert cache.current_bytes == 80 and len(cache) == 2
+
+
+def test_lru_never_stores_entries_over_the_budget():
+    cache = LRUCache(max_bytes=100)
+    cache.set('a', entry(40))
+
+    # Replacing a key with an oversize value drops the old one too
+    cache.set('a', entry(101))
+
+    assert cache.get('a') is None
+    assert cache.current_bytes == 0
+
+
+class Fetcher:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return {'version': self.calls}
+
+
+def age(cache, key, seconds):
+    cache.local.get(key).stored_at -= seconds
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_are_served_without_fetching():
+    cache = ResultCache(ttl=60, stale_ttl=60)
+    fetch = Fetcher()
+
+    assert await cache.get_or_fetch('k', fetch) == {'version': 1}
+    age(cache, 'k', 59)
+    assert await cache.get_or_fetch('k', fetch) == {'version': 1}
+    assert fetch.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_past_the_stale_window_are_refetched():
+    cache = ResultCache(ttl=60, stale_ttl=60)
+    fetch = Fetcher()
+    await cache.get_or_fetch('k', fetch)
+
+    age(cache, 'k', 121)
+
+    assert await cache.get_or_fetch('k', fetch) == {'version': 2}
+    assert fetch.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_served_while_one_refresh_runs():
+    cache = ResultCache(ttl=60, stale_ttl=60)
+    fetch = Fetcher()
+    await cache.get_or_fetch('k', fetch)
+    age(cache, 'k', 90)
+
+    fetch.release.clear()
+    stale = await asyncio.gather(*(cache.get_or_fetch('k', fetch) for _ in range(5)))
+    await asyncio.sleep(0)
+
+    assert stale == [{'version': 1}] * 5
+    assert fetch.calls == 2
+
+    fetch.release.set()
+    await asyncio.gather(*cache._refreshing.values())
+    assert await cache.get_or_fetch('k', fetch) == {'version': 2}
+    assert fetch.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_serves_other_processes_and_is_promoted():
+    shared = LocalSharedCache()
+    writer = ResultCache(shared=shared)
+    reader = ResultCache(shared=shared)
+    await writer.get_or_fetch('k', Fetcher())
+
+    fetch = Fetcher()
+    assert await reader.get_or_fetch('k', fetch) == {'version': 1}
+    assert fetch.calls == 0
+    assert reader.local.get('k') is not None
+
+
+@pytest.mark.asyncio
+async def test_local_shared_cache_expires_entries():
+    cache = LocalSharedCache()
+    await cache.set('gone', b'x', ttl=0)
+    await cache.set('kept', b'y', ttl=60)
+
+    assert await cache.get('gone') is None
+    assert await cache.get('kept') == b'y'
@@ -0,0 +1,123 @@
+"""Differential tests: HTMLSanitizer must match bleach.clean exactly."""
+import random
+
+import bleach
+import pytest
+
+from app.utils.normalizer import DataNormalizer
+from app.utils.sanitizer import HTMLSanitizer
+
+
+SANITIZER = HTMLSanitizer(DataNormalizer.ALLOWED_TAGS)
+
+
+def bleach_clean(text: str) -> str:
+    return bleach.clean(
+        text,
+        tags=DataNormalizer.ALLOWED_TAGS,
+        attributes=DataNormalizer.ALLOWED_ATTRIBUTES,
+        strip=True
+    )
+
+
+FIXTURES = [
+    "",
+    "Plain abstract without markup.",
+    "Temperatures of 5 < 10 and 10 > 5",
+    "Fish & chips &amp; &lt;tags&gt; &copy &copy; &notit; &#169; &#xA9; &#x; &#12a;",
+    "<jats:p>We study <jats:italic>E. coli</jats:italic> growth.</jats:p>",
+    "<jats:title>Abstract</jats:title><jats:p>Results: <jats:bold>p</jats:bold> &lt; 0.05</jats:p>",
+    "<jats:sec><jats:title>Background</jats:title><jats:p>Text.</jats:p></jats:sec>",
+    "<p>First</p><p>Second<br>line<br/>break</p>",
+    "<p>Unclosed paragraph <p>implicitly closes the first",
+    "<b><i>misnested</b></i>",
+    "<p class=\"x\" onclick='alert(1)'>attributes are dropped</p>",
+    "<script>alert(1)</script>after",
+    "<style>p { color: red }</style>text",
+    "<!-- comment -->visible",
+    "<?xml version=\"1.0\"?><p>pi</p>",
+    "H<sub>2</sub>O and E=mc<sup>2</sup>",
+    "<span style=\"font-variant:small-caps\">Caps</span>",
+    "<a href=\"http://example.org\">link</a> text",
+    "<em>a</em>=&amp;b",
+    "</p>stray end tag",
+    "<jats:p>Unterminated <jats:italic>italic",
+    "tab\tnewline\nreturn\r\nform\x0cfeed",
+    "control\x01chars\x1f",
+    "<table><tr><td>cell</td></tr></table>",
+    "<p>Greek: &alpha; &Alpha; &beta &unknown;</p>",
+    "<P>Upper<BR>case</P>",
+    "< p>spaced</ p>",
+    "<p/>self closing",
+]
+
+
+@pytest.mark.parametrize("text", FIXTURES)
+def test_fixtures_match_bleach(text):
+    assert SANITIZER.clean(text) == bleach_clean(text)
+
+
+# Fragments combined at random; chosen to hit both the fast path and
+# every fallback trigger
+FRAGMENTS = [
+    "text", " ", "word ", "\n", "\t", "=", ";", "#", "x", "A1",
+    "&", "&amp;", "&lt;", "&gt;", "&copy", "&copy;", "&co;", "&#169;", "&#xA9;", "&#;", "&#x;", "&nbsp",
+    "<", ">", "</", "<!--", "-->", "<?",
+    "<p>", "</p>", "<br>", "<br/>", "<i>", "</i>", "<b>", "</b>", "<em>", "</em>",
+    "<strong>", "</strong>", "<span>", "</span>", "<sub>", "</sub>", "<sup>", "</sup>",
+    "<jats:p>", "</jats:p>", "<jats:italic>", "</jats:italic>", "<jats:sec>", "</jats:sec>",
+    "<div>", "</div>", "<a href=\"x\">", "</a>", "<script>", "</script>",
+    "<p class=x>", "<i id='y'>", "<b title=\"a > b\">", "<jats:p\n>",
+    "\x00", "\x0b", "é", "–",
+]
+
+
+# Text and elements for well-formed markup, which the fast path handles
+TEXT_FRAGMENTS = [
+    "text", " ", "word ", "\n", "=", ";", "5 < 6", "7 > 6", "é",
+    "&amp;", "&lt;", "&copy;", "&#169;", "&#xA9;", "& ", "&co;", "a=&b",
+]
+ELEMENTS = ["i", "b", "em", "strong", "span", "sub", "sup", "jats:italic", "jats:bold", "jats:sec"]
+BLOCKS = ["p", "jats:p", "jats:title"]
+
+
+def _random_text(rng: random.Random) -> str:
+    return ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 25)))
+
+
+def _random_markup(rng: random.Random, depth: int = 0) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 4)):
+        roll = rng.random()
+        if roll < 0.5 or depth >= 3:
+            parts.append(rng.choice(TEXT_FRAGMENTS))
+        elif roll < 0.6:
+            parts.append("<br>")
+        else:
+            name = rng.choice(ELEMENTS)
+            parts.append(f"<{name}>{_random_markup(rng, depth + 1)}</{name}>")
+    return ''.join(parts)
+
+
+def _random_abstract(rng: random.Random) -> str:
+    blocks = []
+    for _ in range(rng.randint(1, 3)):
+        name = rng.choice(BLOCKS)
+        blocks.append(f"<{name}>{_random_markup(rng)}</{name}>")
+    return ''.join(blocks)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fuzzed_markup_matches_bleach(seed):
+    rng = random.Random(seed)
+    for _ in range(250):
+        text = _random_abstract(rng)
+        assert SANITIZER.clean(text) == bleach_clean(text), repr(text)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_fuzzed_fragments_match_bleach(seed):
+    rng = random.Random(seed)
+    for _ in range(250):
+        text = _random_text(rng)
+        assert SANITIZER.clean(text) == bleach_clean(text), repr(text)
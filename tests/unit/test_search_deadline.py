@@ -0,0 +1,84 @@
+"""Tests for deadline-bounded searches."""
+import asyncio
+
+import pytest
+
+from app.models import SearchFilters
+from app.services.deadline import Deadline
+from app.services.search_service import SearchService
+from conftest import make_work
+
+
+@pytest.mark.asyncio
+async def test_joiner_is_not_handed_the_leaders_truncated_result(fake_crossref, crossref_client_factory):
+    fake_crossref.delay = 0.1
+    service = SearchService(crossref_client_factory())
+    filters = SearchFilters(query="test", rows=20, max_results=60)
+
+    async def joiner():
+        await asyncio.sleep(0.02)
+        return await service.search(filters.query, filters, Deadline(5))
+
+    leader, joined = await asyncio.gather(
+        service.search(filters.query, filters, Deadline(0.25)),
+        joiner(),
+    )
+
+    assert leader.partial and 0 < leader.count < 60
+    assert not joined.partial and joined.count == 60
+
+
+@pytest.mark.asyncio
+async def test_identical_searches_still_share_a_complete_fetch(fake_crossref, crossref_client_factory):
+    fake_crossref.delay = 0.02
+    service = SearchService(crossref_client_factory())
+    filters = SearchFilters(query="test", rows=20, max_results=60)
+
+    results = await asyncio.gather(*(
+        service.search(filters.query, filters, Deadline(5)) for _ in range(3)
+    ))
+
+    assert [result.count for result in results] == [60, 60, 60]
+    assert len(fake_crossref.requests) == 3
+
+
+@pytest.fixture
+def sharded_service(fake_crossref, crossref_client_factory):
+    # 20 works per year, 2020-2024; the 2023 shard answers too late
+    fake_crossref.works = [make_work(n, year=2020 + n % 5) for n in range(100)]
+    fake_crossref.delay = lambda request: 2.0 if 'from-pub-date:2023' in request.url.params['filter'] else 0.0
+    return SearchService(crossref_client_factory(date_shards=5))
+
+
+def years(result):
+    return {item.year for item in result.items}
+
+
+@pytest.mark.asyncio
+async def test_sharded_published_search_returns_newer_shards_before_the_deadline(sharded_service):
+    filters = SearchFilters(
+        query="test", from_date="2020-01-01", until_date="2024-12-31",
+        rows=20, max_results=60, sort="published"
+    )
+
+    result = await sharded_service.search(filters.query, filters, Deadline(0.3))
+
+    assert result.partial
+    assert result.count == 20
+    assert years(result) == {2024}
+
+
+@pytest.mark.asyncio
+async def test_sharded_relevance_search_merges_shards_that_arrived(sharded_service):
+    filters = SearchFilters(
+        query="test", from_date="2020-01-01", until_date="2024-12-31",
+        rows=20, max_results=60, sort="relevance"
+    )
+
+    result = await sharded_service.search(filters.query, filters, Deadline(0.3))
+
+    assert result.partial
+    assert result.count > 0
+    assert 2023 not in years(result)
+    scores = [int(item.doi.rsplit('/', 1)[1]) for item in result.items]
+    assert scores == sorted(scores)
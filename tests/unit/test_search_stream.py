@@ -0,0 +1,152 @@
+"""Tests for NDJSON search streaming."""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app import main
+from app.models import SearchFilters
+from app.services.circuit_breaker import OPEN, CircuitBreaker
+from app.services.continuation import ContinuationStore
+from app.services.deadline import Deadline
+from app.services.result_cache import ResultCache
+from app.services.search_service import SearchService
+from conftest import FailingTransport
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("crossref-test", recovery_timeout=30)
+
+
+@pytest.fixture
+def search_service(crossref_client_factory, breaker, monkeypatch):
+    service = SearchService(
+        crossref_client_factory(circuit_breaker=breaker),
+        result_cache=ResultCache(),
+        continuations=ContinuationStore(secret="test"),
+    )
+    monkeypatch.setattr(main, 'search_service', service)
+    return service
+
+
+def open_circuit(breaker):
+    breaker.state = OPEN
+    breaker.opened_at = time.monotonic()
+
+
+async def frames(filters, continuation=None):
+    return [json.loads(line) async for line in main.ndjson_search_frames(filters, continuation)]
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_serves_cached_first_slice(search_service, breaker):
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+    cached = await search_service.search(filters.query, filters)
+    open_circuit(breaker)
+
+    items, summary = await frames(filters)
+
+    assert [item['doi'] for item in items['items']] == [item.doi for item in cached.items]
+    assert summary['stale'] and summary['next_token'] is None
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_does_not_repeat_the_first_slice_as_a_continuation(search_service, breaker):
+    filters = SearchFilters(query="test", rows=5, max_results=5)
+    first = await search_service.search(filters.query, filters)
+    open_circuit(breaker)
+
+    filters, continuation = await search_service.open_continuation(first.next_token)
+    (error,) = await frames(filters, continuation)
+
+    assert error['type'] == 'error'
+    assert error['error']['code'] == 503
+    assert 0 < error['retry_after'] <= 30
+
+
+async def get_stream(**params):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        return await client.get("/search", params={'q': 'test', 'stream': 'true', **params})
+
+
+def lines(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_items_frames_then_summary(search_service):
+    response = await get_stream(rows=20, max_results=50)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    *pages, summary = lines(response)
+    assert [page['type'] for page in pages] == ['items'] * 3
+    assert [len(page['items']) for page in pages] == [20, 20, 10]
+    assert [item['doi'] for page in pages for item in page['items']] == [f'10.1000/{n}' for n in range(50)]
+    assert summary == {
+        'type': 'summary', 'count': 50, 'stale': False, 'partial': False,
+        'next_token': summary['next_token'],
+    }
+    assert summary['next_token']
+
+
+@pytest.mark.asyncio
+async def test_continuation_streams_the_next_slice(search_service):
+    first = lines(await get_stream(rows=20, max_results=20))[-1]
+
+    *pages, summary = lines(await get_stream(continuation=first['next_token'], max_results=20))
+
+    assert [item['doi'] for page in pages for item in page['items']] == [f'10.1000/{n}' for n in range(20, 40)]
+    assert summary['count'] == 20
+
+
+@pytest.mark.asyncio
+async def test_exhausted_results_have_no_next_token(fake_crossref, search_service):
+    fake_crossref.works = fake_crossref.works[:30]
+
+    *pages, summary = lines(await get_stream(rows=20, max_results=50))
+
+    assert [len(page['items']) for page in pages] == [20, 10]
+    assert summary['count'] == 30 and summary['next_token'] is None
+
+
+@pytest.mark.asyncio
+async def test_failure_after_the_first_frame_becomes_an_error_frame(crossref_client_factory, monkeypatch):
+    service = SearchService(crossref_client_factory(transport=lambda mock: FailingTransport(mock, fail_at=2)))
+    monkeypatch.setattr(main, 'search_service', service)
+
+    response = await get_stream(rows=20, max_results=60)
+
+    assert response.status_code == 200
+    items, error = lines(response)
+    assert len(items['items']) == 20
+    assert error['type'] == 'error' and error['error']['code'] == 502
+
+
+@pytest.mark.asyncio
+async def test_failure_before_the_first_frame_is_an_error_response(fake_crossref, search_service):
+    fake_crossref.statuses = [400]
+
+    response = await get_stream(rows=20, max_results=60)
+
+    assert response.status_code == 502
+    assert 'x-ndjson' not in response.headers['content-type']
+
+
+@pytest.mark.asyncio
+async def test_deadline_ends_the_stream_with_a_partial_summary(fake_crossref, search_service):
+    fake_crossref.delay = lambda request: 0.5 if request.url.params.get('cursor', '*') != '*' else 0.0
+    filters = SearchFilters(query="test", rows=20, max_results=60)
+
+    async def collect():
+        deadline = Deadline(0.2)
+        return [json.loads(line) async for line in main.ndjson_search_frames(filters, deadline=deadline)]
+
+    items, summary = await asyncio.wait_for(collect(), 5)
+
+    assert len(items['items']) == 20
+    assert summary['partial'] and summary['count'] == 20
+    assert summary['next_token']
@@ -0,0 +1,84 @@
+"""Tests for date-sharded searches."""
+import json
+
+import pytest
+
+from app import main
+from app.models import SearchFilters
+from app.services.continuation import ContinuationStore
+from app.services.search_service import SearchService
+from conftest import make_work
+
+
+def filters(sort):
+    return SearchFilters(
+        query="test", from_date="2020-01-01", until_date="2024-12-31",
+        rows=20, max_results=60, sort=sort
+    )
+
+
+def dois(pages):
+    return [item['DOI'] for page in pages for item in page]
+
+
+async def walk(client, search_filters, shard):
+    return [page async for page in client.iter_pages(
+        query=search_filters.query,
+        from_date=search_filters.from_date,
+        until_date=search_filters.until_date,
+        rows=search_filters.rows,
+        max_results=search_filters.max_results,
+        sort=search_filters.sort,
+        shard=shard,
+    )]
+
+
+@pytest.mark.asyncio
+async def test_published_merge_matches_the_single_chain(fake_crossref, crossref_client_factory):
+    # 20 works per year, newest first as Crossref sorts them
+    fake_crossref.works = [make_work(n, year=2024 - n // 20) for n in range(100)]
+    client = crossref_client_factory(date_shards=5)
+
+    sharded = await walk(client, filters("published"), shard=True)
+    single = await walk(client, filters("published"), shard=False)
+
+    assert dois(sharded) == dois(single)
+    assert all(len(page) == 20 for page in sharded)
+
+
+@pytest.mark.asyncio
+async def test_relevance_merge_has_no_duplicates(fake_crossref, crossref_client_factory):
+    # Scores fall with n, spreading the best matches over every shard
+    fake_crossref.works = [make_work(n, year=2020 + n % 5) for n in range(200)]
+    client = crossref_client_factory(date_shards=5)
+
+    merged = dois(await walk(client, filters("relevance"), shard=True))
+
+    assert len(merged) == len(set(merged)) == 60
+    assert merged == [f'10.1000/{n}' for n in range(60)]
+
+
+@pytest.mark.asyncio
+async def test_sharded_results_get_no_continuation(fake_crossref, crossref_client_factory):
+    fake_crossref.works = [make_work(n, year=2020 + n % 5) for n in range(200)]
+    continuations = ContinuationStore(secret="test")
+    sharded_service = SearchService(crossref_client_factory(date_shards=5), continuations=continuations)
+    single_service = SearchService(crossref_client_factory(), continuations=continuations)
+
+    sharded = await sharded_service.search("test", filters("relevance"))
+    single = await single_service.search("test", filters("relevance"))
+
+    assert sharded.count == 60 and sharded.next_token is None
+    assert single.next_token is not None
+
+
+@pytest.mark.asyncio
+async def test_sharded_streams_get_no_continuation(fake_crossref, crossref_client_factory, monkeypatch):
+    fake_crossref.works = [make_work(n, year=2020 + n % 5) for n in range(200)]
+    service = SearchService(crossref_client_factory(date_shards=5), continuations=ContinuationStore(secret="test"))
+    monkeypatch.setattr(main, 'search_service', service)
+
+    frames = [json.loads(line) async for line in main.ndjson_search_frames(filters("published"))]
+
+    assert frames[-1]['type'] == 'summary'
+    assert frames[-1]['count'] == 60 and frames[-1]['next_token'] is None
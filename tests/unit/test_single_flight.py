@@ -0,0 +1,119 @@
+"""Tests for in-flight call deduplication."""
+import asyncio
+
+import pytest
+
+from app.models import SearchFilters
+from app.services.search_service import SearchService
+from app.services.single_flight import SingleFlight
+
+
+class Work:
+    def __init__(self, result='done'):
+        self.result = result
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def __call__(self):
+        self.calls += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    work = Work()
+
+    callers = [asyncio.create_task(group.do('k', work)) for _ in range(5)]
+    await work.started.wait()
+    assert len(group) == 1
+
+    work.release.set()
+    assert await asyncio.gather(*callers) == ['done'] * 5
+    assert work.calls == 1
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_and_later_calls_run_again():
+    group = SingleFlight()
+    work = Work()
+    work.release.set()
+
+    await asyncio.gather(group.do('a', work), group.do('b', work))
+    await group.do('a', work)
+
+    assert work.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    group = SingleFlight()
+    work = Work(ValueError('boom'))
+
+    callers = [asyncio.create_task(group.do('k', work)) for _ in range(3)]
+    await work.started.wait()
+    work.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert work.calls == 1 and len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    group = SingleFlight()
+    work = Work()
+
+    first = asyncio.create_task(group.do('k', work))
+    second = asyncio.create_task(group.do('k', work))
+    await work.started.wait()
+    first.cancel()
+    await asyncio.sleep(0)
+
+    work.release.set()
+    assert await second == 'done'
+    assert first.cancelled() and not work.cancelled
+
+
+@pytest.mark.asyncio
+async def test_last_waiter_leaving_cancels_the_shared_call():
+    group = SingleFlight()
+    work = Work()
+
+    callers = [asyncio.create_task(group.do('k', work)) for _ in range(2)]
+    await work.started.wait()
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert work.cancelled
+    assert len(group) == 0
+
+
+@pytest.mark.asyncio
+async def test_identical_searches_make_one_upstream_walk(fake_crossref, crossref_client_factory):
+    fake_crossref.delay = 0.02
+    service = SearchService(crossref_client_factory())
+    filters = SearchFilters(query="test", rows=20, max_results=40)
+    other = SearchFilters(query="other", rows=20, max_results=40)
+
+    results = await asyncio.gather(
+        *(service.search(filters.query, filters) for _ in range(4)),
+        service.search(other.query, other),
+    )
+
+    assert [result.count for result in results] == [40] * 5
+    queries = [request.url.params['query'] for request in fake_crossref.requests]
+    assert sorted(queries) == ['other', 'other', 'test', 'test']